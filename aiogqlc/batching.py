@@ -0,0 +1,174 @@
+import asyncio
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional
+
+from aiogqlc.errors import GraphQLResponseError
+from aiogqlc.instrumentation import current_trace, trace_operation
+from aiogqlc.types import ExecutionResult, Payload, Variables
+from aiogqlc.utils import serialize_payload
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aiogqlc.client import GraphQLClient
+
+# Statuses of servers that don't accept arrays of operations
+REJECTED_BATCH_STATUSES = frozenset({400, 404, 405, 413, 415})
+
+
+class GraphQLBatchManager:
+    def __init__(
+        self,
+        client: "GraphQLClient",
+        max_size: int = 10,
+        window: float = 0.01,
+        **kwargs: Any,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError(max_size)
+
+        self._client = client
+        self._max_size = max_size
+        self._window = window
+        self._kwargs = kwargs
+        self._batching_supported = True
+        self._pending: list[tuple[Payload, asyncio.Future[ExecutionResult]]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+
+    async def __aenter__(self) -> "GraphQLBatchManager":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.flush()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks)
+
+    @property
+    def batching_supported(self) -> bool:
+        return self._batching_supported
+
+    async def execute(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+    ) -> ExecutionResult:
+        with trace_operation(self._client.instrumentation, query, operation):
+            return await self.execute_traced(query, variables, operation)
+
+    async def execute_traced(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+    ) -> ExecutionResult:
+        _, files_to_paths_mapping = self._client.prepare(variables)
+
+        if files_to_paths_mapping or not self._batching_supported:
+            return await self.execute_single(query, variables, operation)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[ExecutionResult] = loop.create_future()
+        payload = serialize_payload(query, variables, operation)
+        self._pending.append((payload, future))
+
+        if len(self._pending) >= self._max_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self.flush)
+
+        return await future
+
+    async def execute_single(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+    ) -> ExecutionResult:
+        result = await self._client.execute_result(
+            query, variables, operation, **self._kwargs
+        )
+        return result.decoded
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self.send_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def send_batch(
+        self, batch: list[tuple[Payload, asyncio.Future[ExecutionResult]]]
+    ) -> None:
+        # The request is shared by the operations of the batch, so its phases are
+        # not traced as those of the operation that happened to schedule it
+        current_trace.set(None)
+        payloads = [payload for payload, _ in batch]
+
+        started = time.perf_counter()
+        try:
+            results = await self.post_batch(payloads)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        finally:
+            metrics = self._client.metrics
+            if metrics is not None:
+                # Operations of a batch share its request and thereby its duration
+                duration = time.perf_counter() - started
+                for payload in payloads:
+                    metrics.request_finished(payload.get("operationName"), duration)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def post_batch(self, payloads: list[Payload]) -> list[ExecutionResult]:
+        if len(payloads) > 1 and self._batching_supported:
+            response = await self._client.post_json(payloads, **self._kwargs)
+
+            # Only a rejected batch is safe to resend, as the server may have executed
+            # the operations of a batch that failed otherwise
+            if not response.ok and response.status not in REJECTED_BATCH_STATUSES:
+                response.raise_for_status()
+
+            results = None
+            if response.ok:
+                try:
+                    results = self._client.json_loads(await response.read())
+                except Exception:
+                    results = None
+
+            if isinstance(results, list):
+                if len(results) != len(payloads):
+                    raise GraphQLResponseError(results)
+                if self._client.metrics is not None:
+                    for result in results:
+                        self._client.metrics.result_received(result)
+                return results
+
+            self._batching_supported = False
+
+        return await asyncio.gather(
+            *(self.post_single(payload) for payload in payloads)
+        )
+
+    async def post_single(self, payload: Payload) -> ExecutionResult:
+        response = await self._client.post_payload(payload, **self._kwargs)
+        result = await response.json(loads=self._client.json_loads)
+        if self._client.metrics is not None:
+            self._client.metrics.result_received(result)
+        return result
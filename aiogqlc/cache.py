@@ -0,0 +1,57 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import aiohttp
+
+
+class ResponseCache:
+    def __init__(self, max_size: int = 128, ttl: Optional[float] = 60) -> None:
+        if max_size < 1:
+            raise ValueError(max_size)
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[
+            str, tuple[Optional[float], aiohttp.ClientResponse]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[aiohttp.ClientResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def set(
+        self,
+        key: str,
+        response: aiohttp.ClientResponse,
+        ttl: Optional[float] = None,
+    ) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,63 +1,183 @@
 import asyncio
+import inspect
 import json
-from collections.abc import AsyncGenerator
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncGenerator, Callable, Mapping, Sequence
 from contextlib import AbstractAsyncContextManager
+from functools import partial
 from io import IOBase
+from pathlib import Path
 from types import TracebackType
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, Literal, Optional, Union, cast, overload
 
 import aiohttp
 import aiohttp.client
+import aiohttp.payload
 import aiohttp.test_utils
+from typing_extensions import Self
 
-from aiogqlc.constants import GRAPHQL_WS
+from aiogqlc.batching import GraphQLBatchManager
+from aiogqlc.cache import ResponseCache
+from aiogqlc.constants import (
+    CACHE_AND_NETWORK,
+    CACHE_FIRST,
+    GRAPHQL_TRANSPORT_WS,
+    GRAPHQL_WS,
+    INCREMENTAL_DELIVERY_ACCEPT,
+    NETWORK_ONLY,
+    OVERFLOW_BLOCK,
+    PERSISTED_QUERY_NOT_SUPPORTED,
+)
 from aiogqlc.errors import (
+    GraphQLResponseError,
+    GraphQLWSConnectionClosedError,
     GraphQLWSConnectionError,
+    GraphQLWSError,
     GraphQLWSOperationError,
     GraphQLWSProtocolError,
 )
+from aiogqlc.frames import RawPayload, split_data_message
+from aiogqlc.incremental import (
+    IncrementalResult,
+    MultipartMixedParser,
+    get_boundary,
+)
+from aiogqlc.instrumentation import (
+    DECODE,
+    HTTP,
+    READ,
+    REQUEST,
+    SERIALIZE,
+    SUBSCRIBE,
+    Instrumentation,
+    OperationTrace,
+    start_trace,
+    trace_operation,
+    trace_phase,
+    trace_phase_of,
+)
+from aiogqlc.metrics import (
+    RESPONSE_ERRORS,
+    ClientMetrics,
+    SubscriptionMeter,
+    encoded_size,
+)
+from aiogqlc.pool import GraphQLWSPool
+from aiogqlc.queues import OperationBroadcast, OperationQueue, is_terminal
+from aiogqlc.reconnect import ReconnectPolicy
+from aiogqlc.result import GraphQLResult
+from aiogqlc.streaming import JSONItemsParser
 from aiogqlc.types import (
     ConnectionInitParams,
+    DisconnectHook,
+    ExecutionResult,
     FilesToPathsMapping,
+    GraphQLTransportWSCompleteMessage,
+    GraphQLTransportWSConnectionInitMessage,
+    GraphQLTransportWSPingMessage,
+    GraphQLTransportWSPongMessage,
+    GraphQLTransportWSServerMessage,
+    GraphQLTransportWSSubscribeMessage,
     GraphQLWSConnectionInitMessage,
     GraphQLWSConnectionTerminateMessage,
     GraphQLWSDataMessagePayload,
     GraphQLWSServerConnectionOperationMessage,
-    GraphQLWSServerExecutionOperationMessage,
     GraphQLWSServerOperationMessage,
     GraphQLWSStartMessage,
     GraphQLWSStopMessage,
+    JSONDecoder,
+    JSONEncoder,
+    OperationMessage,
+    Payload,
+    QueueStats,
+    ReconnectHook,
     Variables,
     VariableValue,
 )
-from aiogqlc.utils import serialize_payload
+from aiogqlc.uploads import (
+    BUFFER_TYPES,
+    Buffer,
+    BufferPayload,
+    PathPayload,
+    StreamingUpload,
+)
+from aiogqlc.utils import (
+    encode_json,
+    get_operation_type,
+    get_persisted_query_error,
+    hash_payload,
+    hash_query,
+    serialize_payload,
+    serialize_query_params,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aiogqlc.store import EntityStore
+
+# Values that are either files or may contain files, and values that are neither
+PAYLOAD_TYPES = (*BUFFER_TYPES, Path)
+SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
 
 
 class GraphQLWSManager:
+    protocol = GRAPHQL_WS
+    data_message_type = "data"
+
     def __init__(
         self,
         endpoint: str,
         session: Union[aiohttp.ClientSession, aiohttp.test_utils.TestClient],
         connection_params: Optional[ConnectionInitParams] = None,
+        json_dumps: JSONEncoder = json.dumps,
+        json_loads: JSONDecoder = json.loads,
+        queue_size: int = 0,
+        overflow: str = OVERFLOW_BLOCK,
+        reconnect: Union[bool, ReconnectPolicy] = False,
+        on_disconnect: Optional[DisconnectHook] = None,
+        on_reconnect: Optional[ReconnectHook] = None,
+        keep_alive_timeout: Optional[float] = None,
+        multicast: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        metrics: Optional[ClientMetrics] = None,
     ) -> None:
         self._endpoint = endpoint
         self._session = session
         self._connection_params = connection_params
+        self._json_dumps = json_dumps
+        self._json_loads = json_loads
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._reconnect_policy: Optional[ReconnectPolicy] = None
+        if isinstance(reconnect, ReconnectPolicy):
+            self._reconnect_policy = reconnect
+        elif reconnect:
+            self._reconnect_policy = ReconnectPolicy()
+        self._on_disconnect = on_disconnect
+        self._on_reconnect = on_reconnect
+        self._keep_alive_timeout = keep_alive_timeout
+        self._multicast = multicast
+        self._instrumentation = instrumentation
+        self._metrics = metrics
+        self._last_keep_alive = 0.0
+        self._close_reason = ""
+        self._closing = False
         self._last_operation_id = 0
         self._ws_context: AbstractAsyncContextManager[aiohttp.ClientWebSocketResponse]
         self._ws: aiohttp.ClientWebSocketResponse
         self._execution_operation_message_queues: dict[
-            str, asyncio.Queue[GraphQLWSServerExecutionOperationMessage]
+            str, Union[OperationQueue, OperationBroadcast]
         ] = {}
+        self._shared_operations: dict[str, tuple[str, OperationBroadcast]] = {}
+        self._operations: dict[str, tuple[str, Optional[Variables], Optional[str]]] = {}
+        self._traces: dict[str, OperationTrace] = {}
+        self._meters: dict[str, SubscriptionMeter] = {}
         self._connection_handler_task: asyncio.Task[None]
 
-    async def __aenter__(self) -> "GraphQLWSManager":
-        self._ws_context = self._session.ws_connect(
-            self._endpoint, protocols=[GRAPHQL_WS]
-        )
-        self._ws = await self._ws_context.__aenter__()
-        await self.init_connection(self._connection_params)
-        self._connection_handler_task = asyncio.create_task(self.handle_connection())
+    async def __aenter__(self) -> Self:
+        await self.open_connection()
+        self._connection_handler_task = asyncio.create_task(self.run_connection())
         return self
 
     async def __aexit__(
@@ -66,30 +186,379 @@ class GraphQLWSManager:
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType],
     ) -> None:
-        await self.terminate_connection()
-        await self._connection_handler_task
+        self._closing = True
+        if self._ws.closed:
+            # The connection is lost, stop waiting for it to be reestablished
+            self._connection_handler_task.cancel()
+            await asyncio.wait([self._connection_handler_task])
+        else:
+            await self.terminate_connection()
+            await self._connection_handler_task
         await self._ws_context.__aexit__(exc_type, exc_val, exc_tb)
 
-    async def subscribe(
+    async def open_connection(self) -> None:
+        ws_context = self._session.ws_connect(self._endpoint, protocols=[self.protocol])
+        self._ws = await ws_context.__aenter__()
+        self._ws_context = ws_context
+        self._last_keep_alive = asyncio.get_running_loop().time()
+        self._close_reason = ""
+        try:
+            await self.init_connection(self._connection_params)
+        except BaseException as exc:
+            await self._ws_context.__aexit__(type(exc), exc, exc.__traceback__)
+            raise
+
+    async def run_connection(self) -> None:
+        try:
+            await self.maintain_connection()
+        except Exception as exc:
+            # Nothing else reads the connection, operations would wait forever
+            await self.fail_operations(exc)
+            await self._ws.close()
+
+    async def maintain_connection(self) -> None:
+        while True:
+            try:
+                await self.handle_connection()
+            finally:
+                self.connection_closed()
+            if self._closing:
+                return
+
+            if self._reconnect_policy is None or not await self.reconnect(
+                self._reconnect_policy
+            ):
+                await self.fail_operations(
+                    GraphQLWSConnectionClosedError(
+                        self._ws.close_code, self._close_reason
+                    )
+                )
+                return
+
+    @property
+    def connected(self) -> bool:
+        return not self._ws.closed
+
+    @property
+    def closed(self) -> bool:
+        # Closed for good, the connection is not being reestablished
+        return self._connection_handler_task.done()
+
+    @property
+    def time_since_keep_alive(self) -> float:
+        return asyncio.get_running_loop().time() - self._last_keep_alive
+
+    async def receive_messages(self) -> AsyncGenerator[aiohttp.WSMessage, None]:
+        probing = False
+        while True:
+            try:
+                ws_message = await self._ws.receive(self._keep_alive_timeout)
+            except asyncio.TimeoutError:
+                if not probing and await self.probe_connection():
+                    probing = True
+                    continue
+
+                # Half-open connections never close by themselves
+                self._close_reason = "Keep-alive timeout"
+                await self._ws.close()
+                return
+
+            if ws_message.type in (
+                aiohttp.WSMsgType.CLOSE,
+                aiohttp.WSMsgType.CLOSING,
+                aiohttp.WSMsgType.CLOSED,
+            ):
+                return
+
+            probing = False
+            self._last_keep_alive = asyncio.get_running_loop().time()
+            if self._metrics is not None and isinstance(ws_message.data, (str, bytes)):
+                self._metrics.bytes_received.inc(
+                    self.protocol, encoded_size(ws_message.data)
+                )
+            yield ws_message
+
+    async def probe_connection(self) -> bool:
+        return False
+
+    def connection_closed(self) -> None:
+        pass
+
+    async def reconnect(self, policy: ReconnectPolicy) -> bool:
+        close_code = self._ws.close_code
+        await self._ws_context.__aexit__(None, None, None)
+        await self.run_hook(self._on_disconnect, close_code)
+
+        attempt = 1
+        while policy.can_retry(attempt):
+            await asyncio.sleep(policy.delay(attempt))
+            try:
+                await self.open_connection()
+                try:
+                    operation_ids = await self.restart_operations()
+                except BaseException as exc:
+                    await self._ws_context.__aexit__(type(exc), exc, exc.__traceback__)
+                    raise
+            except (aiohttp.ClientError, ConnectionError, GraphQLWSError):
+                attempt += 1
+                continue
+
+            await self.run_hook(self._on_reconnect, attempt, operation_ids)
+            return True
+
+        return False
+
+    async def restart_operations(self) -> list[str]:
+        # Operations keep their IDs, so their queues continue to be filled
+        operation_ids = list(self._operations)
+        for operation_id in operation_ids:
+            await self.start_operation(operation_id, *self._operations[operation_id])
+        return operation_ids
+
+    async def fail_operations(self, error: Exception) -> None:
+        self._operations.clear()
+        for queue in list(self._execution_operation_message_queues.values()):
+            await queue.fail(error)
+
+    async def run_hook(self, hook: Optional[Callable[..., Any]], *args: Any) -> None:
+        if hook is None:
+            return
+
+        # Hooks must not take the connection down, their errors are only reported
+        try:
+            result = hook(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exc:
+            asyncio.get_running_loop().call_exception_handler(
+                {"message": f"Connection hook {hook!r} failed", "exception": exc}
+            )
+
+    def subscribe(
         self,
         query: str,
         variables: Optional[Variables] = None,
         operation: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+        multicast: Optional[bool] = None,
+    ) -> AsyncGenerator[GraphQLWSDataMessagePayload, None]:
+        if self._multicast if multicast is None else multicast:
+            return self.subscribe_shared(
+                query, variables, operation, queue_size, overflow
+            )
+        return self.subscribe_exclusive(
+            query, variables, operation, queue_size, overflow
+        )
+
+    async def subscribe_exclusive(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
     ) -> AsyncGenerator[GraphQLWSDataMessagePayload, None]:
         operation_id = self.get_next_operation_id()
-        self._execution_operation_message_queues[operation_id] = asyncio.Queue()
+        queue = self.create_queue(operation_id, queue_size, overflow)
+
+        error: Optional[Exception] = None
+        try:
+            await self.begin_operation(operation_id, query, variables, operation)
+            async for payload in self.handle_operation(queue):
+                yield payload
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            await self.release_operation(operation_id, queue, error)
 
-        await self.start_operation(operation_id, query, variables, operation)
-        operation_handler = self.handle_operation(operation_id)
+    async def subscribe_shared(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ) -> AsyncGenerator[GraphQLWSDataMessagePayload, None]:
+        key = hash_payload(serialize_payload(query, variables, operation))
+        shared = self._shared_operations.get(key)
+
+        # Completed operations are not joined, their messages are not replayed
+        joined = shared is not None and shared[0] in self._operations
+        if shared is not None and joined:
+            operation_id, broadcast = shared
+            queue = broadcast.subscribe(*self.get_queue_options(queue_size, overflow))
+        else:
+            operation_id, broadcast = self.get_next_operation_id(), OperationBroadcast()
+            queue = broadcast.subscribe(*self.get_queue_options(queue_size, overflow))
+            self._execution_operation_message_queues[operation_id] = broadcast
+            self._shared_operations[key] = (operation_id, broadcast)
 
+        error: Optional[Exception] = None
         try:
+            if not joined:
+                await self.begin_operation(operation_id, query, variables, operation)
+            async for payload in self.handle_operation(queue):
+                yield payload
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            await queue.close()
+            broadcast.unsubscribe(queue)
+            if not broadcast:
+                if self._shared_operations.get(key) == (operation_id, broadcast):
+                    del self._shared_operations[key]
+                await self.release_operation(operation_id, broadcast, error)
+
+    async def subscribe_batched(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        max_items: int = 100,
+        max_latency: float = 0.01,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ) -> AsyncGenerator[list[GraphQLWSDataMessagePayload], None]:
+        operation_id = self.get_next_operation_id()
+        queue = self.create_queue(operation_id, queue_size, overflow)
+
+        error: Optional[Exception] = None
+        try:
+            await self.begin_operation(operation_id, query, variables, operation)
             while True:
-                payload = await operation_handler.__anext__()
+                messages = await queue.get_batch(max_items, max_latency)
+                payloads: list[GraphQLWSDataMessagePayload] = []
+                for message in messages:
+                    if message["type"] == "raw":
+                        payloads.append(message["payload"].decode())
+                    elif message["type"] == "data" or message["type"] == "next":
+                        payloads.append(message["payload"])
+                if payloads:
+                    yield payloads
+
+                last_message = messages[-1]
+                if last_message["type"] == "error":
+                    raise GraphQLWSOperationError(last_message["payload"])
+                if last_message["type"] == "complete":
+                    return
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            await self.release_operation(operation_id, queue, error)
+
+    async def subscribe_raw(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        operation_id = self.get_next_operation_id()
+        queue = self.create_queue(operation_id, queue_size, overflow)
+
+        error: Optional[Exception] = None
+        try:
+            await self.begin_operation(operation_id, query, variables, operation)
+            async for payload in self.handle_operation_raw(queue):
                 yield payload
-        except StopAsyncIteration:
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            await self.release_operation(operation_id, queue, error)
+
+    def get_queue_options(
+        self, queue_size: Optional[int] = None, overflow: Optional[str] = None
+    ) -> tuple[int, str]:
+        return (
+            self._queue_size if queue_size is None else queue_size,
+            overflow or self._overflow,
+        )
+
+    def create_queue(
+        self,
+        operation_id: str,
+        queue_size: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ) -> OperationQueue:
+        queue = OperationQueue(*self.get_queue_options(queue_size, overflow))
+        self._execution_operation_message_queues[operation_id] = queue
+        return queue
+
+    async def begin_operation(
+        self,
+        operation_id: str,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        subscription: bool = True,
+    ) -> None:
+        self._operations[operation_id] = (query, variables, operation)
+        if self._metrics is not None and subscription:
+            self._meters[operation_id] = self._metrics.subscription_started(operation)
+        try:
+            if self._instrumentation is None:
+                await self.start_operation(operation_id, query, variables, operation)
+                return
+
+            trace = OperationTrace(
+                self._instrumentation, self.protocol, query, operation, operation_id
+            )
+            self._traces[operation_id] = trace
+            trace.start()
+            with trace.phase(SUBSCRIBE):
+                await self.start_operation(operation_id, query, variables, operation)
+        except BaseException:
+            # Operations that were never started are neither stopped nor restarted
+            self._operations.pop(operation_id, None)
+            raise
+
+    async def release_operation(
+        self,
+        operation_id: str,
+        queue: Union[OperationQueue, OperationBroadcast],
+        error: Optional[Exception] = None,
+    ) -> None:
+        # Called once the consumer is done, whether the operation completed, failed,
+        # or the consumer stopped early or was cancelled
+        await queue.close()
+        if self._execution_operation_message_queues.get(operation_id) is queue:
+            del self._execution_operation_message_queues[operation_id]
+        active = self._operations.pop(operation_id, None)
+
+        meter = self._meters.pop(operation_id, None)
+        if meter is not None:
+            cast(ClientMetrics, self._metrics).subscription_ended(meter, error)
+
+        trace = self._traces.pop(operation_id, None)
+        if trace is not None:
+            trace.end(error)
+
+        if active and not self._ws.closed:
             await self.stop_operation(operation_id)
-        except GraphQLWSOperationError as exc:
-            raise exc
+
+    def trace_message(
+        self, operation_id: str, queue: Union[OperationQueue, OperationBroadcast]
+    ) -> None:
+        trace = self._traces.get(operation_id)
+        if trace is not None:
+            trace.message_received(queue.stats()["depth"])
+
+    def count_message(self, operation_id: str) -> None:
+        meter = self._meters.get(operation_id)
+        if meter is not None:
+            meter.messages += 1
+
+    def queue_stats(self) -> dict[str, QueueStats]:
+        return {
+            operation_id: queue.stats()
+            for operation_id, queue in self._execution_operation_message_queues.items()
+        }
 
     def get_next_operation_id(self) -> str:
         self._last_operation_id += 1
@@ -100,10 +569,17 @@ class GraphQLWSManager:
             "type": "connection_init",
             "payload": params or {},
         }
-        await self._ws.send_json(connection_init_message)
+        await self.send_message(connection_init_message)
+
+        ws_message = await self._ws.receive()
+
+        if ws_message.type != aiohttp.WSMsgType.TEXT:
+            raise GraphQLWSConnectionClosedError(
+                self._ws.close_code, ws_message.extra or ""
+            )
 
-        message: GraphQLWSServerConnectionOperationMessage = (
-            await self._ws.receive_json()
+        message: GraphQLWSServerConnectionOperationMessage = ws_message.json(
+            loads=self._json_loads
         )
 
         if message["type"] == "connection_ack":
@@ -127,14 +603,19 @@ class GraphQLWSManager:
             "id": operation_id,
             "payload": payload,
         }
-        await self._ws.send_json(start_message)
+        await self.send_message(start_message)
 
     async def handle_connection(self) -> None:
-        async for ws_message in self._ws:
+        async for ws_message in self.receive_messages():
             if ws_message.type != aiohttp.WSMsgType.TEXT:
                 continue
 
-            message: GraphQLWSServerOperationMessage = ws_message.json()
+            if await self.route_data_message(ws_message.data):
+                continue
+
+            message: GraphQLWSServerOperationMessage = ws_message.json(
+                loads=self._json_loads
+            )
 
             if message["type"] == "ka":
                 continue
@@ -144,18 +625,23 @@ class GraphQLWSManager:
                 or message["type"] == "error"
                 or message["type"] == "complete"
             ):
-                self.yield_operation_message(message)
+                await self.yield_operation_message(message)
                 continue
 
     async def handle_operation(
-        self, operation_id: str
+        self, queue: OperationQueue
     ) -> AsyncGenerator[GraphQLWSDataMessagePayload, None]:
         while True:
-            operation_message = await self._execution_operation_message_queues[
-                operation_id
-            ].get()
+            operation_message = await queue.get()
+
+            if operation_message["type"] == "raw":
+                yield operation_message["payload"].decode()
+                continue
 
-            if operation_message["type"] == "data":
+            if (
+                operation_message["type"] == "data"
+                or operation_message["type"] == "next"
+            ):
                 yield operation_message["payload"]
                 continue
 
@@ -166,26 +652,245 @@ class GraphQLWSManager:
                 assert operation_message["type"] == "complete"
                 return
 
-    def yield_operation_message(
-        self, operation_message: GraphQLWSServerExecutionOperationMessage
+    async def handle_operation_raw(
+        self, queue: OperationQueue
+    ) -> AsyncGenerator[str, None]:
+        while True:
+            operation_message = await queue.get()
+
+            if operation_message["type"] == "raw":
+                yield operation_message["payload"].raw
+            elif (
+                operation_message["type"] == "data"
+                or operation_message["type"] == "next"
+            ):
+                yield encode_json(operation_message["payload"], self._json_dumps)
+            elif operation_message["type"] == "error":
+                raise GraphQLWSOperationError(operation_message["payload"])
+            else:
+                assert operation_message["type"] == "complete"
+                return
+
+    async def route_data_message(self, frame: str) -> bool:
+        parts = split_data_message(frame)
+        if parts is None or parts[0] != self.data_message_type:
+            return False
+
+        # Payloads are decoded once consumed, never for stopped operations
+        _, operation_id, start, end = parts
+        queue = self._execution_operation_message_queues.get(operation_id)
+        if queue is not None:
+            await queue.put(
+                {
+                    "type": "raw",
+                    "id": operation_id,
+                    "payload": RawPayload(frame, start, end, self._json_loads),
+                }
+            )
+            if self._meters:
+                self.count_message(operation_id)
+            if self._traces:
+                self.trace_message(operation_id, queue)
+        return True
+
+    async def yield_operation_message(
+        self, operation_message: OperationMessage
     ) -> None:
         operation_id = operation_message["id"]
-        self._execution_operation_message_queues[operation_id].put_nowait(
-            operation_message
-        )
+        if is_terminal(operation_message):
+            self._operations.pop(operation_id, None)
+
+        # Late messages of released operations are dropped
+        queue = self._execution_operation_message_queues.get(operation_id)
+        if queue is not None:
+            await queue.put(operation_message)
+            if is_terminal(operation_message):
+                return
+            if self._meters:
+                self.count_message(operation_id)
+            if self._traces:
+                self.trace_message(operation_id, queue)
 
     async def stop_operation(self, operation_id: str) -> None:
         stop_message: GraphQLWSStopMessage = {
             "type": "stop",
             "id": operation_id,
         }
-        await self._ws.send_json(stop_message)
+        await self.send_message(stop_message)
+
+    async def send_message(self, message: Mapping[str, Any]) -> None:
+        data = encode_json(message, self._json_dumps)
+        await self._ws.send_str(data)
+        if self._metrics is not None:
+            self._metrics.bytes_sent.inc(self.protocol, encoded_size(data))
 
     async def terminate_connection(self) -> None:
         terminate_message: GraphQLWSConnectionTerminateMessage = {
             "type": "connection_terminate"
         }
-        await self._ws.send_json(terminate_message)
+        await self.send_message(terminate_message)
+
+
+class GraphQLTransportWSManager(GraphQLWSManager):
+    protocol = GRAPHQL_TRANSPORT_WS
+    data_message_type = "next"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pong_waiters: deque[asyncio.Future[Optional[dict[str, Any]]]] = deque()
+
+    async def execute(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+    ) -> GraphQLWSDataMessagePayload:
+        operation_id = self.get_next_operation_id()
+        queue = self.create_queue(operation_id)
+
+        result: Optional[GraphQLWSDataMessagePayload] = None
+        error: Optional[Exception] = None
+        started = time.perf_counter()
+        try:
+            # Queries and mutations are requests, not subscriptions
+            await self.begin_operation(
+                operation_id, query, variables, operation, subscription=False
+            )
+            async for payload in self.handle_operation(queue):
+                result = payload
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            await self.release_operation(operation_id, queue, error)
+            if self._metrics is not None:
+                duration = time.perf_counter() - started
+                self._metrics.request_finished(operation, duration)
+                self._metrics.operation_ended(error)
+
+        if result is None:
+            raise GraphQLWSProtocolError(None)
+        return result
+
+    async def ping(
+        self, payload: Optional[dict[str, Any]] = None
+    ) -> Optional[dict[str, Any]]:
+        waiter = await self.send_ping(payload)
+        return await waiter
+
+    async def send_ping(
+        self, payload: Optional[dict[str, Any]] = None
+    ) -> "asyncio.Future[Optional[dict[str, Any]]]":
+        if self._ws.closed:
+            raise GraphQLWSConnectionClosedError(
+                self._ws.close_code, self._close_reason
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._pong_waiters.append(waiter)
+
+        ping_message: GraphQLTransportWSPingMessage = {"type": "ping"}
+        if payload is not None:
+            ping_message["payload"] = payload
+        await self.send_message(ping_message)
+
+        return waiter
+
+    def connection_closed(self) -> None:
+        # Pongs are never received once the connection is closed, even if it is
+        # reestablished later
+        error = GraphQLWSConnectionClosedError(self._ws.close_code, self._close_reason)
+        while self._pong_waiters:
+            waiter = self._pong_waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(error)
+
+    async def probe_connection(self) -> bool:
+        # Unlike graphql-ws, servers are not required to send keep-alives. Any
+        # message proves the connection alive, so nothing waits for the pong, which
+        # would otherwise be mistaken for the answer to a later ping.
+        ping_message: GraphQLTransportWSPingMessage = {"type": "ping"}
+        await self.send_message(ping_message)
+        return True
+
+    async def init_connection(self, params: Optional[ConnectionInitParams]) -> None:
+        connection_init_message: GraphQLTransportWSConnectionInitMessage = {
+            "type": "connection_init",
+        }
+        if params is not None:
+            connection_init_message["payload"] = params
+        await self.send_message(connection_init_message)
+
+        ws_message = await self._ws.receive()
+
+        if ws_message.type != aiohttp.WSMsgType.TEXT:
+            raise GraphQLWSConnectionClosedError(
+                self._ws.close_code, ws_message.extra or ""
+            )
+
+        message: GraphQLTransportWSServerMessage = ws_message.json(
+            loads=self._json_loads
+        )
+
+        if message["type"] != "connection_ack":
+            raise GraphQLWSProtocolError(message.get("payload"))
+
+    async def start_operation(
+        self,
+        operation_id: str,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+    ) -> None:
+        payload = serialize_payload(query, variables, operation)
+        subscribe_message: GraphQLTransportWSSubscribeMessage = {
+            "type": "subscribe",
+            "id": operation_id,
+            "payload": payload,
+        }
+        await self.send_message(subscribe_message)
+
+    async def handle_connection(self) -> None:
+        async for ws_message in self.receive_messages():
+            if ws_message.type != aiohttp.WSMsgType.TEXT:
+                continue
+
+            if await self.route_data_message(ws_message.data):
+                continue
+
+            message: GraphQLTransportWSServerMessage = ws_message.json(
+                loads=self._json_loads
+            )
+
+            if message["type"] == "ping":
+                pong_message: GraphQLTransportWSPongMessage = {"type": "pong"}
+                await self.send_message(pong_message)
+                continue
+
+            if message["type"] == "pong":
+                if self._pong_waiters:
+                    waiter = self._pong_waiters.popleft()
+                    if not waiter.done():
+                        waiter.set_result(message.get("payload"))
+                continue
+
+            if (
+                message["type"] == "next"
+                or message["type"] == "error"
+                or message["type"] == "complete"
+            ):
+                await self.yield_operation_message(message)
+                continue
+
+    async def stop_operation(self, operation_id: str) -> None:
+        complete_message: GraphQLTransportWSCompleteMessage = {
+            "type": "complete",
+            "id": operation_id,
+        }
+        await self.send_message(complete_message)
+
+    async def terminate_connection(self) -> None:
+        await self._ws.close()
 
 
 class GraphQLClient:
@@ -193,82 +898,562 @@ class GraphQLClient:
         self,
         endpoint: str,
         session: Union[aiohttp.ClientSession, aiohttp.test_utils.TestClient],
+        deduplicate: bool = False,
+        cache: Optional[ResponseCache] = None,
+        store: Optional["EntityStore"] = None,
+        persisted_queries: bool = False,
+        persisted_queries_get: bool = False,
+        json_dumps: JSONEncoder = json.dumps,
+        json_loads: JSONDecoder = json.loads,
+        instrumentation: Optional[Instrumentation] = None,
+        metrics: Optional[ClientMetrics] = None,
     ) -> None:
         self.endpoint = endpoint
         self.session = session
+        self.deduplicate = deduplicate
+        self.cache = cache
+        self.store = store
+        self.persisted_queries = persisted_queries
+        self.persisted_queries_get = persisted_queries_get
+        self.json_dumps = json_dumps
+        self.json_loads = json_loads
+        self.instrumentation = instrumentation
+        self.metrics = metrics
+        self._in_flight_requests: dict[str, asyncio.Task[aiohttp.ClientResponse]] = {}
+        self._background_tasks: set[asyncio.Task[ExecutionResult]] = set()
+        self._results: weakref.WeakKeyDictionary[
+            aiohttp.ClientResponse, GraphQLResult
+        ] = weakref.WeakKeyDictionary()
+
+    @overload
+    def connect(
+        self,
+        protocol: Literal["graphql-transport-ws"],
+        params: Optional[ConnectionInitParams] = None,
+        **kwargs: Any,
+    ) -> GraphQLTransportWSManager: ...
 
+    @overload
     def connect(
-        self, protocol: str = GRAPHQL_WS, params: Optional[ConnectionInitParams] = None
+        self,
+        protocol: str = GRAPHQL_WS,
+        params: Optional[ConnectionInitParams] = None,
+        **kwargs: Any,
+    ) -> GraphQLWSManager: ...
+
+    def connect(
+        self,
+        protocol: str = GRAPHQL_WS,
+        params: Optional[ConnectionInitParams] = None,
+        **kwargs: Any,
     ) -> GraphQLWSManager:
-        if protocol == GRAPHQL_WS:
-            return GraphQLWSManager(self.endpoint, self.session, params)
-        raise ValueError(protocol)
+        managers = {
+            GRAPHQL_WS: GraphQLWSManager,
+            GRAPHQL_TRANSPORT_WS: GraphQLTransportWSManager,
+        }
+        if protocol not in managers:
+            raise ValueError(protocol)
+        kwargs.setdefault("instrumentation", self.instrumentation)
+        kwargs.setdefault("metrics", self.metrics)
+        return managers[protocol](
+            self.endpoint,
+            self.session,
+            params,
+            json_dumps=self.json_dumps,
+            json_loads=self.json_loads,
+            **kwargs,
+        )
+
+    def pool(
+        self,
+        protocol: str = GRAPHQL_WS,
+        params: Optional[ConnectionInitParams] = None,
+        max_connections: int = 4,
+        idle_timeout: Optional[float] = 30,
+        **kwargs: Any,
+    ) -> GraphQLWSPool:
+        return GraphQLWSPool(
+            partial(self.connect, protocol, params, **kwargs),
+            max_connections=max_connections,
+            idle_timeout=idle_timeout,
+        )
+
+    def batch(
+        self, max_size: int = 10, window: float = 0.01, **kwargs
+    ) -> GraphQLBatchManager:
+        return GraphQLBatchManager(self, max_size=max_size, window=window, **kwargs)
 
     async def execute(
         self,
         query: str,
         variables: Optional[Variables] = None,
         operation: Optional[str] = None,
+        use_cache: bool = True,
+        **kwargs,
+    ) -> aiohttp.ClientResponse:
+        with trace_operation(self.instrumentation, query, operation):
+            if self.metrics is None:
+                return await self.execute_traced(
+                    query, variables, operation, use_cache, **kwargs
+                )
+
+            started = time.perf_counter()
+            try:
+                return await self.execute_traced(
+                    query, variables, operation, use_cache, **kwargs
+                )
+            finally:
+                duration = time.perf_counter() - started
+                self.metrics.request_finished(operation, duration)
+
+    async def execute_traced(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        use_cache: bool = True,
         **kwargs,
     ) -> aiohttp.ClientResponse:
         nulled_variables, files_to_paths_mapping = self.prepare(variables)
 
+        # Variables without files are serialized along with the request
+        form_data: Optional[aiohttp.FormData] = None
         if files_to_paths_mapping:
-            form_data = self.prepare_multipart(
+            with trace_phase(SERIALIZE):
+                form_data = self.prepare_multipart(
+                    query=query,
+                    nulled_variables=nulled_variables,
+                    files_to_paths_mapping=files_to_paths_mapping,
+                    operation=operation,
+                    json_dumps=self.json_dumps,
+                )
+
+        if form_data is not None:
+            if self.metrics is not None:
+                self.metrics.uploads_sent(files_to_paths_mapping)
+            return await self.post(data=form_data, **kwargs)
+
+        json_data = serialize_payload(query, variables, operation)
+        cache = self.cache if use_cache else None
+
+        if not (self.deduplicate or cache is not None):
+            return await self.post_payload(json_data, **kwargs)
+
+        if get_operation_type(query, operation) != "query":
+            return await self.post_payload(json_data, **kwargs)
+
+        key = hash_payload(json_data, **kwargs)
+
+        if cache is not None:
+            cached_response = cache.get(key)
+            if cached_response is not None:
+                return cached_response
+
+        if self.deduplicate:
+            response = await self.post_deduplicated(key, json_data, **kwargs)
+        else:
+            response = await self.post_payload(json_data, **kwargs)
+
+        if cache is not None and await self.is_successful(response):
+            cache.set(key, response)
+
+        return response
+
+    async def is_successful(self, response: aiohttp.ClientResponse) -> bool:
+        if not response.ok:
+            return False
+
+        # The decoded body is kept along with the response for execute_result
+        result = await self.get_result(response)
+        try:
+            with trace_phase(DECODE):
+                decoded = result.decoded
+        except Exception:
+            return False
+        return isinstance(decoded, dict) and not decoded.get("errors")
+
+    async def execute_result(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        **kwargs,
+    ) -> GraphQLResult:
+        with trace_operation(self.instrumentation, query, operation):
+            response = await self.execute(query, variables, operation, **kwargs)
+
+        return await self.get_result(response)
+
+    async def get_result(self, response: aiohttp.ClientResponse) -> GraphQLResult:
+        result = self._results.get(response)
+        if result is None:
+            # Decoders accept bytes, decoding them to a string first would copy them
+            body = await response.read()
+            result = GraphQLResult(body, loads=self.decode_result, response=response)
+            self._results[response] = result
+
+        return result
+
+    def decode_result(self, body: Union[str, bytes]) -> Any:
+        # Results are decoded once, so their errors are counted once
+        result = self.json_loads(body)
+        if self.metrics is not None:
+            self.metrics.result_received(result)
+        return result
+
+    async def execute_stream(
+        self,
+        query: str,
+        path: Union[str, Sequence[str]],
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        chunk_size: int = 2**16,
+        **kwargs,
+    ) -> AsyncGenerator[Any, None]:
+        trace = start_trace(self.instrumentation, query, operation)
+        error: Optional[Exception] = None
+        started = time.perf_counter()
+        try:
+            with trace_phase_of(trace, SERIALIZE):
+                data = self.prepare_body(query, variables, operation)
+            parser = JSONItemsParser(path)
+
+            if self.metrics is not None:
+                self.metrics.request_sent(data)
+
+            with trace_phase_of(trace, REQUEST):
+                response = await self.session.post(self.endpoint, data=data, **kwargs)
+
+            async with response:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    if self.metrics is not None:
+                        self.metrics.bytes_received.inc(HTTP, len(chunk))
+                    for item in parser.feed(chunk):
+                        yield self.json_loads(item)
+
+                parser.close()
+
+            if parser.errors is not None:
+                errors = self.json_loads(parser.errors)
+                if errors:
+                    if self.metrics is not None:
+                        self.metrics.errors.inc(RESPONSE_ERRORS)
+                    raise GraphQLResponseError(errors)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            if self.metrics is not None:
+                duration = time.perf_counter() - started
+                self.metrics.request_finished(operation, duration)
+            if trace is not None:
+                trace.end(error)
+
+    async def execute_incremental(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncGenerator[IncrementalResult, None]:
+        headers = {"Accept": INCREMENTAL_DELIVERY_ACCEPT, **kwargs.pop("headers", {})}
+        result = IncrementalResult()
+
+        trace = start_trace(self.instrumentation, query, operation)
+        error: Optional[Exception] = None
+        started = time.perf_counter()
+        try:
+            with trace_phase_of(trace, SERIALIZE):
+                data = self.prepare_body(query, variables, operation)
+
+            if self.metrics is not None:
+                self.metrics.request_sent(data)
+
+            with trace_phase_of(trace, REQUEST):
+                response = await self.session.post(
+                    self.endpoint, data=data, headers=headers, **kwargs
+                )
+
+            async with response:
+                if response.content_type != "multipart/mixed":
+                    with trace_phase_of(trace, READ):
+                        body = await response.read()
+                    payload = self.json_loads(body)
+                    if self.metrics is not None:
+                        self.metrics.bytes_received.inc(HTTP, len(body))
+                        self.metrics.result_received(payload)
+                    result.apply(payload)
+                    yield result
+                    return
+
+                boundary = get_boundary(response.headers[aiohttp.hdrs.CONTENT_TYPE])
+                parser = MultipartMixedParser(boundary)
+
+                async for chunk in response.content.iter_any():
+                    if self.metrics is not None:
+                        self.metrics.bytes_received.inc(HTTP, len(chunk))
+                    for body in parser.feed(chunk):
+                        payload = self.json_loads(body) if body.strip() else None
+                        if not payload:
+                            continue
+
+                        if self.metrics is not None:
+                            self.metrics.result_received(payload)
+
+                        result.apply(payload)
+                        yield result
+
+                        if not result.has_next:
+                            return
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            if self.metrics is not None:
+                duration = time.perf_counter() - started
+                self.metrics.request_finished(operation, duration)
+            if trace is not None:
+                trace.end(error)
+
+    async def post(self, **kwargs) -> aiohttp.ClientResponse:
+        with trace_phase(REQUEST):
+            response = await self.session.post(self.endpoint, **kwargs)
+
+        # Reading the whole body releases the connection, while the response keeps
+        # the body to be read again, which it wouldn't after an explicit release
+        with trace_phase(READ):
+            body = await response.read()
+        if self.metrics is not None:
+            self.metrics.request_sent(kwargs.get("data"))
+            self.metrics.bytes_received.inc(HTTP, len(body))
+        return response
+
+    async def post_json(self, obj: Any, **kwargs) -> aiohttp.ClientResponse:
+        return await self.post(data=self.json_payload(obj), **kwargs)
+
+    def json_payload(self, obj: Any) -> aiohttp.BytesPayload:
+        with trace_phase(SERIALIZE):
+            encoded = self.json_dumps(obj)
+        if isinstance(encoded, str):
+            encoded = encoded.encode()
+        return aiohttp.BytesPayload(encoded, content_type="application/json")
+
+    async def get(self, **kwargs) -> aiohttp.ClientResponse:
+        with trace_phase(REQUEST):
+            response = await self.session.get(self.endpoint, **kwargs)
+
+        with trace_phase(READ):
+            body = await response.read()
+        if self.metrics is not None:
+            self.metrics.bytes_received.inc(HTTP, len(body))
+        return response
+
+    async def post_payload(
+        self, json_data: Payload, **kwargs
+    ) -> aiohttp.ClientResponse:
+        if self.persisted_queries:
+            return await self.post_persisted(json_data, **kwargs)
+        return await self.post_json(json_data, **kwargs)
+
+    async def post_persisted(
+        self, json_data: Payload, **kwargs
+    ) -> aiohttp.ClientResponse:
+        query = json_data["query"]
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": hash_query(query)}}
+        persisted_data = json_data.copy()
+        del persisted_data["query"]
+        persisted_data["extensions"] = extensions
+
+        operation = json_data.get("operationName")
+        if (
+            self.persisted_queries_get
+            and get_operation_type(query, operation) == "query"
+        ):
+            params = dict(kwargs.get("params") or {})
+            params.update(serialize_query_params(persisted_data, self.json_dumps))
+            response = await self.get(**{**kwargs, "params": params})
+        else:
+            response = await self.post_json(persisted_data, **kwargs)
+
+        error = get_persisted_query_error(await response.read(), self.json_loads)
+
+        if error is None:
+            return response
+
+        if error == PERSISTED_QUERY_NOT_SUPPORTED:
+            self.persisted_queries = False
+
+        return await self.post_json({**json_data, "extensions": extensions}, **kwargs)
+
+    async def post_deduplicated(
+        self, key: str, json_data: Payload, **kwargs
+    ) -> aiohttp.ClientResponse:
+        task = self._in_flight_requests.get(key)
+
+        if task is None:
+            task = asyncio.create_task(self.post_payload(json_data, **kwargs))
+            task.add_done_callback(lambda _: self._in_flight_requests.pop(key, None))
+            self._in_flight_requests[key] = task
+
+        return await asyncio.shield(task)
+
+    async def fetch(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        fetch_policy: str = CACHE_FIRST,
+        **kwargs,
+    ) -> ExecutionResult:
+        if fetch_policy not in (CACHE_FIRST, NETWORK_ONLY, CACHE_AND_NETWORK):
+            raise ValueError(fetch_policy)
+
+        if self.store is None or fetch_policy == NETWORK_ONLY:
+            return await self.fetch_network(query, variables, operation, **kwargs)
+
+        data = self.store.read(query, variables, operation)
+        if data is None:
+            return await self.fetch_network(query, variables, operation, **kwargs)
+
+        if fetch_policy == CACHE_AND_NETWORK:
+            task = asyncio.create_task(
+                self.fetch_network(query, variables, operation, **kwargs)
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self.discard_background_task)
+
+        return {"data": data}
+
+    async def fetch_network(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        **kwargs,
+    ) -> ExecutionResult:
+        with trace_operation(self.instrumentation, query, operation):
+            graphql_result = await self.execute_result(
+                query, variables, operation, **kwargs
+            )
+            with trace_phase(DECODE):
+                result = graphql_result.decoded
+
+        if self.store is not None and "data" in result and not result.get("errors"):
+            self.store.write(query, result["data"], variables, operation)
+
+        return result
+
+    def discard_background_task(self, task: asyncio.Task[ExecutionResult]) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    def cache_key(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        **kwargs,
+    ) -> str:
+        return hash_payload(serialize_payload(query, variables, operation), **kwargs)
+
+    def prepare_body(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+    ) -> Union[aiohttp.FormData, aiohttp.BytesPayload]:
+        nulled_variables, files_to_paths_mapping = self.prepare(variables)
+
+        if files_to_paths_mapping:
+            if self.metrics is not None:
+                self.metrics.uploads_sent(files_to_paths_mapping)
+            return self.prepare_multipart(
                 query=query,
                 nulled_variables=nulled_variables,
                 files_to_paths_mapping=files_to_paths_mapping,
                 operation=operation,
+                json_dumps=self.json_dumps,
             )
-            kwargs["data"] = form_data
-        else:
-            json_data = serialize_payload(query, variables, operation)
-            kwargs["json"] = json_data
 
-        async with self.session.post(self.endpoint, **kwargs) as response:
-            await response.read()
-            return response
+        return self.json_payload(serialize_payload(query, variables, operation))
 
     @classmethod
     def prepare(
         cls, variables: Optional[Variables]
     ) -> tuple[Optional[Variables], FilesToPathsMapping]:
         files_to_paths_mapping: FilesToPathsMapping = {}
+        payloads: dict[int, aiohttp.payload.Payload] = {}
+
+        # Keys leading to the current node, only joined to a path for files
+        keys: list[Union[str, int]] = ["variables"]
+
+        def add_file(
+            file: Union[IOBase, StreamingUpload, aiohttp.payload.Payload],
+        ) -> None:
+            path = ".".join(map(str, keys))
+            if file in files_to_paths_mapping:
+                files_to_paths_mapping[file].append(path)
+            else:
+                files_to_paths_mapping[file] = [path]
 
-        def separate_files(path: str, obj: VariableValue) -> VariableValue:
+        def separate_files(obj: VariableValue) -> VariableValue:
+            # Containers without files are returned as they are instead of being copied
             if isinstance(obj, list):
-                nulled_list: list[VariableValue] = []
+                nulled_list: Optional[list[VariableValue]] = None
                 for index, value in enumerate(obj):
-                    value = separate_files(f"{path}.{index}", value)
-                    nulled_list.append(value)
-                return nulled_list
+                    if type(value) in SCALAR_TYPES:
+                        continue
+                    keys.append(index)
+                    nulled_value = separate_files(value)
+                    keys.pop()
+                    if nulled_value is not value:
+                        if nulled_list is None:
+                            nulled_list = list(obj)
+                        nulled_list[index] = nulled_value
+                return obj if nulled_list is None else nulled_list
 
             elif isinstance(obj, dict):
-                nulled_dict: dict[str, VariableValue] = {}
-                for key, value in obj.items():
-                    value = separate_files(f"{path}.{key}", value)
-                    nulled_dict[key] = value
-                return nulled_dict
-
-            elif isinstance(obj, IOBase):
-                if obj in files_to_paths_mapping:
-                    files_to_paths_mapping[obj].append(path)
-                else:
-                    files_to_paths_mapping[obj] = [path]
+                return separate_mapping(obj)
+
+            elif isinstance(obj, (IOBase, StreamingUpload)):
+                add_file(obj)
                 return None
 
-            else:
-                return obj
+            elif isinstance(obj, PAYLOAD_TYPES):
+                # Buffers and paths are not necessarily hashable, so they are told
+                # apart by id
+                if id(obj) not in payloads:
+                    payloads[id(obj)] = (
+                        PathPayload(obj)
+                        if isinstance(obj, Path)
+                        else BufferPayload(cast(Buffer, obj))
+                    )
+                add_file(payloads[id(obj)])
+                return None
+
+            return obj
+
+        def separate_mapping(
+            obj: Mapping[str, VariableValue],
+        ) -> Mapping[str, VariableValue]:
+            nulled_dict: Optional[dict[str, VariableValue]] = None
+            for key, value in obj.items():
+                if type(value) in SCALAR_TYPES:
+                    continue
+                keys.append(key)
+                nulled_value = separate_files(value)
+                keys.pop()
+                if nulled_value is not value:
+                    if nulled_dict is None:
+                        nulled_dict = dict(obj)
+                    nulled_dict[key] = nulled_value
+            return obj if nulled_dict is None else nulled_dict
 
         if variables is None:
             return None, files_to_paths_mapping
 
-        nulled_variables: Variables = dict(
-            (key, separate_files(f"variables.{key}", value))
-            for key, value in variables.items()
-        )
-
-        return nulled_variables, files_to_paths_mapping
+        return separate_mapping(variables), files_to_paths_mapping
 
     @classmethod
     def prepare_multipart(
@@ -277,6 +1462,7 @@ class GraphQLClient:
         nulled_variables: Optional[Variables],
         files_to_paths_mapping: FilesToPathsMapping,
         operation: Optional[str] = None,
+        json_dumps: JSONEncoder = json.dumps,
     ) -> aiohttp.FormData:
         form_data = aiohttp.FormData()
         operations = serialize_payload(query, nulled_variables, operation)
@@ -285,14 +1471,31 @@ class GraphQLClient:
             str(i): files_to_paths_mapping[file]
             for i, file in enumerate(files_to_paths_mapping)
         }
-        file_streams = {str(i): file for i, file in enumerate(files_to_paths_mapping)}
+        file_streams = {
+            str(i): file
+            for i, file in enumerate(files_to_paths_mapping)
+            if isinstance(file, IOBase)
+        }
 
         form_data.add_field(
-            "operations", json.dumps(operations), content_type="application/json"
+            "operations",
+            encode_json(operations, json_dumps),
+            content_type="application/json",
         )
         form_data.add_field(
-            "map", json.dumps(file_map), content_type="application/json"
+            "map", encode_json(file_map, json_dumps), content_type="application/json"
         )
         form_data.add_fields(*file_streams.items())
 
+        for i, file in enumerate(files_to_paths_mapping):
+            if isinstance(file, StreamingUpload):
+                form_data.add_field(
+                    str(i),
+                    file,
+                    filename=file.filename or str(i),
+                    content_type=file.content_type,
+                )
+            elif isinstance(file, aiohttp.payload.Payload):
+                form_data.add_field(str(i), file, filename=file.filename or str(i))
+
         return form_data
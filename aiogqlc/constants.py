@@ -1 +1,23 @@
-GRAPHQL_WS = "graphql-ws"
+from typing import Final
+
+GRAPHQL_WS: Final = "graphql-ws"
+GRAPHQL_TRANSPORT_WS: Final = "graphql-transport-ws"
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop-oldest"
+OVERFLOW_DROP_NEWEST = "drop-newest"
+OVERFLOW_CONFLATE = "conflate"
+OVERFLOW_ERROR = "error"
+
+CACHE_FIRST = "cache-first"
+NETWORK_ONLY = "network-only"
+CACHE_AND_NETWORK = "cache-and-network"
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+INCREMENTAL_DELIVERY_ACCEPT = (
+    "multipart/mixed;incrementalSpec=v0.2, "
+    "multipart/mixed;deferSpec=20220824, "
+    "application/graphql-response+json, application/json"
+)
@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class GraphQLWSError(Exception):
     pass
 
@@ -14,3 +17,22 @@ class GraphQLWSProtocolError(GraphQLWSConnectionError):
 
 class GraphQLWSOperationError(GraphQLWSConnectionError):
     pass
+
+
+class GraphQLWSConnectionClosedError(GraphQLWSError):
+    def __init__(self, code: Optional[int], reason: str = ""):
+        self.code = code
+        self.reason = reason
+        super().__init__(code, reason)
+
+
+class GraphQLResponseError(Exception):
+    def __init__(self, payload: object):
+        self.payload = payload
+        super().__init__(payload)
+
+
+class GraphQLWSQueueOverflowError(GraphQLWSError):
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"More than {max_size} messages are waiting to be consumed")
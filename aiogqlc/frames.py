@@ -0,0 +1,53 @@
+# Part of the routing core, keep it compatible with mypyc (see `make compile`)
+
+import re
+from typing import Any, Optional
+
+from aiogqlc.types import JSONDecoder
+
+# Protocol messages only consist of an id, a type and a payload. Servers put the
+# payload last, so everything between its key and the closing brace is the payload.
+DATA_MESSAGE_HEAD = re.compile(
+    r'\{\s*(?:"type"\s*:\s*"(?P<type>\w+)"\s*,\s*"id"\s*:\s*"(?P<id>[^"\\]*)"'
+    r'|"id"\s*:\s*"(?P<id_first>[^"\\]*)"\s*,\s*"type"\s*:\s*"(?P<type_last>\w+)")'
+    r'\s*,\s*"payload"\s*:\s*'
+)
+WHITESPACE = " \t\n\r"
+
+
+def split_data_message(frame: str) -> Optional[tuple[str, str, int, int]]:
+    match = DATA_MESSAGE_HEAD.match(frame)
+    if match is None:
+        return None
+
+    end = len(frame.rstrip(WHITESPACE)) - 1
+    if end <= match.end() or frame[end] != "}":
+        return None
+
+    if match["type"] is not None:
+        return match["type"], match["id"], match.end(), end
+    return match["type_last"], match["id_first"], match.end(), end
+
+
+class RawPayload:
+    __slots__ = ("frame", "start", "end", "loads", "_value")
+
+    def __init__(self, frame: str, start: int, end: int, loads: JSONDecoder) -> None:
+        self.frame = frame
+        self.start = start
+        self.end = end
+        self.loads = loads
+        self._value: Any = None
+
+    @property
+    def raw(self) -> str:
+        return self.frame[self.start : self.end]
+
+    def decode(self) -> Any:
+        # Shared by all subscribers of a multicast operation, so decode only once
+        if self._value is None:
+            try:
+                self._value = self.loads(self.raw)
+            except ValueError:
+                self._value = self.loads(self.frame)["payload"]
+        return self._value
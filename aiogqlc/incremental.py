@@ -0,0 +1,141 @@
+from collections.abc import Mapping, Sequence
+from email.message import Message
+from typing import Any, Optional, Union
+
+from aiogqlc.types import GraphQLWSError
+
+Path = Sequence[Union[str, int]]
+
+
+def merge_data(target: dict[str, Any], source: Mapping[str, Any]) -> None:
+    for key, value in source.items():
+        existing = target.get(key)
+        if isinstance(existing, dict) and isinstance(value, Mapping):
+            merge_data(existing, value)
+        else:
+            target[key] = value
+
+
+def resolve_path(data: Any, path: Path) -> Any:
+    for key in path:
+        if isinstance(data, dict):
+            data = data.get(key)
+        elif isinstance(data, list) and isinstance(key, int) and key < len(data):
+            data = data[key]
+        else:
+            return None
+    return data
+
+
+def get_boundary(content_type: str) -> str:
+    message = Message()
+    message["Content-Type"] = content_type
+    boundary = message.get_param("boundary")
+    return boundary if isinstance(boundary, str) and boundary else "-"
+
+
+class MultipartMixedParser:
+    def __init__(self, boundary: str) -> None:
+        self._delimiter = b"\r\n--" + boundary.encode()
+        # The first delimiter may be sent without a preceding line break
+        self._buffer = bytearray(b"\r\n")
+        self._started = False
+        self._done = False
+
+    def feed(self, data: bytes) -> list[bytes]:
+        parts: list[bytes] = []
+        if self._done:
+            return parts
+
+        self._buffer += data
+
+        while True:
+            if self._started and self._buffer.startswith(b"--"):
+                self._done = True
+                self._buffer.clear()
+                break
+
+            index = self._buffer.find(self._delimiter)
+            if index == -1:
+                break
+
+            if self._started:
+                parts.append(self.get_body(self._buffer[:index]))
+            self._started = True
+            del self._buffer[: index + len(self._delimiter)]
+
+        return parts
+
+    @staticmethod
+    def get_body(part: bytearray) -> bytes:
+        index = part.find(b"\r\n\r\n")
+        return bytes(part[index + 4 :] if index != -1 else part)
+
+
+class IncrementalResult:
+    __slots__ = ("data", "errors", "extensions", "has_next", "payload", "_pending")
+
+    def __init__(self) -> None:
+        self.data: Any = None
+        self.errors: Optional[list[GraphQLWSError]] = None
+        self.extensions: Optional[dict[str, Any]] = None
+        self.has_next = True
+        self.payload: dict[str, Any] = {}
+        self._pending: dict[str, list[Union[str, int]]] = {}
+
+    def __repr__(self) -> str:
+        return f"<IncrementalResult data={self.data!r} has_next={self.has_next!r}>"
+
+    def apply(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+
+        if "path" in payload:
+            # Early drafts of the spec sent a single patch per payload
+            self.apply_incremental(payload)
+        elif "data" in payload:
+            self.data = payload["data"]
+
+        for pending in payload.get("pending", ()):
+            self._pending[pending["id"]] = pending["path"]
+
+        for incremental in payload.get("incremental", ()):
+            self.apply_incremental(incremental)
+
+        for completed in payload.get("completed", ()):
+            self._pending.pop(completed["id"], None)
+            self.add_errors(completed.get("errors"))
+
+        if "path" not in payload:
+            self.add_errors(payload.get("errors"))
+        if payload.get("extensions"):
+            self.extensions = {**(self.extensions or {}), **payload["extensions"]}
+
+        self.has_next = bool(payload.get("hasNext", False))
+
+    def apply_incremental(self, incremental: dict[str, Any]) -> None:
+        self.add_errors(incremental.get("errors"))
+
+        if "id" in incremental:
+            path = self._pending.get(incremental["id"])
+            if path is None:
+                return
+            path = [*path, *incremental.get("subPath", ())]
+            items_path = path
+        else:
+            path = incremental["path"]
+            items_path = path[:-1]
+
+        if "items" in incremental:
+            items = resolve_path(self.data, items_path)
+            if isinstance(items, list):
+                items.extend(incremental["items"])
+        elif incremental.get("data") is not None:
+            target = resolve_path(self.data, path)
+            if isinstance(target, dict):
+                merge_data(target, incremental["data"])
+
+    def add_errors(self, errors: Optional[list[GraphQLWSError]]) -> None:
+        if errors:
+            if self.errors is None:
+                self.errors = []
+            self.errors.extend(errors)
@@ -0,0 +1,171 @@
+import time
+from contextlib import AbstractContextManager, nullcontext
+from contextvars import ContextVar
+from types import TracebackType
+from typing import Any, Optional, Union
+
+HTTP = "http"
+
+SERIALIZE = "serialize"
+REQUEST = "request"
+READ = "read"
+DECODE = "decode"
+SUBSCRIBE = "subscribe"
+FIRST_DATA = "first_data"
+
+
+class Instrumentation:
+    def operation_started(self, trace: "OperationTrace") -> None:
+        pass
+
+    def operation_ended(
+        self, trace: "OperationTrace", error: Optional[BaseException]
+    ) -> None:
+        pass
+
+    def phase_started(self, trace: "OperationTrace", phase: str) -> None:
+        pass
+
+    def phase_ended(self, trace: "OperationTrace", phase: str, duration: float) -> None:
+        pass
+
+    def message_received(self, trace: "OperationTrace", queue_depth: int) -> None:
+        pass
+
+
+class OperationTrace:
+    __slots__ = (
+        "instrumentation",
+        "transport",
+        "query",
+        "operation",
+        "operation_id",
+        "started",
+        "messages",
+        "max_queue_depth",
+        "first_data",
+        "state",
+    )
+
+    def __init__(
+        self,
+        instrumentation: Instrumentation,
+        transport: str,
+        query: str,
+        operation: Optional[str] = None,
+        operation_id: Optional[str] = None,
+    ) -> None:
+        self.instrumentation = instrumentation
+        self.transport = transport
+        self.query = query
+        self.operation = operation
+        self.operation_id = operation_id
+        self.started = time.perf_counter()
+        self.messages = 0
+        self.max_queue_depth = 0
+        self.first_data: Optional[float] = None
+        # Instrumentations keep their own per-operation state here, like a span
+        self.state: Any = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.instrumentation.operation_started(self)
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        self.instrumentation.operation_ended(self, error)
+
+    def phase(self, name: str) -> "TracedPhase":
+        return TracedPhase(self, name)
+
+    def message_received(self, queue_depth: int) -> None:
+        self.messages += 1
+        if queue_depth > self.max_queue_depth:
+            self.max_queue_depth = queue_depth
+        if self.first_data is None:
+            self.first_data = time.perf_counter() - self.started
+            self.instrumentation.phase_ended(self, FIRST_DATA, self.first_data)
+        self.instrumentation.message_received(self, queue_depth)
+
+
+class TracedPhase:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: OperationTrace, name: str) -> None:
+        self.trace = trace
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+        self.trace.instrumentation.phase_started(self.trace, self.name)
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        duration = time.perf_counter() - self.started
+        self.trace.instrumentation.phase_ended(self.trace, self.name, duration)
+
+
+class TracedOperation:
+    __slots__ = ("trace", "token")
+
+    def __init__(self, trace: OperationTrace) -> None:
+        self.trace = trace
+
+    def __enter__(self) -> OperationTrace:
+        self.token = current_trace.set(self.trace)
+        self.trace.start()
+        return self.trace
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        current_trace.reset(self.token)
+        self.trace.end(exc_value)
+
+
+# The trace of the HTTP operation being executed, so nested calls report to it
+current_trace: ContextVar[Optional[OperationTrace]] = ContextVar(
+    "current_trace", default=None
+)
+
+
+def trace_operation(
+    instrumentation: Optional[Instrumentation], query: str, operation: Optional[str]
+) -> Union[TracedOperation, AbstractContextManager[Optional[OperationTrace]]]:
+    # Without instrumentation, or within a traced operation, nothing is traced
+    if instrumentation is None or current_trace.get() is not None:
+        return nullcontext()
+    return TracedOperation(OperationTrace(instrumentation, HTTP, query, operation))
+
+
+def start_trace(
+    instrumentation: Optional[Instrumentation], query: str, operation: Optional[str]
+) -> Optional[OperationTrace]:
+    # For operations that yield, which must not leave their trace in the context of
+    # their consumer, so their phases are traced with the trace given explicitly
+    if instrumentation is None or current_trace.get() is not None:
+        return None
+    trace = OperationTrace(instrumentation, HTTP, query, operation)
+    trace.start()
+    return trace
+
+
+def trace_phase(
+    name: str,
+) -> Union[TracedPhase, AbstractContextManager[None]]:
+    return trace_phase_of(current_trace.get(), name)
+
+
+def trace_phase_of(
+    trace: Optional[OperationTrace], name: str
+) -> Union[TracedPhase, AbstractContextManager[None]]:
+    if trace is None:
+        return nullcontext()
+    return TracedPhase(trace, name)
@@ -0,0 +1,149 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterable
+from io import IOBase
+from typing import Any, Optional, Union
+
+import aiohttp.payload
+
+from aiogqlc.errors import GraphQLWSOperationError
+from aiogqlc.instrumentation import HTTP
+from aiogqlc.types import HistogramSnapshot, MetricsSnapshot, SubscriptionSnapshot
+from aiogqlc.uploads import StreamingUpload, get_size
+
+OPERATION_ERRORS = "operation"
+RESPONSE_ERRORS = "response"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+RATE_BUCKETS = (0.1, 1, 10, 100, 1000, 10000)
+
+
+def encoded_size(data: Union[str, bytes]) -> int:
+    # Checking for ASCII is free, encoding is only needed for other strings
+    if isinstance(data, str) and not data.isascii():
+        return len(data.encode())
+    return len(data)
+
+
+class Counter:
+    __slots__ = ("values",)
+
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+
+    def inc(self, label: str, amount: int = 1) -> None:
+        self.values[label] = self.values.get(label, 0) + amount
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Iterable[float]) -> None:
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> HistogramSnapshot:
+        # Buckets are cumulative, like those of Prometheus
+        buckets: dict[float, int] = {}
+        total = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            total += count
+            buckets[bound] = total
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+class SubscriptionMeter:
+    __slots__ = ("operation", "started", "messages")
+
+    def __init__(self, operation: Optional[str]) -> None:
+        self.operation = operation
+        self.started = time.perf_counter()
+        self.messages = 0
+
+    def rate(self, now: float) -> float:
+        elapsed = now - self.started
+        return self.messages / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self, now: float) -> SubscriptionSnapshot:
+        return {
+            "operation": self.operation,
+            "messages": self.messages,
+            "messages_per_second": self.rate(now),
+        }
+
+
+class ClientMetrics:
+    def __init__(
+        self,
+        duration_buckets: Iterable[float] = DURATION_BUCKETS,
+        rate_buckets: Iterable[float] = RATE_BUCKETS,
+    ) -> None:
+        # Metrics are only updated from the event loop, so no locks are needed
+        self.requests = Counter()
+        self.errors = Counter()
+        self.bytes_sent = Counter()
+        self.bytes_received = Counter()
+        self.upload_bytes = 0
+        self.request_duration = Histogram(duration_buckets)
+        self.subscription_message_rate = Histogram(rate_buckets)
+        self.subscriptions: set[SubscriptionMeter] = set()
+
+    def request_finished(self, operation: Optional[str], duration: float) -> None:
+        self.requests.inc(operation or "")
+        self.request_duration.observe(duration)
+
+    def request_sent(self, data: Any) -> None:
+        if isinstance(data, aiohttp.payload.Payload) and data.size is not None:
+            self.bytes_sent.inc(HTTP, data.size)
+
+    def uploads_sent(
+        self, files: Iterable[Union[IOBase, StreamingUpload, aiohttp.payload.Payload]]
+    ) -> None:
+        # Uploads of unknown size, like streams, are not counted
+        for file in files:
+            size = get_size(file) if isinstance(file, IOBase) else file.size
+            if size is not None:
+                self.upload_bytes += size
+                self.bytes_sent.inc(HTTP, size)
+
+    def result_received(self, result: Any) -> None:
+        if isinstance(result, dict) and result.get("errors"):
+            self.errors.inc(RESPONSE_ERRORS)
+
+    def subscription_started(self, operation: Optional[str]) -> SubscriptionMeter:
+        self.requests.inc(operation or "")
+        meter = SubscriptionMeter(operation)
+        self.subscriptions.add(meter)
+        return meter
+
+    def subscription_ended(
+        self, meter: SubscriptionMeter, error: Optional[BaseException]
+    ) -> None:
+        self.subscriptions.discard(meter)
+        self.subscription_message_rate.observe(meter.rate(time.perf_counter()))
+        self.operation_ended(error)
+
+    def operation_ended(self, error: Optional[BaseException]) -> None:
+        if isinstance(error, GraphQLWSOperationError):
+            self.errors.inc(OPERATION_ERRORS)
+
+    def snapshot(self) -> MetricsSnapshot:
+        now = time.perf_counter()
+        return {
+            "requests": dict(self.requests.values),
+            "errors": dict(self.errors.values),
+            "bytes_sent": dict(self.bytes_sent.values),
+            "bytes_received": dict(self.bytes_received.values),
+            "upload_bytes": self.upload_bytes,
+            "active_subscriptions": len(self.subscriptions),
+            "subscriptions": [meter.snapshot(now) for meter in self.subscriptions],
+            "request_duration": self.request_duration.snapshot(),
+            "subscription_message_rate": self.subscription_message_rate.snapshot(),
+        }
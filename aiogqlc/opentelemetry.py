@@ -0,0 +1,68 @@
+import time
+from typing import Optional
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode, Tracer
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "The OpenTelemetry instrumentation requires opentelemetry-api, "
+        "install it using: pip install aiogqlc[opentelemetry]"
+    ) from exc
+
+from aiogqlc.instrumentation import HTTP, Instrumentation, OperationTrace
+from aiogqlc.utils import get_operation_type
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    def __init__(self, tracer: Optional[Tracer] = None) -> None:
+        self.tracer = tracer or trace.get_tracer("aiogqlc")
+
+    def operation_started(self, operation_trace: OperationTrace) -> None:
+        operation_type = get_operation_type(
+            operation_trace.query, operation_trace.operation
+        )
+        name = " ".join(
+            part for part in (operation_type, operation_trace.operation) if part
+        )
+
+        attributes = {
+            "graphql.document": operation_trace.query,
+            "aiogqlc.transport": operation_trace.transport,
+        }
+        if operation_type is not None:
+            attributes["graphql.operation.type"] = operation_type
+        if operation_trace.operation is not None:
+            attributes["graphql.operation.name"] = operation_trace.operation
+        if operation_trace.operation_id is not None:
+            attributes["aiogqlc.operation_id"] = operation_trace.operation_id
+
+        operation_trace.state = self.tracer.start_span(
+            name or "GraphQL Operation", kind=SpanKind.CLIENT, attributes=attributes
+        )
+
+    def operation_ended(
+        self, operation_trace: OperationTrace, error: Optional[BaseException]
+    ) -> None:
+        span = operation_trace.state
+        if operation_trace.transport != HTTP:
+            span.set_attribute("aiogqlc.messages", operation_trace.messages)
+            span.set_attribute(
+                "aiogqlc.max_queue_depth", operation_trace.max_queue_depth
+            )
+
+        if isinstance(error, Exception):
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        span.end()
+
+    def phase_ended(
+        self, operation_trace: OperationTrace, phase: str, duration: float
+    ) -> None:
+        # Phases become child spans, backdated by their duration
+        end_time = time.time_ns()
+        context = trace.set_span_in_context(operation_trace.state)
+        span = self.tracer.start_span(
+            phase, context=context, start_time=end_time - int(duration * 1e9)
+        )
+        span.end(end_time=end_time)
@@ -0,0 +1,149 @@
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional
+
+from aiogqlc.types import GraphQLWSDataMessagePayload, Variables
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aiogqlc.client import GraphQLWSManager
+
+
+class GraphQLWSPool:
+    def __init__(
+        self,
+        factory: Callable[[], "GraphQLWSManager"],
+        max_connections: int = 4,
+        idle_timeout: Optional[float] = 30,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError(max_connections)
+
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._factory = factory
+        self._connections: dict[GraphQLWSManager, int] = {}
+        self._idle_handles: dict[GraphQLWSManager, asyncio.TimerHandle] = {}
+        self._opening_tasks: set[asyncio.Task[GraphQLWSManager]] = set()
+        self._closing_tasks: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    async def __aenter__(self) -> "GraphQLWSPool":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    @property
+    def active_operations(self) -> dict["GraphQLWSManager", int]:
+        return dict(self._connections)
+
+    async def subscribe(
+        self,
+        query: str,
+        variables: Optional[Variables] = None,
+        operation: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[GraphQLWSDataMessagePayload, None]:
+        connection = await self.acquire()
+        try:
+            async for payload in connection.subscribe(
+                query, variables, operation, **kwargs
+            ):
+                yield payload
+        finally:
+            self.release(connection)
+
+    async def acquire(self) -> "GraphQLWSManager":
+        while True:
+            self.discard_closed_connections()
+
+            # Connections being reestablished are skipped and replaced meanwhile
+            connected = [
+                connection for connection in self._connections if connection.connected
+            ]
+            connection = min(connected, key=self._connections.__getitem__, default=None)
+            can_open = len(connected) + len(self._opening_tasks) < self.max_connections
+
+            if connection is not None and (
+                self._connections[connection] == 0 or not can_open
+            ):
+                break
+
+            if can_open:
+                task = asyncio.create_task(self.open_connection())
+                self._opening_tasks.add(task)
+                task.add_done_callback(self._opening_tasks.discard)
+                connection = await task
+                break
+
+            await asyncio.wait(self._opening_tasks, return_when=asyncio.FIRST_COMPLETED)
+
+        self._connections[connection] += 1
+        handle = self._idle_handles.pop(connection, None)
+        if handle is not None:
+            handle.cancel()
+        return connection
+
+    def release(self, connection: "GraphQLWSManager") -> None:
+        if connection not in self._connections:
+            return
+
+        self._connections[connection] -= 1
+        if self._connections[connection] == 0:
+            self.schedule_idle_close(connection)
+
+    async def open_connection(self) -> "GraphQLWSManager":
+        connection = await self._factory().__aenter__()
+        self._connections[connection] = 0
+        self.schedule_idle_close(connection)
+        return connection
+
+    def schedule_idle_close(self, connection: "GraphQLWSManager") -> None:
+        if self.idle_timeout is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._idle_handles[connection] = loop.call_later(
+            self.idle_timeout, self.close_idle_connection, connection
+        )
+
+    def close_idle_connection(self, connection: "GraphQLWSManager") -> None:
+        del self._idle_handles[connection]
+        del self._connections[connection]
+        self.close_connection(connection)
+
+    def discard_closed_connections(self) -> None:
+        for connection in [
+            connection for connection in self._connections if connection.closed
+        ]:
+            handle = self._idle_handles.pop(connection, None)
+            if handle is not None:
+                handle.cancel()
+            del self._connections[connection]
+            self.close_connection(connection)
+
+    def close_connection(self, connection: "GraphQLWSManager") -> None:
+        task = asyncio.create_task(connection.__aexit__(None, None, None))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    async def aclose(self) -> None:
+        for handle in self._idle_handles.values():
+            handle.cancel()
+        self._idle_handles.clear()
+
+        connections = list(self._connections)
+        self._connections.clear()
+
+        await asyncio.gather(
+            *self._closing_tasks,
+            *(connection.__aexit__(None, None, None) for connection in connections),
+        )
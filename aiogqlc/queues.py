@@ -0,0 +1,201 @@
+# Part of the routing core, keep it compatible with mypyc (see `make compile`)
+
+import asyncio
+from collections import deque
+from typing import Optional
+
+from aiogqlc.constants import (
+    OVERFLOW_BLOCK,
+    OVERFLOW_CONFLATE,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_ERROR,
+)
+from aiogqlc.errors import GraphQLWSQueueOverflowError
+from aiogqlc.types import OperationMessage, QueueStats
+
+OVERFLOW_POLICIES = (
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_CONFLATE,
+    OVERFLOW_ERROR,
+)
+
+
+def is_terminal(message: OperationMessage) -> bool:
+    return message["type"] == "complete" or message["type"] == "error"
+
+
+class OperationQueue:
+    def __init__(self, max_size: int = 0, overflow: str = OVERFLOW_BLOCK) -> None:
+        if max_size < 0:
+            raise ValueError(max_size)
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(overflow)
+
+        self.max_size = max_size
+        self.overflow = overflow
+        self.max_depth = 0
+        self.dropped = 0
+        self._messages: deque[OperationMessage] = deque()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._error: Optional[Exception] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def full(self) -> bool:
+        return 0 < self.max_size <= len(self._messages)
+
+    def stats(self) -> QueueStats:
+        return {
+            "depth": len(self._messages),
+            "max_depth": self.max_depth,
+            "dropped": self.dropped,
+        }
+
+    def wake(self) -> None:
+        # Consumers and blocked producers re-check the state after any change
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait(self) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    async def close(self) -> None:
+        self._closed = True
+        self._messages.clear()
+        self.wake()
+
+    async def fail(self, error: Exception) -> None:
+        self._error = error
+        self.wake()
+
+    async def get(self) -> OperationMessage:
+        while not self._messages:
+            if self._error is not None:
+                raise self._error
+            await self.wait()
+
+        message = self._messages.popleft()
+        self.wake()
+        return message
+
+    async def get_batch(
+        self, max_items: int, max_latency: float = 0
+    ) -> list[OperationMessage]:
+        if max_items < 1:
+            raise ValueError(max_items)
+
+        while not self._messages:
+            if self._error is not None:
+                raise self._error
+            await self.wait()
+
+        if max_latency > 0 and not self.batch_ready(max_items):
+            try:
+                await asyncio.wait_for(self.wait_for_batch(max_items), max_latency)
+            except asyncio.TimeoutError:
+                pass
+
+        if not self._messages:
+            assert self._error is not None
+            raise self._error
+        batch = [
+            self._messages.popleft() for _ in range(min(max_items, len(self._messages)))
+        ]
+        self.wake()
+        return batch
+
+    async def wait_for_batch(self, max_items: int) -> None:
+        while self._error is None and not self.batch_ready(max_items):
+            await self.wait()
+
+    def batch_ready(self, max_items: int) -> bool:
+        # Nothing follows a terminal message, so there is no point in waiting
+        return len(self._messages) >= max_items or is_terminal(self._messages[-1])
+
+    async def put(self, message: OperationMessage) -> None:
+        while not self.put_nowait(message):
+            await self.wait()
+
+    def put_nowait(self, message: OperationMessage) -> bool:
+        # Returns False if the message has to wait for room in a blocking queue
+        if self._closed or self._error is not None:
+            return True
+
+        # Terminal messages are never dropped and may exceed the limit
+        if self.full() and not is_terminal(message):
+            if self.overflow == OVERFLOW_BLOCK:
+                return False
+            elif self.overflow == OVERFLOW_DROP_OLDEST:
+                self._messages.popleft()
+                self.dropped += 1
+            elif self.overflow == OVERFLOW_DROP_NEWEST:
+                self.dropped += 1
+                return True
+            elif self.overflow == OVERFLOW_CONFLATE:
+                self.dropped += len(self._messages)
+                self._messages.clear()
+            else:
+                assert self.overflow == OVERFLOW_ERROR
+                self.dropped += len(self._messages) + 1
+                self._messages.clear()
+                self._error = GraphQLWSQueueOverflowError(self.max_size)
+                self.wake()
+                return True
+
+        self._messages.append(message)
+        if len(self._messages) > self.max_depth:
+            self.max_depth = len(self._messages)
+        self.wake()
+        return True
+
+
+class OperationBroadcast:
+    def __init__(self) -> None:
+        self._queues: list[OperationQueue] = []
+
+    def __len__(self) -> int:
+        return len(self._queues)
+
+    def subscribe(
+        self, max_size: int = 0, overflow: str = OVERFLOW_BLOCK
+    ) -> OperationQueue:
+        queue = OperationQueue(max_size, overflow)
+        self._queues.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: OperationQueue) -> None:
+        self._queues.remove(queue)
+
+    def stats(self) -> QueueStats:
+        return {
+            "depth": max((len(queue) for queue in self._queues), default=0),
+            "max_depth": max((queue.max_depth for queue in self._queues), default=0),
+            "dropped": sum(queue.dropped for queue in self._queues),
+        }
+
+    async def close(self) -> None:
+        for queue in tuple(self._queues):
+            await queue.close()
+
+    async def fail(self, error: Exception) -> None:
+        for queue in tuple(self._queues):
+            await queue.fail(error)
+
+    async def put(self, message: OperationMessage) -> None:
+        # Subscribers share the message, it is not copied for each of them
+        for queue in tuple(self._queues):
+            await queue.put(message)
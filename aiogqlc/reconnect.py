@@ -0,0 +1,36 @@
+import random
+from typing import Optional
+
+
+class ReconnectPolicy:
+    def __init__(
+        self,
+        initial_delay: float = 0.5,
+        max_delay: float = 30,
+        factor: float = 2,
+        jitter: float = 0.5,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        if initial_delay < 0 or max_delay < initial_delay:
+            raise ValueError(initial_delay, max_delay)
+        if factor < 1:
+            raise ValueError(factor)
+        if not 0 <= jitter <= 1:
+            raise ValueError(jitter)
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError(max_attempts)
+
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+
+    def can_retry(self, attempt: int) -> bool:
+        return self.max_attempts is None or attempt <= self.max_attempts
+
+    def delay(self, attempt: int) -> float:
+        exponent = min(attempt - 1, 64)
+        delay = min(self.initial_delay * self.factor**exponent, self.max_delay)
+        # Spread reconnecting clients so they don't hit the server all at once
+        return delay * random.uniform(1 - self.jitter, 1)
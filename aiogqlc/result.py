@@ -0,0 +1,46 @@
+import json
+from typing import Any, Optional, Union
+
+import aiohttp
+
+from aiogqlc.types import ExecutionResult, GraphQLWSError, JSONDecoder
+
+
+class GraphQLResult:
+    __slots__ = ("_body", "_decoded", "_loads", "response")
+
+    def __init__(
+        self,
+        body: Union[str, bytes],
+        loads: JSONDecoder = json.loads,
+        response: Optional[aiohttp.ClientResponse] = None,
+    ) -> None:
+        self._body = body
+        self._decoded: Optional[ExecutionResult] = None
+        self._loads = loads
+        self.response = response
+
+    def __repr__(self) -> str:
+        return f"<GraphQLResult {self.decoded!r}>"
+
+    @property
+    def body(self) -> Union[str, bytes]:
+        return self._body
+
+    @property
+    def decoded(self) -> ExecutionResult:
+        if self._decoded is None:
+            self._decoded = self._loads(self._body)
+        return self._decoded
+
+    @property
+    def data(self) -> Any:
+        return self.decoded.get("data")
+
+    @property
+    def errors(self) -> Optional[list[GraphQLWSError]]:
+        return self.decoded.get("errors")
+
+    @property
+    def extensions(self) -> Optional[dict[str, Any]]:
+        return self.decoded.get("extensions")
@@ -0,0 +1,337 @@
+import json
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    from graphql import (
+        DocumentNode,
+        FieldNode,
+        FragmentDefinitionNode,
+        FragmentSpreadNode,
+        InlineFragmentNode,
+        NamedTypeNode,
+        OperationDefinitionNode,
+        OperationType,
+        SelectionNode,
+        SelectionSetNode,
+        parse,
+        value_from_ast_untyped,
+    )
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "The entity store requires graphql-core, "
+        "install it using: pip install aiogqlc[store]"
+    ) from exc
+
+ROOT_QUERY = "ROOT_QUERY"
+
+Fragments = dict[str, FragmentDefinitionNode]
+
+
+class Reference:
+    __slots__ = ("key",)
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+
+
+class MissingFieldError(Exception):
+    pass
+
+
+@lru_cache(maxsize=128)
+def parse_document(query: str) -> DocumentNode:
+    return parse(query, no_location=True)
+
+
+def get_operation_definition(
+    document: DocumentNode, operation: Optional[str] = None
+) -> Optional[OperationDefinitionNode]:
+    for definition in document.definitions:
+        if not isinstance(definition, OperationDefinitionNode):
+            continue
+        if operation is None or (
+            definition.name is not None and definition.name.value == operation
+        ):
+            return definition
+    return None
+
+
+def get_fragments(document: DocumentNode) -> Fragments:
+    return {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+
+class EntityStore:
+    def __init__(
+        self,
+        max_entities: int = 10000,
+        possible_types: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> None:
+        if max_entities < 1:
+            raise ValueError(max_entities)
+
+        self.max_entities = max_entities
+        self._possible_types = {
+            supertype: frozenset(subtypes)
+            for supertype, subtypes in (possible_types or {}).items()
+        }
+        self._entities: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entities
+
+    def identify(self, obj: Mapping[str, Any]) -> Optional[str]:
+        typename = obj.get("__typename")
+        id = obj.get("id")
+        if typename is None or id is None:
+            return None
+        return f"{typename}:{id}"
+
+    def get_entity(self, key: str) -> Optional[dict[str, Any]]:
+        return self._entities.get(key)
+
+    def evict(self, key: str) -> bool:
+        return self._entities.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._entities.clear()
+
+    def read(
+        self,
+        query: str,
+        variables: Optional[Mapping[str, Any]] = None,
+        operation: Optional[str] = None,
+    ) -> Optional[dict[str, Any]]:
+        document = parse_document(query)
+        definition = get_operation_definition(document, operation)
+        if definition is None or definition.operation != OperationType.QUERY:
+            return None
+
+        root = self._entities.get(ROOT_QUERY)
+        if root is None:
+            return None
+        self._entities.move_to_end(ROOT_QUERY)
+
+        try:
+            return self.read_object(
+                definition.selection_set,
+                root,
+                dict(variables or {}),
+                get_fragments(document),
+            )
+        except MissingFieldError:
+            return None
+
+    def write(
+        self,
+        query: str,
+        data: Mapping[str, Any],
+        variables: Optional[Mapping[str, Any]] = None,
+        operation: Optional[str] = None,
+    ) -> None:
+        document = parse_document(query)
+        definition = get_operation_definition(document, operation)
+        if definition is None:
+            return
+
+        if definition.operation == OperationType.QUERY:
+            root = self._entities.get(ROOT_QUERY, {})
+        else:
+            root = {}
+
+        self.write_object(
+            definition.selection_set,
+            data,
+            root,
+            dict(variables or {}),
+            get_fragments(document),
+        )
+
+        if definition.operation == OperationType.QUERY:
+            self.store_entity(ROOT_QUERY, root)
+
+    def store_entity(self, key: str, entity: dict[str, Any]) -> None:
+        self._entities[key] = entity
+        self._entities.move_to_end(key)
+
+        while len(self._entities) > self.max_entities:
+            self._entities.popitem(last=False)
+
+    def read_object(
+        self,
+        selection_set: SelectionSetNode,
+        source: Mapping[str, Any],
+        variables: dict[str, Any],
+        fragments: Fragments,
+    ) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        typename = source.get("__typename")
+
+        for field in self.collect_fields(selection_set, typename, variables, fragments):
+            storage_key = self.get_storage_key(field, variables)
+            if storage_key not in source:
+                raise MissingFieldError(storage_key)
+
+            response_key = field.alias.value if field.alias else field.name.value
+            result[response_key] = self.read_value(
+                field.selection_set, source[storage_key], variables, fragments
+            )
+
+        return result
+
+    def read_value(
+        self,
+        selection_set: Optional[SelectionSetNode],
+        value: Any,
+        variables: dict[str, Any],
+        fragments: Fragments,
+    ) -> Any:
+        if isinstance(value, list):
+            return [
+                self.read_value(selection_set, item, variables, fragments)
+                for item in value
+            ]
+
+        if isinstance(value, Reference):
+            entity = self._entities.get(value.key)
+            if entity is None or selection_set is None:
+                raise MissingFieldError(value.key)
+            self._entities.move_to_end(value.key)
+            return self.read_object(selection_set, entity, variables, fragments)
+
+        if isinstance(value, dict) and selection_set is not None:
+            return self.read_object(selection_set, value, variables, fragments)
+
+        return value
+
+    def write_object(
+        self,
+        selection_set: SelectionSetNode,
+        data: Mapping[str, Any],
+        target: dict[str, Any],
+        variables: dict[str, Any],
+        fragments: Fragments,
+    ) -> None:
+        typename = data.get("__typename")
+
+        for field in self.collect_fields(selection_set, typename, variables, fragments):
+            response_key = field.alias.value if field.alias else field.name.value
+            if response_key not in data:
+                continue
+
+            storage_key = self.get_storage_key(field, variables)
+            target[storage_key] = self.write_value(
+                field.selection_set,
+                data[response_key],
+                target.get(storage_key),
+                variables,
+                fragments,
+            )
+
+    def write_value(
+        self,
+        selection_set: Optional[SelectionSetNode],
+        value: Any,
+        existing: Any,
+        variables: dict[str, Any],
+        fragments: Fragments,
+    ) -> Any:
+        if selection_set is None or value is None:
+            return value
+
+        if isinstance(value, list):
+            return [
+                self.write_value(selection_set, item, None, variables, fragments)
+                for item in value
+            ]
+
+        key = self.identify(value)
+
+        if key is None:
+            target = existing if isinstance(existing, dict) else {}
+            self.write_object(selection_set, value, target, variables, fragments)
+            return target
+
+        entity = self._entities.get(key, {})
+        self.write_object(selection_set, value, entity, variables, fragments)
+        self.store_entity(key, entity)
+        return Reference(key)
+
+    def collect_fields(
+        self,
+        selection_set: SelectionSetNode,
+        typename: Optional[str],
+        variables: dict[str, Any],
+        fragments: Fragments,
+    ) -> Iterator[FieldNode]:
+        for selection in selection_set.selections:
+            if not self.is_included(selection, variables):
+                continue
+
+            if isinstance(selection, FieldNode):
+                yield selection
+
+            elif isinstance(selection, InlineFragmentNode):
+                if self.matches_type(selection.type_condition, typename):
+                    yield from self.collect_fields(
+                        selection.selection_set, typename, variables, fragments
+                    )
+
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = fragments.get(selection.name.value)
+                if fragment is not None and self.matches_type(
+                    fragment.type_condition, typename
+                ):
+                    yield from self.collect_fields(
+                        fragment.selection_set, typename, variables, fragments
+                    )
+
+    def matches_type(
+        self, type_condition: Optional[NamedTypeNode], typename: Optional[str]
+    ) -> bool:
+        if type_condition is None or typename is None:
+            return True
+        condition = type_condition.name.value
+        return condition == typename or typename in self._possible_types.get(
+            condition, ()
+        )
+
+    @staticmethod
+    def is_included(selection: SelectionNode, variables: dict[str, Any]) -> bool:
+        for directive in selection.directives or ():
+            name = directive.name.value
+            if name not in ("skip", "include"):
+                continue
+
+            for argument in directive.arguments:
+                if argument.name.value == "if":
+                    condition = value_from_ast_untyped(argument.value, variables)
+                    if (name == "skip") == bool(condition):
+                        return False
+
+        return True
+
+    @staticmethod
+    def get_storage_key(field: FieldNode, variables: dict[str, Any]) -> str:
+        name = field.name.value
+        if not field.arguments:
+            return sys.intern(name)
+
+        arguments = {
+            argument.name.value: value_from_ast_untyped(argument.value, variables)
+            for argument in field.arguments
+        }
+        serialized_arguments = json.dumps(
+            arguments, sort_keys=True, separators=(",", ":"), default=repr
+        )
+        return sys.intern(f"{name}({serialized_arguments})")
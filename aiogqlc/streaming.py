@@ -0,0 +1,208 @@
+import json
+import re
+from collections.abc import Generator, Sequence
+from typing import Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+Parser = Generator[None, None, T]
+
+WHITESPACE = re.compile(rb"[ \t\n\r]*")
+STRUCTURE = re.compile(rb'["\[\]{}]')
+STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+SCALAR_END = re.compile(rb"[ \t\n\r,\]}]")
+
+QUOTE = ord('"')
+COMMA = ord(",")
+COLON = ord(":")
+OPEN_OBJECT = ord("{")
+CLOSE_OBJECT = ord("}")
+OPEN_ARRAY = ord("[")
+CLOSE_ARRAY = ord("]")
+
+
+def split_path(path: Union[str, Sequence[str]]) -> tuple[str, ...]:
+    if isinstance(path, str):
+        return tuple(path.split(".")) if path else ()
+    return tuple(path)
+
+
+class JSONItemsParser:
+    def __init__(self, path: Union[str, Sequence[str]]) -> None:
+        self.path = split_path(path)
+        self.errors: Optional[bytes] = None
+        self._buffer = bytearray()
+        self._pos = 0
+        self._mark: Optional[int] = None
+        self._eof = False
+        self._done = False
+        self._items: list[bytes] = []
+        self._parser = self.parse()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        if not self._done:
+            self._buffer += data
+            self.resume()
+        return self.pop_items()
+
+    def close(self) -> None:
+        self._eof = True
+        if not self._done:
+            self.resume()
+
+    def resume(self) -> None:
+        try:
+            next(self._parser)
+        except StopIteration:
+            self._done = True
+            self._buffer.clear()
+            self._pos = 0
+            return
+
+        consumed = self._pos if self._mark is None else self._mark
+        del self._buffer[:consumed]
+        self._pos -= consumed
+        if self._mark is not None:
+            self._mark = 0
+
+    def pop_items(self) -> list[bytes]:
+        items, self._items = self._items, []
+        return items
+
+    def parse(self) -> Parser[None]:
+        if not self.path:
+            yield from self.parse_items()
+            return
+
+        if (yield from self.peek()) != OPEN_OBJECT:
+            raise ValueError("Expected a JSON object")
+
+        yield from self.parse_object(0)
+
+    def parse_object(self, level: int) -> Parser[None]:
+        if not (yield from self.expect(OPEN_OBJECT)):
+            yield from self.skip_value()
+            return
+
+        while True:
+            key = yield from self.read_key()
+            if key is None:
+                return
+
+            if level == 0 and key == "errors":
+                self.errors = yield from self.capture_value()
+            elif key != self.path[level]:
+                yield from self.skip_value()
+            elif level + 1 < len(self.path):
+                yield from self.parse_object(level + 1)
+            else:
+                yield from self.parse_items()
+
+    def parse_items(self) -> Parser[None]:
+        if not (yield from self.expect(OPEN_ARRAY)):
+            yield from self.skip_value()
+            return
+
+        while True:
+            char = yield from self.peek()
+            if char == COMMA:
+                self._pos += 1
+                char = yield from self.peek()
+            if char == CLOSE_ARRAY:
+                self._pos += 1
+                return
+
+            item = yield from self.capture_value()
+            self._items.append(item)
+
+    def read_key(self) -> Parser[Optional[str]]:
+        char = yield from self.peek()
+        if char == COMMA:
+            self._pos += 1
+            char = yield from self.peek()
+        if char == CLOSE_OBJECT:
+            self._pos += 1
+            return None
+        if char != QUOTE:
+            raise ValueError(f"Expected an object key at position {self._pos}")
+
+        key = yield from self.read_string()
+        if not (yield from self.expect(COLON)):
+            raise ValueError(f"Expected ':' at position {self._pos}")
+        return json.loads(key)
+
+    def capture_value(self) -> Parser[bytes]:
+        yield from self.peek()
+        self._mark = self._pos
+        yield from self.skip_value()
+        value = bytes(self._buffer[self._mark : self._pos])
+        self._mark = None
+        return value
+
+    def skip_value(self) -> Parser[None]:
+        char = yield from self.peek()
+
+        if char == QUOTE:
+            yield from self.read_string()
+            return
+
+        if char != OPEN_OBJECT and char != OPEN_ARRAY:
+            while True:
+                match = SCALAR_END.search(self._buffer, self._pos)
+                if match is not None:
+                    self._pos = match.start()
+                    return
+                if self._eof:
+                    self._pos = len(self._buffer)
+                    return
+                yield
+
+        depth = 0
+        while True:
+            match = STRUCTURE.search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+                yield from self.fill()
+                continue
+
+            self._pos = match.start()
+            char = self._buffer[self._pos]
+            if char == QUOTE:
+                yield from self.read_string()
+                continue
+
+            self._pos += 1
+            if char == OPEN_OBJECT or char == OPEN_ARRAY:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def read_string(self) -> Parser[bytes]:
+        while True:
+            match = STRING_TAIL.match(self._buffer, self._pos + 1)
+            if match is not None:
+                start, self._pos = self._pos, match.end()
+                return bytes(self._buffer[start : self._pos])
+            yield from self.fill()
+
+    def expect(self, char: int) -> Parser[bool]:
+        if (yield from self.peek()) != char:
+            return False
+        self._pos += 1
+        return True
+
+    def peek(self) -> Parser[int]:
+        while True:
+            match = WHITESPACE.match(self._buffer, self._pos)
+            assert match is not None
+            self._pos = match.end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            yield from self.fill()
+
+    def fill(self) -> Parser[None]:
+        if self._eof:
+            raise ValueError("Unexpected end of JSON input")
+        yield
@@ -1,15 +1,25 @@
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence
 from io import IOBase
-from typing import Any, Literal, TypedDict, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, Optional, TypedDict, Union
 
+import aiohttp.payload
 from typing_extensions import NotRequired, Required, TypeAlias
 
+from aiogqlc.uploads import Buffer, StreamingUpload
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aiogqlc.frames import RawPayload
+
 VariableValue: TypeAlias = Union[
     str,
     int,
     None,
     float,
     IOBase,
+    StreamingUpload,
+    Buffer,
+    Path,
     Sequence["VariableValue"],
     Mapping[str, "VariableValue"],
 ]
@@ -27,13 +37,24 @@ ConnectionInitParamValue: TypeAlias = Union[
 
 ConnectionInitParams: TypeAlias = Mapping[str, ConnectionInitParamValue]
 
-FilesToPathsMapping: TypeAlias = dict[IOBase, list[str]]
+FilesToPathsMapping: TypeAlias = dict[
+    Union[IOBase, StreamingUpload, aiohttp.payload.Payload], list[str]
+]
+
+JSONEncoder: TypeAlias = Callable[[Any], Union[str, bytes]]
 
+JSONDecoder: TypeAlias = Callable[[Union[str, bytes]], Any]
 
-class Payload(TypedDict):
-    query: Required[str]
-    variables: NotRequired[Variables]
-    operationName: NotRequired[str]
+DisconnectHook: TypeAlias = Callable[[Optional[int]], Any]
+
+ReconnectHook: TypeAlias = Callable[[int, list[str]], Any]
+
+
+class Payload(TypedDict, total=False):
+    query: str
+    variables: Variables
+    operationName: str
+    extensions: dict[str, Any]
 
 
 # graphql-ws protocol types:
@@ -130,3 +151,123 @@ GraphQLWSServerOperationMessage: TypeAlias = Union[
     GraphQLWSServerConnectionOperationMessage,
     GraphQLWSServerExecutionOperationMessage,
 ]
+
+
+# GraphQL over HTTP types:
+
+
+class ExecutionResult(TypedDict, total=False):
+    data: Any
+    errors: list[GraphQLWSError]
+    extensions: dict[str, Any]
+
+
+# graphql-transport-ws types:
+
+
+class GraphQLTransportWSConnectionInitMessage(TypedDict):
+    type: Literal["connection_init"]
+    payload: NotRequired[ConnectionInitParams]
+
+
+class GraphQLTransportWSConnectionAckMessage(TypedDict):
+    type: Literal["connection_ack"]
+    payload: NotRequired[dict[str, Any]]
+
+
+class GraphQLTransportWSPingMessage(TypedDict):
+    type: Literal["ping"]
+    payload: NotRequired[dict[str, Any]]
+
+
+class GraphQLTransportWSPongMessage(TypedDict):
+    type: Literal["pong"]
+    payload: NotRequired[dict[str, Any]]
+
+
+class GraphQLTransportWSSubscribeMessage(TypedDict):
+    type: Literal["subscribe"]
+    id: str
+    payload: Payload
+
+
+class GraphQLTransportWSNextMessage(TypedDict):
+    type: Literal["next"]
+    id: str
+    payload: GraphQLWSDataMessagePayload
+
+
+class GraphQLTransportWSErrorMessage(TypedDict):
+    type: Literal["error"]
+    id: str
+    payload: list[GraphQLWSError]
+
+
+class GraphQLTransportWSCompleteMessage(TypedDict):
+    type: Literal["complete"]
+    id: str
+
+
+GraphQLTransportWSClientMessage: TypeAlias = Union[
+    GraphQLTransportWSConnectionInitMessage,
+    GraphQLTransportWSPingMessage,
+    GraphQLTransportWSPongMessage,
+    GraphQLTransportWSSubscribeMessage,
+    GraphQLTransportWSCompleteMessage,
+]
+
+GraphQLTransportWSServerExecutionMessage: TypeAlias = Union[
+    GraphQLTransportWSNextMessage,
+    GraphQLTransportWSErrorMessage,
+    GraphQLTransportWSCompleteMessage,
+]
+
+GraphQLTransportWSServerMessage: TypeAlias = Union[
+    GraphQLTransportWSConnectionAckMessage,
+    GraphQLTransportWSPingMessage,
+    GraphQLTransportWSPongMessage,
+    GraphQLTransportWSServerExecutionMessage,
+]
+
+
+class RawDataMessage(TypedDict):
+    type: Literal["raw"]
+    id: str
+    payload: "RawPayload"
+
+
+OperationMessage: TypeAlias = Union[
+    GraphQLWSServerExecutionOperationMessage,
+    GraphQLTransportWSServerExecutionMessage,
+    RawDataMessage,
+]
+
+
+class QueueStats(TypedDict):
+    depth: int
+    max_depth: int
+    dropped: int
+
+
+class HistogramSnapshot(TypedDict):
+    buckets: dict[float, int]
+    sum: float
+    count: int
+
+
+class SubscriptionSnapshot(TypedDict):
+    operation: Optional[str]
+    messages: int
+    messages_per_second: float
+
+
+class MetricsSnapshot(TypedDict):
+    requests: dict[str, int]
+    errors: dict[str, int]
+    bytes_sent: dict[str, int]
+    bytes_received: dict[str, int]
+    upload_bytes: int
+    active_subscriptions: int
+    subscriptions: list[SubscriptionSnapshot]
+    request_duration: HistogramSnapshot
+    subscription_message_rate: HistogramSnapshot
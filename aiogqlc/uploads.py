@@ -0,0 +1,147 @@
+import asyncio
+import inspect
+import mmap
+import os
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+)
+from io import IOBase
+from pathlib import Path
+from typing import Any, Optional, Protocol, Union, cast
+
+import aiohttp
+import aiohttp.abc
+import aiohttp.payload
+from typing_extensions import TypeAlias
+
+
+class AsyncReadable(Protocol):
+    def read(self, size: int = ...) -> Awaitable[bytes]: ...
+
+
+UploadSource: TypeAlias = Union[IOBase, AsyncReadable, AsyncIterable[bytes]]
+
+UploadProgress: TypeAlias = Callable[[int, Optional[int]], Any]
+
+Buffer: TypeAlias = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+CHUNK_SIZE = 2**20
+
+
+class StreamingUpload:
+    def __init__(
+        self,
+        source: UploadSource,
+        filename: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+        size: Optional[int] = None,
+        chunk_size: int = 2**16,
+        progress: Optional[UploadProgress] = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(chunk_size)
+
+        self.source = source
+        self.filename = filename or os.path.basename(getattr(source, "name", "") or "")
+        self.content_type = content_type
+        self.size = get_size(source) if size is None else size
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    async def __aiter__(self) -> AsyncGenerator[bytes, None]:
+        sent = 0
+        async for chunk in read_ahead(self.read_chunks()):
+            yield chunk
+            sent += len(chunk)
+            if self.progress is not None:
+                self.progress(sent, self.size)
+
+    async def read_chunks(self) -> AsyncGenerator[bytes, None]:
+        source = self.source
+
+        if isinstance(source, IOBase):
+            # Reading from disk must not block the event loop
+            loop = asyncio.get_running_loop()
+            while chunk := await loop.run_in_executor(
+                None, source.read, self.chunk_size
+            ):
+                yield chunk
+
+        elif inspect.iscoroutinefunction(getattr(source, "read", None)):
+            readable = cast(AsyncReadable, source)
+            while chunk := await readable.read(self.chunk_size):
+                yield chunk
+
+        else:
+            async for chunk in cast(AsyncIterable[bytes], source):
+                yield chunk
+
+
+def get_size(source: UploadSource) -> Optional[int]:
+    if not isinstance(source, IOBase) or not source.seekable():
+        return None
+
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END) - position
+    source.seek(position)
+    return size
+
+
+async def read_ahead(chunks: AsyncIterator[bytes]) -> AsyncGenerator[bytes, None]:
+    # Read the next chunk while the current one is being sent
+    next_chunk = asyncio.ensure_future(chunks.__anext__())
+    try:
+        while True:
+            try:
+                chunk = await next_chunk
+            except StopAsyncIteration:
+                return
+            next_chunk = asyncio.ensure_future(chunks.__anext__())
+            yield chunk
+    finally:
+        next_chunk.cancel()
+
+
+class BufferPayload(aiohttp.payload.Payload):
+    def __init__(self, value: Buffer, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("content_type", "application/octet-stream")
+        super().__init__(value, *args, **kwargs)
+        with memoryview(value) as view:
+            self._size = view.nbytes
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return str(self._value, encoding, errors)
+
+    async def write(self, writer: aiohttp.abc.AbstractStreamWriter) -> None:
+        # Slices share the memory of the buffer, so nothing is copied here. The view
+        # is released afterwards, so memory maps can be closed once they are sent.
+        with memoryview(self._value) as view, view.cast("B") as data:
+            for offset in range(0, data.nbytes, CHUNK_SIZE):
+                await writer.write(data[offset : offset + CHUNK_SIZE])
+
+
+class PathPayload(aiohttp.payload.Payload):
+    def __init__(self, value: Path, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("content_type", "application/octet-stream")
+        kwargs.setdefault("filename", value.name)
+        super().__init__(value, *args, **kwargs)
+        self._size = value.stat().st_size
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return self._value.read_text(encoding, errors)
+
+    async def write(self, writer: aiohttp.abc.AbstractStreamWriter) -> None:
+        # The file is only opened while it is being sent
+        loop = asyncio.get_running_loop()
+        file = await loop.run_in_executor(None, self._value.open, "rb")
+        try:
+            while chunk := await loop.run_in_executor(None, file.read, CHUNK_SIZE):
+                await writer.write(chunk)
+        finally:
+            await loop.run_in_executor(None, file.close)
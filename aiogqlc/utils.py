@@ -1,6 +1,19 @@
-from typing import Optional
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Optional
 
-from aiogqlc.types import Payload, Variables
+from aiogqlc.constants import PERSISTED_QUERY_NOT_FOUND, PERSISTED_QUERY_NOT_SUPPORTED
+from aiogqlc.types import JSONDecoder, JSONEncoder, Payload, Variables
+
+OPERATION_KEYWORDS = ("query", "mutation", "subscription", "fragment")
+
+PERSISTED_QUERY_ERRORS = {
+    PERSISTED_QUERY_NOT_FOUND: PERSISTED_QUERY_NOT_FOUND,
+    "PERSISTED_QUERY_NOT_FOUND": PERSISTED_QUERY_NOT_FOUND,
+    PERSISTED_QUERY_NOT_SUPPORTED: PERSISTED_QUERY_NOT_SUPPORTED,
+    "PERSISTED_QUERY_NOT_SUPPORTED": PERSISTED_QUERY_NOT_SUPPORTED,
+}
 
 
 def serialize_payload(
@@ -14,3 +27,114 @@ def serialize_payload(
     if operation:
         data["operationName"] = operation
     return data
+
+
+def encode_json(obj: Any, dumps: JSONEncoder = json.dumps) -> str:
+    encoded = dumps(obj)
+    return encoded.decode() if isinstance(encoded, bytes) else encoded
+
+
+def serialize_query_params(
+    payload: Payload, dumps: JSONEncoder = json.dumps
+) -> dict[str, str]:
+    params: dict[str, str] = {}
+    for key, value in payload.items():
+        params[key] = value if isinstance(value, str) else encode_json(value, dumps)
+    return params
+
+
+@lru_cache(maxsize=512)
+def hash_query(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def get_persisted_query_error(
+    body: bytes, loads: JSONDecoder = json.loads
+) -> Optional[str]:
+    # Most responses are successful, they are only scanned but never decoded
+    if b"PersistedQueryNot" not in body and b"PERSISTED_QUERY_NOT" not in body:
+        return None
+
+    try:
+        result = loads(body)
+    except Exception:
+        return None
+
+    if not isinstance(result, dict):
+        return None
+
+    for error in result.get("errors") or ():
+        if not isinstance(error, dict):
+            continue
+        extensions = error.get("extensions") or {}
+        for value in (error.get("message"), extensions.get("code")):
+            if value in PERSISTED_QUERY_ERRORS:
+                return PERSISTED_QUERY_ERRORS[value]
+
+    return None
+
+
+def hash_payload(payload: Payload, **kwargs: Any) -> str:
+    canonical = json.dumps(
+        [payload, kwargs], sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def get_operation_type(query: str, operation: Optional[str] = None) -> Optional[str]:
+    definitions: list[tuple[str, Optional[str]]] = []
+    heading = False
+    expecting_name = False
+    depth = 0
+    index = 0
+    length = len(query)
+
+    while index < length:
+        char = query[index]
+
+        if char == "#":
+            newline = query.find("\n", index)
+            index = length if newline == -1 else newline
+        elif query.startswith('"""', index):
+            end = query.find('"""', index + 3)
+            index = length if end == -1 else end + 3
+        elif char == '"':
+            index += 1
+            while index < length and query[index] not in '"\n':
+                index += 2 if query[index] == "\\" else 1
+            index += 1
+        elif char == "_" or char.isalpha():
+            end = index + 1
+            while end < length and (query[end] == "_" or query[end].isalnum()):
+                end += 1
+            if depth == 0:
+                word = query[index:end]
+                if not heading and word in OPERATION_KEYWORDS:
+                    definitions.append((word, None))
+                    heading = True
+                    expecting_name = True
+                elif expecting_name:
+                    definitions[-1] = (definitions[-1][0], word)
+                    expecting_name = False
+            index = end
+        else:
+            if char in "{(":
+                if depth == 0 and char == "{":
+                    if not heading:
+                        definitions.append(("query", None))
+                    heading = False
+                depth += 1
+            elif char in "})":
+                depth -= 1
+            elif depth == 0 and not char.isspace() and char != ",":
+                expecting_name = False
+            index += 1
+
+    for operation_type, name in definitions:
+        if operation_type == "fragment":
+            continue
+        if operation is None or name == operation:
+            return operation_type
+
+    return None
@@ -0,0 +1,80 @@
+import argparse
+import sys
+from typing import Optional
+
+from benchmarks import execute, prepare, routing, subscriptions, uploads
+from benchmarks.runner import (
+    Benchmark,
+    Results,
+    find_regressions,
+    format_comparison,
+    format_stats,
+    load,
+    run_repeatedly,
+    save,
+)
+
+BENCHMARKS: dict[str, Benchmark] = {
+    **prepare.BENCHMARKS,
+    **execute.BENCHMARKS,
+    **uploads.BENCHMARKS,
+    **subscriptions.BENCHMARKS,
+    **routing.BENCHMARKS,
+}
+
+
+def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "names", nargs="*", metavar="name", help="benchmarks to run, all by default"
+    )
+    parser.add_argument("--save", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare to saved results")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per benchmark, the best is kept"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="relative change tolerated before reporting a regression",
+    )
+    return parser.parse_args(args)
+
+
+def main() -> int:
+    args = parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    baseline: Results = load(args.compare) if args.compare else {}
+    results: Results = {}
+    regressed = []
+
+    print(f"Routing core: {'compiled' if routing.is_compiled() else 'pure Python'}")
+    for name, benchmark in BENCHMARKS.items():
+        if args.names and name not in args.names:
+            continue
+
+        stats = results[name] = run_repeatedly(benchmark, args.repeat)
+        print(format_stats(name, stats))
+
+        if name in baseline:
+            print(format_comparison(stats, baseline[name]))
+            regressions = find_regressions(stats, baseline[name], args.tolerance)
+            if regressions:
+                print(f"  regressed: {', '.join(regressions)}")
+                regressed.append(name)
+
+    if args.save:
+        save(args.save, results)
+    if regressed:
+        print(f"Regressions in: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
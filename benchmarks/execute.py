@@ -0,0 +1,21 @@
+from benchmarks.runner import Benchmark, timed
+from benchmarks.server import serve
+
+QUERY = "query($index: Int!) { echo(index: $index) }"
+WARMUP = 100
+REQUESTS = 2_000
+
+
+async def execute(samples: list[float]) -> None:
+    async with serve() as client:
+        for index in range(WARMUP):
+            response = await client.execute(QUERY, variables={"index": index})
+            await response.json()
+
+        for index in range(REQUESTS):
+            with timed(samples):
+                response = await client.execute(QUERY, variables={"index": index})
+                await response.json()
+
+
+BENCHMARKS: dict[str, Benchmark] = {"execute": execute}
@@ -0,0 +1,38 @@
+from io import BytesIO
+
+from aiogqlc import GraphQLClient
+from aiogqlc.types import Variables
+from benchmarks.runner import Benchmark, timed
+
+SIZE = 100_000
+NUMBER = 10
+
+
+def build_variables(with_file: bool) -> Variables:
+    items: list = [{"id": index, "name": f"item {index}"} for index in range(SIZE)]
+    if with_file:
+        items[SIZE // 2]["file"] = BytesIO(b"Hello, World!")
+    return {"input": {"items": items}}
+
+
+async def prepare(samples: list[float]) -> None:
+    variables = build_variables(with_file=False)
+    for _ in range(NUMBER):
+        with timed(samples):
+            GraphQLClient.prepare(variables)
+
+
+async def prepare_multipart(samples: list[float]) -> None:
+    variables = build_variables(with_file=True)
+    for _ in range(NUMBER):
+        with timed(samples):
+            nulled_variables, files_to_paths_mapping = GraphQLClient.prepare(variables)
+            GraphQLClient.prepare_multipart(
+                "mutation", nulled_variables, files_to_paths_mapping
+            )
+
+
+BENCHMARKS: dict[str, Benchmark] = {
+    "prepare": prepare,
+    "prepare multipart": prepare_multipart,
+}
@@ -0,0 +1,57 @@
+import asyncio
+import json
+from typing import Any, cast
+
+from aiogqlc import frames, queues
+from aiogqlc.client import GraphQLTransportWSManager, GraphQLWSManager
+from benchmarks.runner import Benchmark, Intervals
+
+FRAMES = 200_000
+BATCH = 100
+
+
+def is_compiled() -> bool:
+    return frames.__file__.endswith(".so") and queues.__file__.endswith(".so")
+
+
+def build_frames(manager: GraphQLWSManager, operation_id: str) -> list[str]:
+    message_type = manager.data_message_type
+    return [
+        json.dumps(
+            {
+                "type": message_type,
+                "id": operation_id,
+                "payload": {"data": {"count": index}},
+            }
+        )
+        for index in range(FRAMES)
+    ]
+
+
+async def route(samples: list[float]) -> None:
+    # Frames are routed without a connection, so only the client side is measured
+    manager = GraphQLTransportWSManager("/graphql", session=cast(Any, None))
+    operation_id = manager.get_next_operation_id()
+    queue = manager.create_queue(operation_id)
+    manager._operations[operation_id] = ("subscription", None, None)
+    frames = build_frames(manager, operation_id)
+
+    async def consume() -> None:
+        intervals = Intervals(samples)
+        async for _ in manager.handle_operation(queue):
+            intervals.tick()
+
+    async def produce() -> None:
+        # Like the reader task, yield to the consumer every now and then
+        for start in range(0, FRAMES, BATCH):
+            for frame in frames[start : start + BATCH]:
+                await manager.route_data_message(frame)
+            await asyncio.sleep(0)
+        await manager.yield_operation_message({"type": "complete", "id": operation_id})
+
+    consumer = asyncio.ensure_future(consume())
+    await produce()
+    await consumer
+
+
+BENCHMARKS: dict[str, Benchmark] = {"route frames": route}
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from typing import TypedDict
+
+from typing_extensions import TypeAlias
+
+
+class BenchmarkStats(TypedDict):
+    count: int
+    ops_per_second: float
+    p50_ms: float
+    p99_ms: float
+
+
+Benchmark: TypeAlias = Callable[[list[float]], Awaitable[None]]
+
+Results: TypeAlias = dict[str, BenchmarkStats]
+
+
+@contextmanager
+def timed(samples: list[float]) -> Iterator[None]:
+    started = time.perf_counter()
+    yield
+    samples.append(time.perf_counter() - started)
+
+
+class Intervals:
+    # Records the time between consecutive messages of a stream
+    def __init__(self, samples: list[float]) -> None:
+        self.samples = samples
+        self.last = time.perf_counter()
+
+    def tick(self) -> None:
+        now = time.perf_counter()
+        self.samples.append(now - self.last)
+        self.last = now
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples: list[float]) -> BenchmarkStats:
+    # Operations run one after another, so their durations add up to the run time
+    return {
+        "count": len(samples),
+        "ops_per_second": len(samples) / sum(samples),
+        "p50_ms": percentile(samples, 0.5) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+    }
+
+
+async def run(benchmark: Benchmark) -> BenchmarkStats:
+    samples: list[float] = []
+    await benchmark(samples)
+    return summarize(samples)
+
+
+def run_repeatedly(benchmark: Benchmark, repeat: int) -> BenchmarkStats:
+    # Like timeit, keep the fastest run, the others were slowed down by noise
+    runs = [asyncio.run(run(benchmark)) for _ in range(repeat)]
+    return max(runs, key=lambda stats: stats["ops_per_second"])
+
+
+def load(path: str) -> Results:
+    with open(path) as file:
+        return json.load(file)
+
+
+def save(path: str, results: Results) -> None:
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def find_regressions(
+    stats: BenchmarkStats, baseline: BenchmarkStats, tolerance: float
+) -> list[str]:
+    # The median mostly mirrors the throughput and is too close to the timer
+    # resolution for streams, so only throughput and tail latency are checked
+    regressions = []
+    if stats["ops_per_second"] < baseline["ops_per_second"] * (1 - tolerance):
+        regressions.append("ops/s")
+    if stats["p99_ms"] > baseline["p99_ms"] * (1 + tolerance):
+        regressions.append("p99")
+    return regressions
+
+
+def format_change(value: float, baseline: float) -> str:
+    return f"{(value / baseline - 1) * 100:+.1f}%"
+
+
+def format_stats(name: str, stats: BenchmarkStats) -> str:
+    return (
+        f"{name:<28} {stats['ops_per_second']:>12,.0f} ops/s"
+        f" {stats['p50_ms']:>10.3f} ms p50 {stats['p99_ms']:>10.3f} ms p99"
+    )
+
+
+def format_comparison(stats: BenchmarkStats, baseline: BenchmarkStats) -> str:
+    return (
+        f"  {format_change(stats['ops_per_second'], baseline['ops_per_second'])} ops/s"
+        f" {format_change(stats['p50_ms'], baseline['p50_ms'])} p50"
+        f" {format_change(stats['p99_ms'], baseline['p99_ms'])} p99"
+    )
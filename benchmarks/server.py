@@ -0,0 +1,56 @@
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS
+
+NEXT_MESSAGE = '{"id":"%s","type":"next","payload":{"data":{"count":%d}}}'
+
+
+async def execute(request: web.Request) -> web.Response:
+    if request.content_type != "multipart/form-data":
+        body = await request.json()
+        return web.json_response({"data": {"echo": body.get("variables")}})
+
+    sizes = []
+    reader = await request.multipart()
+    while (part := await reader.next()) is not None:
+        assert isinstance(part, aiohttp.BodyPartReader)
+        sizes.append(len(await part.read()))
+    return web.json_response({"data": {"sizes": sizes}})
+
+
+async def subscribe(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_TRANSPORT_WS])
+    await ws.prepare(request)
+
+    async for ws_message in ws:
+        message = json.loads(ws_message.data)
+        if message["type"] == "connection_init":
+            await ws.send_json({"type": "connection_ack"})
+        elif message["type"] == "subscribe":
+            # Messages are formatted instead of encoded to keep the server cheap
+            operation_id = message["id"]
+            for index in range(message["payload"]["variables"]["count"]):
+                await ws.send_str(NEXT_MESSAGE % (operation_id, index))
+            await ws.send_json({"id": operation_id, "type": "complete"})
+
+    return ws
+
+
+def create_app() -> web.Application:
+    app = web.Application(client_max_size=2**30)
+    app.router.add_post("/graphql", execute)
+    app.router.add_get("/graphql", subscribe)
+    return app
+
+
+@asynccontextmanager
+async def serve() -> AsyncIterator[GraphQLClient]:
+    async with TestClient(TestServer(create_app())) as session:
+        yield GraphQLClient(endpoint="/graphql", session=session)
@@ -0,0 +1,17 @@
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS
+from benchmarks.runner import Benchmark, Intervals
+from benchmarks.server import serve
+
+QUERY = "subscription($count: Int!) { count(to: $count) }"
+MESSAGES = 100_000
+
+
+async def subscribe(samples: list[float]) -> None:
+    async with serve() as client:
+        async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+            intervals = Intervals(samples)
+            async for _ in connection.subscribe(QUERY, {"count": MESSAGES}):
+                intervals.tick()
+
+
+BENCHMARKS: dict[str, Benchmark] = {"subscribe": subscribe}
@@ -0,0 +1,36 @@
+from io import BytesIO
+
+from aiogqlc.types import VariableValue
+from benchmarks.runner import Benchmark, timed
+from benchmarks.server import serve
+
+QUERY = "mutation($files: [Upload!]!) { sizes(files: $files) }"
+FILES = 8
+FILE_SIZE = 2**18
+REQUESTS = 100
+CONTENT = bytes(FILE_SIZE)
+
+
+async def upload(samples: list[float], buffers: bool) -> None:
+    async with serve() as client:
+        for _ in range(REQUESTS):
+            files: list[VariableValue] = [
+                CONTENT if buffers else BytesIO(CONTENT) for _ in range(FILES)
+            ]
+            with timed(samples):
+                response = await client.execute(QUERY, variables={"files": files})
+                await response.json()
+
+
+async def upload_files(samples: list[float]) -> None:
+    await upload(samples, buffers=False)
+
+
+async def upload_buffers(samples: list[float]) -> None:
+    await upload(samples, buffers=True)
+
+
+BENCHMARKS: dict[str, Benchmark] = {
+    "upload files": upload_files,
+    "upload buffers": upload_buffers,
+}
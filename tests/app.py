@@ -7,6 +7,7 @@ import strawberry
 from aiohttp import web
 from strawberry.aiohttp.views import GraphQLView
 from strawberry.file_uploads import Upload
+from strawberry.schema.config import StrawberryConfig
 from strawberry.types import Info
 
 
@@ -169,6 +170,13 @@ schema = strawberry.Schema(
     scalar_overrides={BytesIO: Upload},
 )
 
+batching_schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    scalar_overrides={BytesIO: Upload},
+    config=StrawberryConfig(batching_config={"max_operations": 10}),
+)
+
 
 def create_app(**kwargs: Any):
     view = GraphQLView(schema=schema, multipart_uploads_enabled=True, **kwargs)
@@ -1,9 +1,14 @@
 import asyncio
 
+import aiohttp
+import aiohttp.web
+import pytest
 import pytest_asyncio
 from pytest_aiohttp import AiohttpClient
 
+from aiogqlc import GraphQLClient
 from tests.app import create_app
+from tests.helpers import CountingGraphQLView, RecordingEncoder
 
 
 @pytest_asyncio.fixture
@@ -12,3 +17,29 @@ async def graphql_session(aiohttp_client: AiohttpClient):
     loop = asyncio.get_event_loop()
     loop.set_debug(True)
     return await aiohttp_client(app)
+
+
+@pytest.fixture
+def counting_delay() -> float:
+    return 0
+
+
+@pytest.fixture
+async def counting_app(counting_delay: float):
+    app = aiohttp.web.Application()
+    app["requests"] = []
+    app["delay"] = counting_delay
+    app.router.add_route("*", "/graphql", CountingGraphQLView)
+    return app
+
+
+@pytest.fixture
+def encoder() -> RecordingEncoder:
+    return RecordingEncoder()
+
+
+@pytest.fixture
+def recording_client(graphql_session: aiohttp.ClientSession, encoder: RecordingEncoder):
+    return GraphQLClient(
+        endpoint="/graphql", session=graphql_session, json_dumps=encoder
+    )
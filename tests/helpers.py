@@ -0,0 +1,160 @@
+import asyncio
+import json
+from typing import Any, Union
+
+import aiohttp
+import aiohttp.web
+from aiohttp import web
+
+from aiogqlc.constants import GRAPHQL_WS
+
+COUNT_SUBSCRIPTION = "subscription { count(to: 3, interval: 0.05) }"
+INFINITE_SUBSCRIPTION = "subscription { infinity(interval: 0.01) }"
+
+INCREMENTAL_PAYLOADS = [
+    {
+        "data": {"todo": {"title": "Buy groceries"}, "todos": [{"title": "A"}]},
+        "pending": [
+            {"id": "0", "path": ["todo"]},
+            {"id": "1", "path": ["todos"]},
+        ],
+        "hasNext": True,
+    },
+    {
+        "incremental": [{"id": "0", "data": {"creator": {"name": "Bill"}}}],
+        "completed": [{"id": "0"}],
+        "hasNext": True,
+    },
+    {
+        "incremental": [{"id": "1", "items": [{"title": "B"}, {"title": "C"}]}],
+        "hasNext": True,
+    },
+    {
+        "completed": [{"id": "1", "errors": [{"message": "Stream failed"}]}],
+        "extensions": {"cost": 3},
+        "hasNext": False,
+    },
+]
+
+
+class CountingGraphQLView(aiohttp.web.View):
+    async def post(self):
+        self.request.app["requests"].append(await self.request.json())
+        await asyncio.sleep(self.request.app["delay"])
+        if self.request.headers.get("X-Plain"):
+            return aiohttp.web.Response(text="pong")
+        if self.request.headers.get("X-Errors"):
+            errors = [{"message": "Resolver failed"}]
+            return aiohttp.web.json_response({"data": None, "errors": errors})
+        status = 500 if self.request.headers.get("X-Fail") else 200
+        return aiohttp.web.json_response({"data": {"ping": "pong"}}, status=status)
+
+
+class CountingDecoder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, body: Union[str, bytes]) -> Any:
+        self.calls += 1
+        return json.loads(body)
+
+
+class RecordingEncoder:
+    def __init__(self) -> None:
+        self.messages: list[Any] = []
+
+    def __call__(self, obj: Any) -> str:
+        self.messages.append(obj)
+        return json.dumps(obj)
+
+    def types(self, *types: str) -> list[Any]:
+        return [
+            (message["type"], message.get("id"))
+            for message in self.messages
+            if message.get("type") in types
+        ]
+
+
+async def collect(subscription) -> list[Any]:
+    return [payload async for payload in subscription]
+
+
+async def fake_server(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_WS])
+    await ws.prepare(request)
+    await ws.receive_json()
+    await ws.send_json({"type": "connection_ack"})
+
+    async for ws_message in ws:
+        message = json.loads(ws_message.data)
+        if message["type"] == "connection_terminate":
+            break
+        if message["type"] != "start":
+            continue
+
+        # Messages of unknown operations are dropped without being decoded
+        await ws.send_str('{"type":"data","id":"99","payload":{"data": invalid}}')
+        await ws.send_json(
+            {"payload": {"data": 1}, "type": "data", "id": message["id"]}
+        )
+        await ws.send_str(
+            json.dumps(
+                {"type": "data", "id": message["id"], "payload": {"data": 2}},
+                separators=(",", ":"),
+            )
+        )
+        await ws.send_json({"type": "complete", "id": message["id"]})
+
+    return ws
+
+
+class ExportGraphQLView(aiohttp.web.View):
+    async def post(self):
+        response = aiohttp.web.StreamResponse(
+            headers={"Content-Type": "application/json"}
+        )
+        await response.prepare(self.request)
+
+        await response.write(b'{"data": {"export": [')
+        for index in range(1000):
+            separator = b"," if index else b""
+            item = json.dumps({"id": index, "payload": "x" * 100}).encode()
+            await response.write(separator + item)
+
+        errors = self.request.app["config"]["errors"]
+        await response.write(b']}, "errors": ' + json.dumps(errors).encode() + b"}")
+        await response.write_eof()
+        return response
+
+
+class IncrementalGraphQLView(aiohttp.web.View):
+    async def post(self):
+        app = self.request.app
+        app["accept"].append(self.request.headers["Accept"])
+        payloads = app["config"]["payloads"]
+
+        if len(payloads) == 1:
+            return aiohttp.web.json_response(payloads[0])
+
+        response = aiohttp.web.StreamResponse(
+            headers={"Content-Type": 'multipart/mixed; boundary="-"'}
+        )
+        await response.prepare(self.request)
+
+        # Like graphql-js, each part is immediately followed by a delimiter
+        await response.write(b"\r\n---")
+        for index, payload in enumerate(payloads):
+            if index:
+                await app["config"]["release"].wait()
+                # Some servers send empty heartbeat parts
+                await response.write(b"\r\n\r\n{}\r\n---")
+            part = (
+                b"\r\nContent-Type: application/json; charset=utf-8\r\n\r\n"
+                + json.dumps(payload).encode()
+                + b"\r\n---"
+            )
+            await response.write(part)
+
+        await response.write(b"--\r\n")
+        await response.write_eof()
+        return response
@@ -0,0 +1,80 @@
+import aiohttp
+import pytest
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS
+from aiogqlc.errors import GraphQLWSOperationError
+
+
+def counts(batch: list) -> list[int]:
+    return [payload["data"]["count"] for payload in batch]
+
+
+@pytest.mark.parametrize("protocol", ["graphql-ws", GRAPHQL_TRANSPORT_WS])
+async def test_payloads_are_delivered_in_batches(
+    graphql_session: aiohttp.ClientSession, protocol: str
+):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(protocol) as connection:
+        batches = [
+            counts(batch)
+            async for batch in connection.subscribe_batched(
+                "subscription { count(to: 250) }", max_items=100, max_latency=0.05
+            )
+        ]
+
+    assert [value for batch in batches for value in batch] == list(range(1, 251))
+    assert max(len(batch) for batch in batches) <= 100
+    assert len(batches) < 250
+
+
+async def test_batches_are_flushed_after_max_latency(
+    graphql_session: aiohttp.ClientSession,
+):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect() as connection:
+        batches = [
+            counts(batch)
+            async for batch in connection.subscribe_batched(
+                "subscription { count(to: 3, interval: 0.1) }",
+                max_items=10,
+                max_latency=0.01,
+            )
+        ]
+
+    assert batches == [[1], [2], [3]]
+
+
+async def test_operation_errors(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect() as connection:
+        with pytest.raises(GraphQLWSOperationError):
+            async for _ in connection.subscribe_batched("subscription { unknown }"):
+                pass
+
+
+async def test_leaving_early_stops_the_operation(
+    graphql_session: aiohttp.ClientSession,
+):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect() as connection:
+        subscription = connection.subscribe_batched(
+            "subscription { infinity(interval: 0.01) }", max_items=2
+        )
+        batch = await subscription.__anext__()
+        await subscription.aclose()
+
+        assert batch[0]["data"]["infinity"] == "For ever"
+
+        batches = [
+            counts(batch)
+            async for batch in connection.subscribe_batched(
+                "subscription { count(to: 2) }", max_latency=0
+            )
+        ]
+
+    assert [value for batch in batches for value in batch] == [1, 2]
@@ -0,0 +1,248 @@
+import asyncio
+from io import BytesIO
+from typing import Any
+
+import aiohttp
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+from strawberry.aiohttp.views import GraphQLView
+
+from aiogqlc import GraphQLClient
+from aiogqlc.errors import GraphQLResponseError
+from tests.app import batching_schema, create_app
+
+
+def count_requests(app: web.Application) -> list[str]:
+    content_types: list[str] = []
+
+    @web.middleware
+    async def middleware(request: web.Request, handler: Any) -> web.StreamResponse:
+        content_types.append(request.content_type)
+        return await handler(request)
+
+    app.middlewares.append(middleware)
+    return content_types
+
+
+@pytest.fixture
+async def batching_app() -> web.Application:
+    view = GraphQLView(schema=batching_schema, multipart_uploads_enabled=True)
+    app = web.Application()
+    app.router.add_route("*", "/graphql", view)
+    return app
+
+
+async def test_concurrent_operations_are_sent_in_one_request(
+    aiohttp_client: AiohttpClient, batching_app: web.Application
+):
+    requests = count_requests(batching_app)
+    graphql_session = await aiohttp_client(batching_app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    query = """
+        query ($id: ID!) {
+            todo(id: $id) {
+                title
+            }
+        }
+    """
+
+    async with client.batch(max_size=10, window=0.05) as batch:
+        results = await asyncio.gather(
+            batch.execute(query, variables={"id": "0"}),
+            batch.execute(query, variables={"id": "1"}),
+            batch.execute(query, variables={"id": "2"}),
+        )
+
+    assert results == [
+        {"data": {"todo": {"title": "Clean kitchen"}}},
+        {"data": {"todo": {"title": "Buy groceries"}}},
+        {"data": {"todo": {"title": "Stay hydrated"}}},
+    ]
+    assert len(requests) == 1
+    assert batch.batching_supported
+
+
+async def test_batch_is_flushed_when_max_size_is_reached(
+    aiohttp_client: AiohttpClient, batching_app: web.Application
+):
+    requests = count_requests(batching_app)
+    graphql_session = await aiohttp_client(batching_app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    query = """
+        query ($id: ID!) {
+            user(id: $id) {
+                name
+            }
+        }
+    """
+
+    async with client.batch(max_size=2, window=60) as batch:
+        results = await asyncio.gather(
+            batch.execute(query, variables={"id": "0"}),
+            batch.execute(query, variables={"id": "1"}),
+            batch.execute(query, variables={"id": "2"}),
+            batch.execute(query, variables={"id": "0"}, operation=None),
+        )
+
+    assert [result["data"]["user"]["name"] for result in results] == [
+        "Amelia",
+        "Bill",
+        "Clara",
+        "Amelia",
+    ]
+    assert len(requests) == 2
+
+
+async def test_pending_operations_are_flushed_on_exit(
+    aiohttp_client: AiohttpClient, batching_app: web.Application
+):
+    requests = count_requests(batching_app)
+    graphql_session = await aiohttp_client(batching_app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.batch(max_size=10, window=60) as batch:
+        task = asyncio.create_task(batch.execute("query { users { id } }"))
+        await asyncio.sleep(0)
+
+    assert await task == {"data": {"users": [{"id": "0"}, {"id": "1"}, {"id": "2"}]}}
+    assert len(requests) == 1
+
+
+async def test_fallback_to_single_requests(aiohttp_client: AiohttpClient):
+    app = create_app()
+    requests = count_requests(app)
+    graphql_session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    query = """
+        query ($id: ID!) {
+            user(id: $id) {
+                name
+            }
+        }
+    """
+
+    async with client.batch(max_size=10, window=0.01) as batch:
+        results = await asyncio.gather(
+            batch.execute(query, variables={"id": "0"}),
+            batch.execute(query, variables={"id": "1"}),
+        )
+        assert not batch.batching_supported
+
+        result = await batch.execute(query, variables={"id": "2"})
+
+    assert [result["data"]["user"]["name"] for result in results] == [
+        "Amelia",
+        "Bill",
+    ]
+    assert result == {"data": {"user": {"name": "Clara"}}}
+    assert len(requests) == 4
+
+
+async def test_file_uploads_bypass_batching(
+    aiohttp_client: AiohttpClient, batching_app: web.Application
+):
+    requests = count_requests(batching_app)
+    graphql_session = await aiohttp_client(batching_app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    query = """
+        mutation($file: Upload!) {
+            readFile(file: $file)
+        }
+    """
+
+    async with client.batch() as batch:
+        result = await batch.execute(query, variables={"file": BytesIO(b"Hello")})
+
+    assert result == {"data": {"readFile": "Hello"}}
+    assert requests == ["multipart/form-data"]
+
+
+async def test_batch_request_errors_are_raised_by_every_operation(
+    aiohttp_client: AiohttpClient,
+):
+    app = web.Application()
+    graphql_session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.batch(window=0) as batch:
+        results = await asyncio.gather(
+            batch.execute("query { a }"),
+            batch.execute("query { b }"),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, aiohttp.ContentTypeError) for result in results)
+
+
+async def failing_batch_server(request: web.Request) -> web.Response:
+    if request.app["status"] == 200:
+        return web.json_response([{"data": None}])
+    return web.Response(status=request.app["status"], text="Failed")
+
+
+@pytest.mark.parametrize(
+    ("status", "error"),
+    [
+        (401, aiohttp.ClientResponseError),
+        (429, aiohttp.ClientResponseError),
+        (502, aiohttp.ClientResponseError),
+        (200, GraphQLResponseError),
+    ],
+)
+async def test_failed_batches_are_not_resent(
+    aiohttp_client: AiohttpClient, status: int, error: type[Exception]
+):
+    app = web.Application()
+    app["status"] = status
+    app.router.add_route("POST", "/graphql", failing_batch_server)
+    requests = count_requests(app)
+    graphql_session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.batch(window=0) as batch:
+        results = await asyncio.gather(
+            batch.execute("mutation { a }"),
+            batch.execute("mutation { b }"),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, error) for result in results)
+    assert batch.batching_supported
+    assert len(requests) == 1
+
+
+async def plain_text_batch_server(request: web.Request) -> web.Response:
+    if isinstance(await request.json(), list):
+        return web.Response(text="Batching is not supported")
+    return web.json_response({"data": {"a": 1}})
+
+
+async def test_fallback_on_successful_non_list_responses(
+    aiohttp_client: AiohttpClient,
+):
+    app = web.Application()
+    app.router.add_route("POST", "/graphql", plain_text_batch_server)
+    requests = count_requests(app)
+    graphql_session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.batch(window=0) as batch:
+        results = await asyncio.gather(
+            batch.execute("query { a }"), batch.execute("query { a }")
+        )
+
+    assert results == [{"data": {"a": 1}}] * 2
+    assert not batch.batching_supported
+    assert len(requests) == 3
+
+
+async def test_invalid_max_size(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    with pytest.raises(ValueError):
+        client.batch(max_size=0)
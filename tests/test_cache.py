@@ -0,0 +1,149 @@
+from typing import Any
+
+import pytest
+
+from aiogqlc import GraphQLClient
+from aiogqlc.cache import ResponseCache
+
+
+@pytest.fixture
+async def graphql_client(aiohttp_client, counting_app):
+    graphql_session = await aiohttp_client(counting_app)
+    return GraphQLClient(
+        endpoint="/graphql", session=graphql_session, cache=ResponseCache()
+    )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr("aiogqlc.cache.time.monotonic", clock)
+    return clock
+
+
+async def test_queries_are_served_from_the_cache(graphql_client, counting_app):
+    first = await graphql_client.execute("query { ping }")
+    second = await graphql_client.execute("query { ping }")
+
+    assert second is first
+    assert await second.json() == {"data": {"ping": "pong"}}
+    assert len(counting_app["requests"]) == 1
+
+
+async def test_mutations_are_not_cached(graphql_client, counting_app):
+    await graphql_client.execute("mutation { ping }")
+    await graphql_client.execute("mutation { ping }")
+
+    assert len(counting_app["requests"]) == 2
+    assert len(graphql_client.cache) == 0
+
+
+async def test_cache_can_be_bypassed_per_call(graphql_client, counting_app):
+    await graphql_client.execute("query { ping }")
+    await graphql_client.execute("query { ping }", use_cache=False)
+
+    assert len(counting_app["requests"]) == 2
+
+
+async def test_cache_keys_include_request_options(graphql_client, counting_app):
+    await graphql_client.execute("query { ping }", headers={"X-Test": "1"})
+    await graphql_client.execute("query { ping }", headers={"X-Test": "2"})
+    await graphql_client.execute("query { ping }", headers={"X-Test": "1"})
+
+    assert len(counting_app["requests"]) == 2
+
+
+async def test_unsuccessful_responses_are_not_cached(graphql_client, counting_app):
+    await graphql_client.execute("query { ping }", headers={"X-Fail": "1"})
+    await graphql_client.execute("query { ping }", headers={"X-Fail": "1"})
+
+    assert len(counting_app["requests"]) == 2
+
+
+@pytest.mark.parametrize("header", ["X-Errors", "X-Plain"])
+async def test_responses_with_errors_are_not_cached(
+    graphql_client, counting_app, header: str
+):
+    await graphql_client.execute("query { ping }", headers={header: "1"})
+    response = await graphql_client.execute("query { ping }", headers={header: "1"})
+
+    assert len(counting_app["requests"]) == 2
+    assert len(graphql_client.cache) == 0
+    assert response.ok
+
+
+async def test_cached_responses_are_decoded_once(graphql_client, counting_app):
+    await graphql_client.execute("query { ping }")
+    first = await graphql_client.execute_result("query { ping }")
+    second = await graphql_client.execute_result("query { ping }")
+
+    assert second is first
+    assert first.data == {"ping": "pong"}
+    assert len(counting_app["requests"]) == 1
+
+
+async def test_invalidating_a_cached_query(graphql_client, counting_app):
+    variables = {"id": "1"}
+    await graphql_client.execute("query ($id: ID) { ping }", variables=variables)
+
+    key = graphql_client.cache_key("query ($id: ID) { ping }", variables=variables)
+    assert key in graphql_client.cache
+    assert graphql_client.cache.invalidate(key)
+    assert not graphql_client.cache.invalidate(key)
+
+    await graphql_client.execute("query ($id: ID) { ping }", variables=variables)
+
+    assert len(counting_app["requests"]) == 2
+
+
+async def test_entries_expire(graphql_client, counting_app, clock: FakeClock):
+    await graphql_client.execute("query { ping }")
+    clock.now += 59
+    await graphql_client.execute("query { ping }")
+    clock.now += 1
+    await graphql_client.execute("query { ping }")
+
+    assert len(counting_app["requests"]) == 2
+
+
+def test_per_entry_ttl(clock: FakeClock):
+    cache = ResponseCache(ttl=None)
+    response: Any = object()
+
+    cache.set("forever", response)
+    cache.set("short", response, ttl=1)
+    clock.now += 10
+
+    assert cache.get("forever") is response
+    assert cache.get("short") is None
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(max_size=2)
+    response: Any = object()
+
+    cache.set("a", response)
+    cache.set("b", response)
+    cache.get("a")
+    cache.set("c", response)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        ResponseCache(max_size=0)
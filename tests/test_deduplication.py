@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from aiogqlc import GraphQLClient
+
+
+@pytest.fixture
+def counting_delay() -> float:
+    return 0.05
+
+
+@pytest.fixture
+async def graphql_client(aiohttp_client, counting_app):
+    graphql_session = await aiohttp_client(counting_app)
+    return GraphQLClient(endpoint="/graphql", session=graphql_session, deduplicate=True)
+
+
+async def test_concurrent_identical_queries_share_one_request(
+    graphql_client, counting_app
+):
+    responses = await asyncio.gather(
+        *(graphql_client.execute("query { ping }") for _ in range(10))
+    )
+
+    assert len(counting_app["requests"]) == 1
+    assert all(response is responses[0] for response in responses)
+    assert await responses[0].json() == {"data": {"ping": "pong"}}
+
+
+async def test_sequential_identical_queries_are_not_shared(
+    graphql_client, counting_app
+):
+    await graphql_client.execute("query { ping }")
+    await graphql_client.execute("query { ping }")
+
+    assert len(counting_app["requests"]) == 2
+
+
+async def test_different_variables_are_not_shared(graphql_client, counting_app):
+    query = "query ($id: ID) { ping }"
+    await asyncio.gather(
+        graphql_client.execute(query, variables={"id": "1"}),
+        graphql_client.execute(query, variables={"id": "2"}),
+        graphql_client.execute(query, variables={"id": "1"}),
+    )
+
+    assert len(counting_app["requests"]) == 2
+
+
+async def test_different_request_options_are_not_shared(graphql_client, counting_app):
+    await asyncio.gather(
+        graphql_client.execute("query { ping }", headers={"X-Test": "1"}),
+        graphql_client.execute("query { ping }", headers={"X-Test": "2"}),
+    )
+
+    assert len(counting_app["requests"]) == 2
+
+
+async def test_mutations_are_not_shared(graphql_client, counting_app):
+    await asyncio.gather(
+        graphql_client.execute("mutation { ping }"),
+        graphql_client.execute("mutation { ping }"),
+    )
+
+    assert len(counting_app["requests"]) == 2
+
+
+async def test_cancelling_one_caller_does_not_cancel_the_request(
+    graphql_client, counting_app
+):
+    first = asyncio.create_task(graphql_client.execute("query { ping }"))
+    second = asyncio.create_task(graphql_client.execute("query { ping }"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    response = await second
+
+    assert first.cancelled()
+    assert await response.json() == {"data": {"ping": "pong"}}
+    assert len(counting_app["requests"]) == 1
+
+
+async def test_deduplication_is_disabled_by_default(aiohttp_client, counting_app):
+    graphql_session = await aiohttp_client(counting_app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    await asyncio.gather(client.execute("{ ping }"), client.execute("{ ping }"))
+
+    assert len(counting_app["requests"]) == 2
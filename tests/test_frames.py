@@ -0,0 +1,126 @@
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS, GRAPHQL_WS
+from aiogqlc.errors import GraphQLWSOperationError
+from aiogqlc.frames import RawPayload, split_data_message
+from tests.helpers import fake_server
+
+
+@pytest.mark.parametrize(
+    ("frame", "expectation"),
+    [
+        ('{"type":"data","id":"1","payload":{"data":1}}', ("data", "1", '{"data":1}')),
+        (
+            '{ "id": "2", "type": "next", "payload": {"data": 1} }\n',
+            ("next", "2", '{"data": 1} '),
+        ),
+        ('{"type":"error","id":"3","payload":[{"m":1}]}', ("error", "3", '[{"m":1}]')),
+        ('{"type":"complete","id":"1"}', None),
+        ('{"payload":{},"type":"data","id":"1"}', None),
+        ('{"type":"data","id":"1","payload":', None),
+        ('{"type":"data","id":"1","payload":{}]', None),
+        ('{"type":"data","id":"\\"","payload":{}}', None),
+    ],
+)
+def test_splitting_data_messages(frame, expectation):
+    parts = split_data_message(frame)
+
+    if expectation is None:
+        assert parts is None
+    else:
+        assert parts is not None
+        message_type, operation_id, start, end = parts
+        assert (message_type, operation_id, frame[start:end]) == expectation
+
+
+def test_raw_payloads_are_decoded_once():
+    calls = []
+
+    def loads(value):
+        calls.append(value)
+        return json.loads(value)
+
+    frame = '{"type":"data","id":"1","payload":{"data":{"a":[1]}}}'
+    parts = split_data_message(frame)
+    assert parts is not None
+    payload = RawPayload(frame, parts[2], parts[3], loads)
+
+    assert payload.raw == '{"data":{"a":[1]}}'
+    assert payload.decode() is payload.decode()
+    assert calls == ['{"data":{"a":[1]}}']
+
+
+def test_raw_payloads_followed_by_other_keys():
+    frame = '{"type":"data","id":"1","payload":{"data":1},"extensions":{}}'
+    parts = split_data_message(frame)
+    assert parts is not None
+
+    payload = RawPayload(frame, parts[2], parts[3], json.loads)
+
+    assert payload.decode() == {"data": 1}
+
+
+@pytest.mark.parametrize("protocol", [GRAPHQL_WS, GRAPHQL_TRANSPORT_WS])
+async def test_raw_subscriptions(graphql_session: aiohttp.ClientSession, protocol):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(protocol) as connection:
+        payloads = [
+            payload
+            async for payload in connection.subscribe_raw(
+                "subscription { count(to: 2) }"
+            )
+        ]
+
+    assert all(isinstance(payload, str) for payload in payloads)
+    assert [json.loads(payload) for payload in payloads] == [
+        {"data": {"count": 1}},
+        {"data": {"count": 2}},
+    ]
+
+
+async def test_raw_subscription_errors(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect() as connection:
+        subscription = connection.subscribe_raw("subscription { unknownField }")
+        with pytest.raises(GraphQLWSOperationError):
+            await subscription.__anext__()
+
+        subscription = connection.subscribe_raw("subscription { infinity }")
+        assert json.loads(await subscription.__anext__()) == {
+            "data": {"infinity": "For ever"}
+        }
+        await subscription.aclose()
+
+
+@pytest.fixture
+async def client(aiohttp_client: AiohttpClient):
+    app = web.Application()
+    app.router.add_route("GET", "/graphql", fake_server)
+    session = await aiohttp_client(app)
+    return GraphQLClient(endpoint="/graphql", session=session)
+
+
+async def test_frames_in_any_key_order(client: GraphQLClient):
+    async with client.connect() as connection:
+        payloads = [payload async for payload in connection.subscribe("subscription")]
+        raw_payloads = [
+            payload async for payload in connection.subscribe_raw("subscription")
+        ]
+        batches = [
+            batch
+            async for batch in connection.subscribe_batched(
+                "subscription", max_latency=0.05
+            )
+        ]
+
+    assert payloads == [{"data": 1}, {"data": 2}]
+    assert raw_payloads == ['{"data": 1}', '{"data":2}']
+    assert batches == [[{"data": 1}, {"data": 2}]]
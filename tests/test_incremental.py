@@ -0,0 +1,204 @@
+import asyncio
+import json
+
+import aiohttp
+import aiohttp.web
+import pytest
+
+from aiogqlc import GraphQLClient
+from aiogqlc.incremental import IncrementalResult, MultipartMixedParser, get_boundary
+from tests.helpers import INCREMENTAL_PAYLOADS, IncrementalGraphQLView
+
+QUERY = """
+    query {
+        todo(id: 1) {
+            title
+            ... @defer {
+                creator {
+                    name
+                }
+            }
+        }
+        todos @stream(initialCount: 1) {
+            title
+        }
+    }
+"""
+
+LEGACY_PAYLOADS = [
+    {
+        "data": {"todo": {"title": "Buy groceries"}, "todos": [{"title": "A"}]},
+        "hasNext": True,
+    },
+    {
+        "incremental": [
+            {"data": {"creator": {"name": "Bill"}}, "path": ["todo"]},
+            {"items": [{"title": "B"}], "path": ["todos", 1]},
+        ],
+        "hasNext": True,
+    },
+    {"items": [{"title": "C"}], "path": ["todos", 2], "hasNext": False},
+]
+
+EXPECTED_DATA = {
+    "todo": {"title": "Buy groceries", "creator": {"name": "Bill"}},
+    "todos": [{"title": "A"}, {"title": "B"}, {"title": "C"}],
+}
+
+
+@pytest.fixture
+async def app():
+    release = asyncio.Event()
+    release.set()
+
+    app = aiohttp.web.Application()
+    app["accept"] = []
+    app["config"] = {"payloads": INCREMENTAL_PAYLOADS, "release": release}
+    app.router.add_route("*", "/graphql", IncrementalGraphQLView)
+    return app
+
+
+@pytest.fixture
+async def graphql_client(aiohttp_client, app):
+    graphql_session = await aiohttp_client(app)
+    return GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+
+async def test_patches_are_merged_into_the_result(graphql_client, app):
+    results = []
+    data = []
+    async for result in graphql_client.execute_incremental(QUERY):
+        results.append(result)
+        data.append(json.loads(json.dumps(result.data)))
+
+    assert all(result is results[0] for result in results)
+    assert data[0] == INCREMENTAL_PAYLOADS[0]["data"]
+    assert data[1]["todo"]["creator"] == {"name": "Bill"}
+    assert data[-1] == EXPECTED_DATA
+    assert results[-1].payload == INCREMENTAL_PAYLOADS[-1]
+    assert results[-1].errors == [{"message": "Stream failed"}]
+    assert results[-1].extensions == {"cost": 3}
+    assert not results[-1].has_next
+    assert app["accept"][0].startswith("multipart/mixed")
+
+
+async def test_legacy_patches_are_merged_into_the_result(graphql_client, app):
+    app["config"]["payloads"] = LEGACY_PAYLOADS
+
+    async for result in graphql_client.execute_incremental(QUERY):
+        pass
+
+    assert result.data == EXPECTED_DATA
+    assert result.errors is None
+
+
+async def test_initial_payload_is_yielded_before_patches_arrive(graphql_client, app):
+    release: asyncio.Event = app["config"]["release"]
+    release.clear()
+
+    results = graphql_client.execute_incremental(QUERY)
+    initial = await asyncio.wait_for(results.__anext__(), timeout=1)
+
+    assert initial.data == INCREMENTAL_PAYLOADS[0]["data"]
+    assert initial.has_next
+
+    release.set()
+    async for result in results:
+        pass
+
+    assert result.data == EXPECTED_DATA
+
+
+async def test_non_incremental_responses(graphql_client, app):
+    app["config"]["payloads"] = [{"data": {"todo": {"title": "Buy groceries"}}}]
+
+    results = [
+        result
+        async for result in graphql_client.execute_incremental(
+            QUERY, headers={"Accept": "application/json"}
+        )
+    ]
+
+    assert len(results) == 1
+    assert results[0].data == {"todo": {"title": "Buy groceries"}}
+    assert not results[0].has_next
+    assert app["accept"] == ["application/json"]
+
+
+def test_patches_for_unknown_or_missing_paths_are_ignored():
+    result = IncrementalResult()
+    result.apply({"data": {"todo": None, "todos": None}, "hasNext": True})
+    result.apply(
+        {
+            "incremental": [
+                {"id": "unknown", "data": {"a": 1}},
+                {"data": {"title": "A"}, "path": ["todo"]},
+                {"items": [{"title": "A"}], "path": ["todos", 0]},
+                {"data": None, "path": ["todo"], "errors": [{"message": "Failed"}]},
+            ],
+            "hasNext": False,
+        }
+    )
+
+    assert result.data == {"todo": None, "todos": None}
+    assert result.errors == [{"message": "Failed"}]
+    assert repr(result) == (
+        "<IncrementalResult data={'todo': None, 'todos': None} has_next=False>"
+    )
+
+
+def test_nested_patches_are_merged_deeply():
+    result = IncrementalResult()
+    result.apply(
+        {"data": {"todo": {"creator": {"id": "1"}}, "todos": [{}]}, "hasNext": True}
+    )
+    result.apply(
+        {
+            "incremental": [
+                {"data": {"creator": {"name": "Bill"}}, "path": ["todo"]},
+                {"data": {"title": "A"}, "path": ["todos", 0]},
+                {"data": {"title": "B"}, "path": ["todos", 1]},
+                {"data": {"title": "A"}, "path": ["todo", "missing", "field"]},
+            ],
+            "hasNext": False,
+        }
+    )
+
+    assert result.data == {
+        "todo": {"creator": {"id": "1", "name": "Bill"}},
+        "todos": [{"title": "A"}],
+    }
+
+
+def test_multipart_parser_handles_any_chunk_boundaries():
+    body = (
+        b"preamble\r\n--abc\r\n"
+        b"Content-Type: application/json\r\n\r\n"
+        b'{"a": 1}\r\n--abc\r\n'
+        b"\r\n"
+        b'{"b": 2}\r\n--abc\r\n'
+        b"Content-Type: application/json\r\n\r\n"
+        b"{}\r\n--abc--\r\n"
+        b"epilogue"
+    )
+
+    for chunk_size in range(1, len(body) + 1):
+        parser = MultipartMixedParser("abc")
+        parts = []
+        for start in range(0, len(body), chunk_size):
+            parts.extend(parser.feed(body[start : start + chunk_size]))
+
+        assert parts == [b'{"a": 1}', b'{"b": 2}', b"{}"]
+        assert parser.feed(b"\r\n--abc\r\n\r\n{}\r\n--abc") == []
+
+
+@pytest.mark.parametrize(
+    ("content_type", "boundary"),
+    [
+        ('multipart/mixed; boundary="-"', "-"),
+        ("multipart/mixed;boundary=graphql;deferSpec=20220824", "graphql"),
+        ("multipart/mixed", "-"),
+    ],
+)
+def test_get_boundary(content_type, boundary):
+    assert get_boundary(content_type) == boundary
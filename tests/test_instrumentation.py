@@ -0,0 +1,276 @@
+import asyncio
+from io import BytesIO
+from typing import Any, Optional, cast
+
+import aiohttp
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS, GRAPHQL_WS
+from aiogqlc.errors import GraphQLResponseError, GraphQLWSOperationError
+from aiogqlc.instrumentation import Instrumentation, OperationTrace
+from aiogqlc.types import Variables
+from tests.helpers import fake_server
+
+QUERY = "query GetUsers { users { id } }"
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self) -> None:
+        self.events: list[tuple[Any, ...]] = []
+        self.traces: list[OperationTrace] = []
+        self.errors: list[Optional[BaseException]] = []
+
+    def operation_started(self, trace: OperationTrace) -> None:
+        self.traces.append(trace)
+        self.events.append(("start", trace.operation))
+
+    def operation_ended(
+        self, trace: OperationTrace, error: Optional[BaseException]
+    ) -> None:
+        self.errors.append(error)
+        self.events.append(("end", trace.operation))
+
+    def phase_started(self, trace: OperationTrace, phase: str) -> None:
+        self.events.append(("phase_started", phase))
+
+    def phase_ended(self, trace: OperationTrace, phase: str, duration: float) -> None:
+        assert duration >= 0
+        self.events.append(("phase_ended", phase))
+
+    def message_received(self, trace: OperationTrace, queue_depth: int) -> None:
+        assert queue_depth >= 0
+        self.events.append(("message",))
+
+    def phases(self) -> list[str]:
+        return [event[1] for event in self.events if event[0] == "phase_ended"]
+
+
+@pytest.fixture
+def instrumentation() -> RecordingInstrumentation:
+    return RecordingInstrumentation()
+
+
+@pytest.fixture
+def client(
+    graphql_session: aiohttp.ClientSession, instrumentation: RecordingInstrumentation
+):
+    return GraphQLClient(
+        endpoint="/graphql", session=graphql_session, instrumentation=instrumentation
+    )
+
+
+async def test_http_operations(
+    client: GraphQLClient, instrumentation: RecordingInstrumentation
+):
+    response = await client.execute(QUERY, operation="GetUsers")
+    assert response.ok
+
+    assert instrumentation.events == [
+        ("start", "GetUsers"),
+        ("phase_started", "serialize"),
+        ("phase_ended", "serialize"),
+        ("phase_started", "request"),
+        ("phase_ended", "request"),
+        ("phase_started", "read"),
+        ("phase_ended", "read"),
+        ("end", "GetUsers"),
+    ]
+    assert instrumentation.errors == [None]
+    assert instrumentation.traces[0].transport == "http"
+
+
+async def test_nested_http_operations_are_traced_once(
+    client: GraphQLClient, instrumentation: RecordingInstrumentation
+):
+    await client.fetch(QUERY)
+    await client.execute_result(QUERY)
+    await client.execute(
+        "mutation($file: Upload!) { readFile(file: $file) }",
+        variables={"file": BytesIO(b"Hello")},
+    )
+
+    assert len(instrumentation.traces) == 3
+    assert instrumentation.phases()[:4] == [
+        "serialize",
+        "request",
+        "read",
+        "decode",
+    ]
+    assert instrumentation.phases()[-3:] == ["serialize", "request", "read"]
+
+
+async def test_failed_http_operations(
+    graphql_session: aiohttp.ClientSession, instrumentation: RecordingInstrumentation
+):
+    def json_dumps(obj: Any) -> str:
+        raise TypeError(obj)
+
+    client = GraphQLClient(
+        endpoint="/graphql",
+        session=graphql_session,
+        json_dumps=json_dumps,
+        instrumentation=instrumentation,
+    )
+
+    with pytest.raises(TypeError):
+        await client.execute(QUERY)
+
+    assert isinstance(instrumentation.errors[0], TypeError)
+    assert instrumentation.phases() == ["serialize"]
+
+
+async def test_streamed_http_operations(
+    client: GraphQLClient, instrumentation: RecordingInstrumentation
+):
+    users = 0
+    async for _ in client.execute_stream(QUERY, "data.users", operation="GetUsers"):
+        assert await client.execute(QUERY)
+        users += 1
+
+    async for _ in client.execute_incremental(QUERY, operation="GetUsers"):
+        pass
+
+    with pytest.raises(GraphQLResponseError):
+        async for _ in client.execute_stream("query { unknownField }", "data"):
+            pass
+
+    with pytest.raises(TypeError):
+        async for _ in client.execute_incremental(
+            QUERY, cast(Variables, {"user": object()})
+        ):
+            pass
+
+    starts = [event for event in instrumentation.events if event[0] == "start"]
+    assert starts == [
+        ("start", "GetUsers"),
+        *[("start", None)] * users,
+        ("start", "GetUsers"),
+        ("start", None),
+        ("start", None),
+    ]
+    assert instrumentation.phases()[:2] == ["serialize", "request"]
+    assert instrumentation.phases()[-6:] == [
+        "serialize",
+        "request",
+        "read",
+        "serialize",
+        "request",
+        "serialize",
+    ]
+    assert isinstance(instrumentation.errors[-2], GraphQLResponseError)
+    assert isinstance(instrumentation.errors[-1], TypeError)
+
+
+async def test_batched_http_operations(
+    client: GraphQLClient, instrumentation: RecordingInstrumentation
+):
+    async with client.batch(window=0.05) as batch:
+        await asyncio.gather(
+            batch.execute(QUERY, operation="GetUsers"),
+            batch.execute(QUERY, operation="GetUsers"),
+        )
+        await batch.execute(
+            "mutation($file: Upload!) { readFile(file: $file) }",
+            variables={"file": BytesIO(b"Hello")},
+        )
+
+    assert [trace.operation for trace in instrumentation.traces] == [
+        "GetUsers",
+        "GetUsers",
+        None,
+    ]
+    assert instrumentation.errors == [None] * 3
+    assert instrumentation.phases() == ["serialize", "request", "read"]
+
+
+@pytest.mark.parametrize("protocol", [GRAPHQL_WS, GRAPHQL_TRANSPORT_WS])
+async def test_subscriptions(
+    client: GraphQLClient, instrumentation: RecordingInstrumentation, protocol: str
+):
+    async with client.connect(protocol) as connection:
+        payloads = [
+            payload
+            async for payload in connection.subscribe(
+                "subscription Count { count(to: 3) }"
+            )
+        ]
+
+    assert len(payloads) == 3
+    assert instrumentation.events == [
+        ("start", None),
+        ("phase_started", "subscribe"),
+        ("phase_ended", "subscribe"),
+        ("phase_ended", "first_data"),
+        ("message",),
+        ("message",),
+        ("message",),
+        ("end", None),
+    ]
+
+    trace = instrumentation.traces[0]
+    assert trace.transport == protocol
+    assert trace.operation_id == "1"
+    assert trace.messages == 3
+    assert trace.max_queue_depth >= 1
+    assert trace.first_data is not None
+
+
+async def test_failed_subscriptions(
+    client: GraphQLClient, instrumentation: RecordingInstrumentation
+):
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        with pytest.raises(GraphQLWSOperationError):
+            await connection.execute("query { unknownField }")
+        with pytest.raises(GraphQLWSOperationError):
+            async for _ in connection.subscribe(
+                "subscription { unknownField }", multicast=True
+            ):
+                pass
+        with pytest.raises(GraphQLWSOperationError):
+            async for _ in connection.subscribe_batched(
+                "subscription { unknownField }"
+            ):
+                pass
+
+        subscription = connection.subscribe("subscription { infinity }")
+        await subscription.__anext__()
+        await subscription.aclose()
+
+    assert [type(error) for error in instrumentation.errors] == [
+        GraphQLWSOperationError,
+        GraphQLWSOperationError,
+        GraphQLWSOperationError,
+        type(None),
+    ]
+
+
+async def test_default_instrumentation_does_nothing(
+    graphql_session: aiohttp.ClientSession,
+):
+    client = GraphQLClient(
+        endpoint="/graphql", session=graphql_session, instrumentation=Instrumentation()
+    )
+
+    assert (await client.execute_result(QUERY)).data is not None
+    async with client.connect() as connection:
+        async for _ in connection.subscribe("subscription { count(to: 1) }"):
+            pass
+
+
+async def test_messages_in_any_key_order_are_traced(aiohttp_client: AiohttpClient):
+    app = web.Application()
+    app.router.add_route("GET", "/graphql", fake_server)
+    session = await aiohttp_client(app)
+    instrumentation = RecordingInstrumentation()
+    client = GraphQLClient(
+        endpoint="/graphql", session=session, instrumentation=instrumentation
+    )
+
+    async with client.connect() as connection:
+        async for _ in connection.subscribe("subscription"):
+            pass
+
+    assert instrumentation.traces[0].messages == 2
@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS, GRAPHQL_WS
+from aiogqlc.errors import GraphQLWSConnectionClosedError
+from aiogqlc.reconnect import ReconnectPolicy
+
+QUERY = "subscription { count }"
+
+
+async def fake_server(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_WS, GRAPHQL_TRANSPORT_WS])
+    await ws.prepare(request)
+    config = request.app["config"]
+    config["connections"] += 1
+
+    await ws.receive_json()
+    await ws.send_json({"type": "connection_ack"})
+
+    for _ in range(config["keep_alives"]):
+        await asyncio.sleep(0.02)
+        await ws.send_json({"type": "ka"})
+
+    async for ws_message in ws:
+        message = json.loads(ws_message.data)
+
+        if message["type"] == "ping" and config["pong"]:
+            await ws.send_json({"type": "pong"})
+        elif message["type"] == "start" and config["connections"] > 1:
+            await ws.send_json({"type": "data", "id": message["id"], "payload": {}})
+            await ws.send_json({"type": "complete", "id": message["id"]})
+        elif message["type"] == "connection_terminate":
+            break
+
+    return ws
+
+
+@pytest.fixture
+async def app():
+    app = web.Application()
+    app["config"] = {"connections": 0, "keep_alives": 0, "pong": False}
+    app.router.add_route("GET", "/graphql", fake_server)
+    return app
+
+
+@pytest.fixture
+async def client(aiohttp_client: AiohttpClient, app: web.Application):
+    session = await aiohttp_client(app)
+    return GraphQLClient(endpoint="/graphql", session=session)
+
+
+async def test_silent_connections_are_closed(client: GraphQLClient):
+    async with client.connect(keep_alive_timeout=0.05) as connection:
+        with pytest.raises(GraphQLWSConnectionClosedError) as exc_info:
+            await connection.subscribe(QUERY).__anext__()
+
+        assert connection.time_since_keep_alive >= 0.05
+
+    assert exc_info.value.code == 1006
+    assert exc_info.value.reason == "Keep-alive timeout"
+
+
+async def test_keep_alives_extend_the_timeout(
+    client: GraphQLClient, app: web.Application
+):
+    app["config"]["keep_alives"] = 10
+
+    async with client.connect(keep_alive_timeout=0.1) as connection:
+        subscription = connection.subscribe(QUERY)
+        task = asyncio.create_task(subscription.__anext__())
+
+        await asyncio.sleep(0.15)
+        assert not task.done()
+        assert connection.time_since_keep_alive < 0.1
+
+        with pytest.raises(GraphQLWSConnectionClosedError):
+            await task
+
+
+async def test_reconnecting_dead_connections(client: GraphQLClient):
+    async with client.connect(
+        keep_alive_timeout=0.05, reconnect=ReconnectPolicy(initial_delay=0)
+    ) as connection:
+        assert [payload async for payload in connection.subscribe(QUERY)] == [{}]
+
+
+async def test_pings_are_sent_to_silent_servers(
+    client: GraphQLClient, app: web.Application
+):
+    app["config"]["pong"] = True
+
+    async with client.connect(
+        GRAPHQL_TRANSPORT_WS, keep_alive_timeout=0.05
+    ) as connection:
+        await asyncio.sleep(0.2)
+        assert connection.time_since_keep_alive < 0.1
+
+
+async def test_unanswered_pings(client: GraphQLClient):
+    async with client.connect(
+        GRAPHQL_TRANSPORT_WS, keep_alive_timeout=0.05
+    ) as connection:
+        with pytest.raises(GraphQLWSConnectionClosedError) as exc_info:
+            await connection.execute(QUERY)
+
+        assert connection.time_since_keep_alive >= 0.1
+
+    assert exc_info.value.reason == "Keep-alive timeout"
+
+
+async def test_unanswered_probes_are_not_awaited(
+    client: GraphQLClient, app: web.Application
+):
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        for _ in range(3):
+            assert await connection.probe_connection()
+        assert not connection._pong_waiters
+
+        app["config"]["pong"] = True
+        assert await asyncio.wait_for(connection.ping(), 1) is None
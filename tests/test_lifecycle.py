@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.client import GraphQLTransportWSManager
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS, GRAPHQL_WS
+from aiogqlc.errors import GraphQLWSOperationError
+from tests.helpers import (
+    COUNT_SUBSCRIPTION,
+    INFINITE_SUBSCRIPTION,
+    RecordingEncoder,
+    collect,
+)
+
+
+@pytest.mark.parametrize(
+    ("protocol", "stop"), [(GRAPHQL_WS, "stop"), (GRAPHQL_TRANSPORT_WS, "complete")]
+)
+async def test_released_operations_leave_nothing_behind(
+    recording_client: GraphQLClient, encoder: RecordingEncoder, protocol: str, stop: str
+):
+    async with recording_client.connect(protocol) as connection:
+        await collect(connection.subscribe(COUNT_SUBSCRIPTION))
+        await collect(connection.subscribe_raw(COUNT_SUBSCRIPTION))
+        await collect(connection.subscribe_batched(COUNT_SUBSCRIPTION))
+        await collect(connection.subscribe(COUNT_SUBSCRIPTION, multicast=True))
+
+        with pytest.raises(GraphQLWSOperationError):
+            await collect(connection.subscribe("subscription { unknownField }"))
+
+        for subscription in (
+            connection.subscribe(INFINITE_SUBSCRIPTION),
+            connection.subscribe_raw(INFINITE_SUBSCRIPTION),
+            connection.subscribe_batched(INFINITE_SUBSCRIPTION),
+            connection.subscribe(INFINITE_SUBSCRIPTION, multicast=True),
+        ):
+            await subscription.__anext__()
+            await subscription.aclose()
+
+        assert connection.queue_stats() == {}
+        assert connection._operations == {}
+        assert connection._shared_operations == {}
+
+    assert encoder.types(stop) == [(stop, str(id)) for id in range(6, 10)]
+
+
+async def test_cancelled_consumers_stop_their_operation(
+    recording_client: GraphQLClient, encoder: RecordingEncoder
+):
+    async with recording_client.connect() as connection:
+        received = asyncio.Event()
+
+        async def consume():
+            async for _ in connection.subscribe(INFINITE_SUBSCRIPTION):
+                received.set()
+
+        task = asyncio.create_task(consume())
+        await received.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert encoder.types("stop") == [("stop", "1")]
+        assert connection.queue_stats() == {}
+
+
+async def fake_server(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_WS])
+    await ws.prepare(request)
+    await ws.receive_json()
+    await ws.send_json({"type": "connection_ack"})
+
+    async for ws_message in ws:
+        message = json.loads(ws_message.data)
+        if message["type"] == "connection_terminate":
+            break
+        if message["type"] != "start":
+            continue
+
+        # Late messages of operations that were already released
+        await ws.send_json({"type": "data", "id": "99", "payload": {"data": 0}})
+        await ws.send_json({"type": "error", "id": "99", "payload": []})
+        await ws.send_json({"type": "complete", "id": "99"})
+        await ws.send_json(
+            {"type": "data", "id": message["id"], "payload": {"data": 1}}
+        )
+        await ws.send_json({"type": "complete", "id": message["id"]})
+
+    return ws
+
+
+async def test_messages_of_unknown_operations_are_dropped(
+    aiohttp_client: AiohttpClient,
+):
+    app = web.Application()
+    app.router.add_route("GET", "/graphql", fake_server)
+    session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=session)
+
+    async with client.connect() as connection:
+        assert await collect(connection.subscribe("subscription")) == [{"data": 1}]
+        assert await collect(connection.subscribe("subscription")) == [{"data": 1}]
+        assert connection.queue_stats() == {}
+
+
+async def closing_server(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_WS, GRAPHQL_TRANSPORT_WS])
+    await ws.prepare(request)
+    await ws.receive_json()
+    await ws.send_json({"type": "connection_ack"})
+    await ws.close()
+    return ws
+
+
+@pytest.mark.parametrize("protocol", [GRAPHQL_WS, GRAPHQL_TRANSPORT_WS])
+async def test_operations_started_on_closed_connections_are_released(
+    aiohttp_client: AiohttpClient, protocol: str
+):
+    app = web.Application()
+    app.router.add_route("GET", "/graphql", closing_server)
+    session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=session)
+
+    async with client.connect(protocol) as connection:
+        await asyncio.wait([connection._connection_handler_task])
+
+        subscriptions = [
+            connection.subscribe(COUNT_SUBSCRIPTION),
+            connection.subscribe_raw(COUNT_SUBSCRIPTION),
+            connection.subscribe_batched(COUNT_SUBSCRIPTION),
+            connection.subscribe(COUNT_SUBSCRIPTION, multicast=True),
+        ]
+        for subscription in subscriptions:
+            with pytest.raises(ConnectionError):
+                await subscription.__anext__()
+
+        if isinstance(connection, GraphQLTransportWSManager):
+            with pytest.raises(ConnectionError):
+                await connection.execute(COUNT_SUBSCRIPTION)
+
+        assert connection.queue_stats() == {}
+        assert connection._operations == {}
+        assert connection._shared_operations == {}
@@ -0,0 +1,270 @@
+import asyncio
+from io import BytesIO
+from pathlib import Path
+
+import aiohttp
+import aiohttp.web
+import pytest
+from pytest_aiohttp import AiohttpClient
+from strawberry.aiohttp.views import GraphQLView
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS, GRAPHQL_WS
+from aiogqlc.errors import GraphQLResponseError, GraphQLWSOperationError
+from aiogqlc.metrics import ClientMetrics, Histogram, SubscriptionMeter, encoded_size
+from aiogqlc.types import VariableValue
+from aiogqlc.uploads import StreamingUpload
+from tests.app import batching_schema
+from tests.helpers import (
+    INCREMENTAL_PAYLOADS,
+    ExportGraphQLView,
+    IncrementalGraphQLView,
+    fake_server,
+)
+
+QUERY = "query GetUsers { users { id } }"
+
+UPLOAD = """
+    mutation($files: [Upload!]!) {
+        readFiles(files: $files)
+    }
+"""
+
+
+async def chunks():
+    yield b"Hello"
+
+
+@pytest.fixture
+def metrics() -> ClientMetrics:
+    return ClientMetrics()
+
+
+@pytest.fixture
+def client(graphql_session: aiohttp.ClientSession, metrics: ClientMetrics):
+    return GraphQLClient(endpoint="/graphql", session=graphql_session, metrics=metrics)
+
+
+async def test_http_operations(client: GraphQLClient, metrics: ClientMetrics):
+    await client.execute(QUERY, operation="GetUsers")
+    await client.fetch("query { unknownField }")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"GetUsers": 1, "": 1}
+    assert snapshot["errors"] == {"response": 1}
+    assert snapshot["bytes_sent"]["http"] > len(QUERY)
+    assert snapshot["bytes_received"]["http"] > 0
+    assert snapshot["upload_bytes"] == 0
+    assert snapshot["request_duration"]["count"] == 2
+    assert snapshot["request_duration"]["buckets"][float("inf")] == 2
+
+    received = snapshot["bytes_received"]["http"]
+    response = await client.get(params={"query": QUERY})
+    assert response.ok
+    assert metrics.snapshot()["bytes_received"]["http"] > received
+
+
+async def test_decoded_results(client: GraphQLClient, metrics: ClientMetrics):
+    result = await client.execute_result("query { unknownField }")
+    assert result.errors
+    assert result.errors
+
+    result = await client.execute_result(QUERY)
+    assert result.data
+
+    assert metrics.snapshot()["errors"] == {"response": 1}
+
+
+async def test_uploads(client: GraphQLClient, metrics: ClientMetrics, tmp_path: Path):
+    path = tmp_path / "upload.txt"
+    path.write_bytes(b"Hello, Path!")
+    files: list[VariableValue] = [
+        BytesIO(b"Hello, World!"),
+        path,
+        b"Hi",
+        StreamingUpload(chunks()),
+    ]
+
+    response = await client.execute(UPLOAD, variables={"files": files})
+    assert response.ok
+
+    assert metrics.snapshot()["upload_bytes"] == 13 + 12 + 2
+
+    files = [BytesIO(b"Hello, World!")]
+    stream = client.execute_stream(UPLOAD, ["data", "readFiles"], {"files": files})
+    assert [item async for item in stream] == ["Hello, World!"]
+
+    assert metrics.snapshot()["upload_bytes"] == 13 + 12 + 2 + 13
+
+
+async def test_streamed_responses(aiohttp_client: AiohttpClient):
+    app = aiohttp.web.Application()
+    app["config"] = {"errors": [{"message": "Export failed"}]}
+    app.router.add_route("*", "/graphql", ExportGraphQLView)
+    metrics = ClientMetrics()
+    client = GraphQLClient(
+        endpoint="/graphql", session=await aiohttp_client(app), metrics=metrics
+    )
+
+    with pytest.raises(GraphQLResponseError):
+        async for _ in client.execute_stream("query { export }", "data.export"):
+            pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"": 1}
+    assert snapshot["request_duration"]["count"] == 1
+    assert snapshot["errors"] == {"response": 1}
+    assert snapshot["bytes_sent"]["http"] > 0
+    assert snapshot["bytes_received"]["http"] > 100_000
+
+
+@pytest.mark.parametrize(
+    "payloads", [INCREMENTAL_PAYLOADS, [{"errors": [{"message": "Oops"}]}]]
+)
+async def test_incremental_responses(aiohttp_client: AiohttpClient, payloads):
+    release = asyncio.Event()
+    release.set()
+    app = aiohttp.web.Application()
+    app["accept"] = []
+    app["config"] = {"payloads": payloads, "release": release}
+    app.router.add_route("*", "/graphql", IncrementalGraphQLView)
+    metrics = ClientMetrics()
+    client = GraphQLClient(
+        endpoint="/graphql", session=await aiohttp_client(app), metrics=metrics
+    )
+
+    async for _ in client.execute_incremental("query Todo { todo }", operation="Todo"):
+        pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"Todo": 1}
+    assert snapshot["request_duration"]["count"] == 1
+    assert snapshot["errors"] == ({"response": 1} if len(payloads) == 1 else {})
+    assert snapshot["bytes_received"]["http"] > 0
+
+
+async def test_batched_operations(aiohttp_client: AiohttpClient):
+    app = aiohttp.web.Application()
+    app.router.add_route("*", "/graphql", GraphQLView(schema=batching_schema))
+    metrics = ClientMetrics()
+    client = GraphQLClient(
+        endpoint="/graphql", session=await aiohttp_client(app), metrics=metrics
+    )
+
+    async with client.batch(max_size=10, window=0.05) as batch:
+        await asyncio.gather(
+            batch.execute(QUERY, operation="GetUsers"),
+            batch.execute("query { unknownField }"),
+        )
+        await batch.execute(QUERY, operation="GetUsers")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"GetUsers": 2, "": 1}
+    assert snapshot["request_duration"]["count"] == 3
+    assert snapshot["errors"] == {"response": 1}
+
+
+async def test_unbatched_operations(client: GraphQLClient, metrics: ClientMetrics):
+    async with client.batch(max_size=10, window=0.05) as batch:
+        await asyncio.gather(
+            batch.execute(QUERY, operation="GetUsers"),
+            batch.execute("query { unknownField }"),
+        )
+        await batch.execute(
+            "mutation($file: Upload!) { readFile(file: $file) }",
+            variables={"file": BytesIO(b"Hello")},
+        )
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"GetUsers": 1, "": 2}
+    assert snapshot["request_duration"]["count"] == 3
+    assert snapshot["errors"] == {"response": 1}
+
+
+@pytest.mark.parametrize("protocol", [GRAPHQL_WS, GRAPHQL_TRANSPORT_WS])
+async def test_subscriptions(
+    client: GraphQLClient, metrics: ClientMetrics, protocol: str
+):
+    query = "subscription Count { count(to: 3) }"
+
+    async with client.connect(protocol) as connection:
+        async for _ in connection.subscribe(query, operation="Count"):
+            snapshot = metrics.snapshot()
+            assert snapshot["active_subscriptions"] == 1
+            assert snapshot["subscriptions"][0]["operation"] == "Count"
+            assert snapshot["subscriptions"][0]["messages"] >= 1
+            assert snapshot["subscriptions"][0]["messages_per_second"] > 0
+
+        with pytest.raises(GraphQLWSOperationError):
+            async for _ in connection.subscribe("subscription { unknownField }"):
+                pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"Count": 1, "": 1}
+    assert snapshot["errors"] == {"operation": 1}
+    assert snapshot["active_subscriptions"] == 0
+    assert snapshot["subscriptions"] == []
+    assert snapshot["subscription_message_rate"]["count"] == 2
+    assert snapshot["bytes_sent"][protocol] > len(query)
+    assert snapshot["bytes_received"][protocol] > 0
+
+
+async def test_websocket_requests(client: GraphQLClient, metrics: ClientMetrics):
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        assert await connection.execute(QUERY, operation="GetUsers")
+        with pytest.raises(GraphQLWSOperationError):
+            await connection.execute("query { unknownField }")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {"GetUsers": 1, "": 1}
+    assert snapshot["errors"] == {"operation": 1}
+    assert snapshot["request_duration"]["count"] == 2
+    assert snapshot["subscription_message_rate"]["count"] == 0
+    assert snapshot["active_subscriptions"] == 0
+
+
+async def test_subscriptions_in_any_key_order(aiohttp_client: AiohttpClient):
+    app = aiohttp.web.Application()
+    app.router.add_route("GET", "/graphql", fake_server)
+    metrics = ClientMetrics()
+    client = GraphQLClient(
+        endpoint="/graphql", session=await aiohttp_client(app), metrics=metrics
+    )
+
+    async with client.connect() as connection:
+        async for _ in connection.subscribe("subscription"):
+            pass
+
+    assert metrics.snapshot()["subscription_message_rate"]["count"] == 1
+
+
+async def test_binary_messages(client: GraphQLClient, metrics: ClientMetrics):
+    async with client.connect() as connection:
+        async for _ in connection.subscribe("subscription { binaryMessage }"):
+            pass
+
+    assert metrics.snapshot()["bytes_received"][GRAPHQL_WS] > 2
+
+
+def test_histogram_buckets():
+    histogram = Histogram([1, 0.1, 10])
+    for value in (0.05, 0.1, 5, 50):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {
+        "buckets": {0.1: 2, 1: 2, 10: 3, float("inf"): 4},
+        "sum": 55.15,
+        "count": 4,
+    }
+
+
+def test_subscription_rate_without_elapsed_time():
+    meter = SubscriptionMeter("Count")
+    assert meter.rate(meter.started) == 0
+
+
+@pytest.mark.parametrize(
+    ("data", "size"), [("abc", 3), ("é", 2), (b"\xc3\xa9", 2), ("", 0)]
+)
+def test_encoded_size(data, size):
+    assert encoded_size(data) == size
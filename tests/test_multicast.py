@@ -0,0 +1,111 @@
+import asyncio
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import OVERFLOW_DROP_NEWEST
+from aiogqlc.errors import GraphQLWSOperationError
+from tests.helpers import (
+    COUNT_SUBSCRIPTION,
+    INFINITE_SUBSCRIPTION,
+    RecordingEncoder,
+    collect,
+)
+
+
+async def test_subscribers_share_an_operation(
+    recording_client: GraphQLClient, encoder: RecordingEncoder
+):
+    async with recording_client.connect(multicast=True) as connection:
+        results = await asyncio.gather(
+            *(collect(connection.subscribe(COUNT_SUBSCRIPTION)) for _ in range(3))
+        )
+
+    assert [[payload["data"]["count"] for payload in result] for result in results] == [
+        [1, 2, 3]
+    ] * 3
+    assert results[0][0] is results[1][0] is results[2][0]
+    assert encoder.types("start") == [("start", "1")]
+
+
+async def test_last_subscriber_stops_the_operation(
+    recording_client: GraphQLClient, encoder: RecordingEncoder
+):
+    async with recording_client.connect(multicast=True) as connection:
+        first = connection.subscribe(INFINITE_SUBSCRIPTION)
+        second = connection.subscribe(INFINITE_SUBSCRIPTION)
+        await first.__anext__()
+        await second.__anext__()
+
+        await first.aclose()
+        assert encoder.types("stop") == []
+        assert (await second.__anext__())["data"]["infinity"] == "and ever..."
+
+        await second.aclose()
+        assert encoder.types("start", "stop") == [("start", "1"), ("stop", "1")]
+
+        third = connection.subscribe(INFINITE_SUBSCRIPTION)
+        await third.__anext__()
+        await third.aclose()
+
+    assert encoder.types("start", "stop")[2:] == [("start", "2"), ("stop", "2")]
+
+
+async def test_operations_are_keyed_by_variables(
+    recording_client: GraphQLClient, encoder: RecordingEncoder
+):
+    query = "subscription ($to: Int!) { count(to: $to) }"
+
+    async with recording_client.connect() as connection:
+        results = await asyncio.gather(
+            collect(connection.subscribe(query, {"to": 1}, multicast=True)),
+            collect(connection.subscribe(query, {"to": 2}, multicast=True)),
+            collect(connection.subscribe(query, {"to": 2}, multicast=True)),
+            collect(connection.subscribe(query, {"to": 2})),
+        )
+
+    assert [len(result) for result in results] == [1, 2, 2, 2]
+    assert len(encoder.types("start")) == 3
+
+
+async def test_completed_operations_are_not_joined(
+    recording_client: GraphQLClient, encoder: RecordingEncoder
+):
+    query = "subscription { count(to: 1) }"
+
+    async with recording_client.connect(multicast=True) as connection:
+        first = connection.subscribe(query)
+        await first.__anext__()
+        await asyncio.sleep(0.05)
+
+        assert len(await collect(connection.subscribe(query))) == 1
+        assert await collect(first) == []
+
+    assert encoder.types("start") == [("start", "1"), ("start", "2")]
+
+
+async def test_errors_are_shared(recording_client: GraphQLClient):
+    async with recording_client.connect(multicast=True) as connection:
+        results = await asyncio.gather(
+            collect(connection.subscribe("subscription { unknownField }")),
+            collect(connection.subscribe("subscription { unknownField }")),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(result, GraphQLWSOperationError) for result in results)
+
+
+async def test_queue_stats(recording_client: GraphQLClient):
+    async with recording_client.connect(multicast=True) as connection:
+        first = connection.subscribe(
+            COUNT_SUBSCRIPTION, queue_size=1, overflow=OVERFLOW_DROP_NEWEST
+        )
+        second = connection.subscribe(COUNT_SUBSCRIPTION)
+        await first.__anext__()
+        await second.__anext__()
+        await asyncio.sleep(0.2)
+
+        assert connection.queue_stats() == {
+            "1": {"depth": 2, "max_depth": 2, "dropped": 1}
+        }
+
+        await first.aclose()
+        await second.aclose()
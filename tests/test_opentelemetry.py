@@ -0,0 +1,71 @@
+import aiohttp
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode  # noqa: E402
+
+from aiogqlc import GraphQLClient  # noqa: E402
+from aiogqlc.errors import GraphQLWSOperationError  # noqa: E402
+from aiogqlc.opentelemetry import OpenTelemetryInstrumentation  # noqa: E402
+
+
+@pytest.fixture
+def exporter() -> InMemorySpanExporter:
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def client(graphql_session: aiohttp.ClientSession, exporter: InMemorySpanExporter):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    instrumentation = OpenTelemetryInstrumentation(provider.get_tracer("test"))
+    return GraphQLClient(
+        endpoint="/graphql", session=graphql_session, instrumentation=instrumentation
+    )
+
+
+async def test_http_operation_spans(
+    client: GraphQLClient, exporter: InMemorySpanExporter
+):
+    await client.execute("query GetUsers { users { id } }", operation="GetUsers")
+
+    *phases, span = exporter.get_finished_spans()
+    assert span.name == "query GetUsers"
+    assert span.attributes is not None
+    assert span.attributes["graphql.operation.type"] == "query"
+    assert span.attributes["graphql.operation.name"] == "GetUsers"
+    assert span.attributes["aiogqlc.transport"] == "http"
+    assert [phase.name for phase in phases] == [
+        "serialize",
+        "request",
+        "read",
+    ]
+    assert all(phase.parent == span.context for phase in phases)
+
+
+async def test_subscription_spans(
+    client: GraphQLClient, exporter: InMemorySpanExporter
+):
+    async with client.connect() as connection:
+        async for _ in connection.subscribe("subscription { count(to: 2) }"):
+            pass
+        with pytest.raises(GraphQLWSOperationError):
+            async for _ in connection.subscribe("subscription { unknownField }"):
+                pass
+
+    spans = [span for span in exporter.get_finished_spans() if span.parent is None]
+    assert [span.name for span in spans] == ["subscription", "subscription"]
+    assert spans[0].attributes is not None
+    assert spans[0].attributes["aiogqlc.messages"] == 2
+    assert spans[0].attributes["aiogqlc.operation_id"] == "1"
+    assert spans[1].status.status_code == StatusCode.ERROR
+
+
+def test_default_tracer():
+    assert OpenTelemetryInstrumentation().tracer is not None
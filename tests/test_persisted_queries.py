@@ -0,0 +1,167 @@
+import hashlib
+import json
+
+import aiohttp.web
+import pytest
+
+from aiogqlc import GraphQLClient
+from aiogqlc.utils import get_persisted_query_error, hash_query
+from tests.helpers import CountingDecoder
+
+QUERY = "query ($id: ID) { ping }"
+QUERY_HASH = hashlib.sha256(QUERY.encode()).hexdigest()
+
+
+class PersistedQueryGraphQLView(aiohttp.web.View):
+    async def get(self):
+        payload = dict(self.request.query)
+        for key in ("variables", "extensions"):
+            if key in payload:
+                payload[key] = json.loads(payload[key])
+        return self.respond(payload)
+
+    async def post(self):
+        return self.respond(await self.request.json())
+
+    def respond(self, payload):
+        app = self.request.app
+        app["requests"].append((self.request.method, payload))
+
+        if not app["config"]["supported"] and "query" not in payload:
+            errors = [{"message": "PersistedQueryNotSupported"}]
+            return aiohttp.web.json_response({"errors": errors})
+
+        query_hash = payload["extensions"]["persistedQuery"]["sha256Hash"]
+
+        if "query" in payload:
+            app["queries"][query_hash] = payload["query"]
+
+        if query_hash not in app["queries"]:
+            error = {
+                "message": "Not found",
+                "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+            }
+            return aiohttp.web.json_response({"errors": [error]})
+
+        variables = payload.get("variables")
+        return aiohttp.web.json_response({"data": {"variables": variables}})
+
+
+@pytest.fixture
+async def app():
+    app = aiohttp.web.Application()
+    app["requests"] = []
+    app["queries"] = {}
+    app["config"] = {"supported": True}
+    app.router.add_route("*", "/graphql", PersistedQueryGraphQLView)
+    return app
+
+
+@pytest.fixture
+async def graphql_session(aiohttp_client, app):
+    return await aiohttp_client(app)
+
+
+async def test_hash_is_sent_instead_of_the_query(graphql_session, app):
+    client = GraphQLClient(
+        endpoint="/graphql", session=graphql_session, persisted_queries=True
+    )
+
+    response = await client.execute(QUERY, variables={"id": "1"})
+    assert await response.json() == {"data": {"variables": {"id": "1"}}}
+
+    response = await client.execute(QUERY, variables={"id": "2"})
+    assert await response.json() == {"data": {"variables": {"id": "2"}}}
+
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": QUERY_HASH}}
+    assert app["requests"] == [
+        ("POST", {"variables": {"id": "1"}, "extensions": extensions}),
+        (
+            "POST",
+            {"query": QUERY, "variables": {"id": "1"}, "extensions": extensions},
+        ),
+        ("POST", {"variables": {"id": "2"}, "extensions": extensions}),
+    ]
+
+
+async def test_hashed_queries_can_be_sent_using_get(graphql_session, app):
+    client = GraphQLClient(
+        endpoint="/graphql",
+        session=graphql_session,
+        persisted_queries=True,
+        persisted_queries_get=True,
+    )
+
+    query = "query Ping($id: ID) { ping }"
+    await client.execute(query, variables={"id": "1"}, operation="Ping")
+    await client.execute(query, variables={"id": "1"}, params={"extra": "1"})
+
+    methods = [method for method, _ in app["requests"]]
+    assert methods == ["GET", "POST", "GET"]
+    assert app["requests"][0][1]["operationName"] == "Ping"
+    assert app["requests"][0][1]["variables"] == {"id": "1"}
+    assert app["requests"][2][1]["extra"] == "1"
+
+
+async def test_mutations_are_never_sent_using_get(graphql_session, app):
+    client = GraphQLClient(
+        endpoint="/graphql",
+        session=graphql_session,
+        persisted_queries=True,
+        persisted_queries_get=True,
+    )
+
+    await client.execute("mutation { ping }")
+
+    methods = [method for method, _ in app["requests"]]
+    assert methods == ["POST", "POST"]
+
+
+async def test_unsupported_persisted_queries_are_disabled(graphql_session, app):
+    app["config"]["supported"] = False
+    client = GraphQLClient(
+        endpoint="/graphql", session=graphql_session, persisted_queries=True
+    )
+
+    response = await client.execute(QUERY)
+    assert await response.json() == {"data": {"variables": None}}
+    assert not client.persisted_queries
+
+    await client.execute(QUERY)
+    assert "extensions" not in app["requests"][-1][1]
+    assert len(app["requests"]) == 3
+
+
+def test_query_hashes_are_memoized():
+    hash_query.cache_clear()
+    assert hash_query(QUERY) == QUERY_HASH
+    assert hash_query(QUERY) == QUERY_HASH
+    assert hash_query.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    ("body", "expectation"),
+    [
+        (b'{"data": {"a": 1}}', None),
+        (
+            b'{"errors": [{"message": "PersistedQueryNotFound"}]}',
+            "PersistedQueryNotFound",
+        ),
+        (b"PersistedQueryNotFound", None),
+        (b'["PersistedQueryNotFound"]', None),
+        (b'{"errors": ["PersistedQueryNotFound"]}', None),
+        (b'{"errors": [{"message": "PersistedQueryNotFoundX"}]}', None),
+    ],
+)
+def test_get_persisted_query_error(body, expectation):
+    assert get_persisted_query_error(body) == expectation
+
+
+def test_persisted_query_errors_are_decoded_only_when_likely():
+    decoder = CountingDecoder()
+    body = b'{"errors": [{"extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}}]}'
+
+    assert get_persisted_query_error(b'{"data": {"a": 1}}', decoder) is None
+    assert decoder.calls == 0
+    assert get_persisted_query_error(body, decoder) == "PersistedQueryNotFound"
+    assert decoder.calls == 1
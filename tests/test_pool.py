@@ -0,0 +1,151 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS, GRAPHQL_WS
+from aiogqlc.pool import GraphQLWSPool
+from aiogqlc.reconnect import ReconnectPolicy
+
+QUERY = "subscription { count(to: 3, interval: 0.05) }"
+
+
+async def collect(pool: GraphQLWSPool, query: str = QUERY) -> list[int]:
+    return [payload["data"]["count"] async for payload in pool.subscribe(query)]
+
+
+async def test_subscriptions_are_spread_across_connections(
+    graphql_session: aiohttp.ClientSession,
+):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.pool(max_connections=2) as pool:
+        tasks = [asyncio.create_task(collect(pool)) for _ in range(5)]
+        while sum(pool.active_operations.values()) < 5:
+            await asyncio.sleep(0.01)
+
+        assert len(pool) == 2
+        assert sum(pool.active_operations.values()) == 5
+        assert min(pool.active_operations.values()) >= 1
+
+        results = await asyncio.gather(*tasks)
+
+    assert results == [[1, 2, 3]] * 5
+    assert len(pool) == 0
+
+
+async def test_connections_are_opened_lazily(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.pool(GRAPHQL_TRANSPORT_WS, max_connections=4) as pool:
+        assert len(pool) == 0
+
+        assert await collect(pool) == [1, 2, 3]
+        assert await collect(pool) == [1, 2, 3]
+
+        assert len(pool) == 1
+        assert list(pool.active_operations.values()) == [0]
+
+
+async def test_idle_connections_are_closed(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.pool(max_connections=2, idle_timeout=0.05) as pool:
+        await asyncio.gather(collect(pool), collect(pool))
+        assert len(pool) == 2
+
+        task = asyncio.create_task(collect(pool))
+        await asyncio.sleep(0.1)
+        assert len(pool) == 1
+
+        assert await task == [1, 2, 3]
+        await asyncio.sleep(0.1)
+        assert len(pool) == 0
+
+        assert await collect(pool, "subscription { count(to: 1) }") == [1]
+
+
+async def test_closing_the_pool_with_active_subscriptions(
+    graphql_session: aiohttp.ClientSession,
+):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+    pool = client.pool(idle_timeout=None)
+
+    subscription = pool.subscribe("subscription { count(to: 3, interval: 1) }")
+    assert (await subscription.__anext__())["data"]["count"] == 1
+
+    await pool.aclose()
+    await subscription.aclose()
+
+    assert len(pool) == 0
+
+
+async def single_operation_server(request: web.Request) -> web.WebSocketResponse:
+    request.app["connections"].append(request)
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_WS])
+    await ws.prepare(request)
+    await ws.receive_json()
+    await ws.send_json({"type": "connection_ack"})
+
+    # The connection is dropped after its first operation
+    message = await ws.receive_json()
+    await ws.send_json({"type": "data", "id": message["id"], "payload": {"data": 1}})
+    await ws.send_json({"type": "complete", "id": message["id"]})
+    await ws.close()
+    return ws
+
+
+@pytest.fixture
+async def single_operation_client(aiohttp_client: AiohttpClient):
+    app = web.Application()
+    app["connections"] = []
+    app.router.add_route("GET", "/graphql", single_operation_server)
+    session = await aiohttp_client(app)
+    return GraphQLClient(endpoint="/graphql", session=session)
+
+
+async def subscribe(pool: GraphQLWSPool) -> list[object]:
+    return [payload async for payload in pool.subscribe("subscription")]
+
+
+async def test_closed_connections_are_replaced(single_operation_client: GraphQLClient):
+    async with single_operation_client.pool(max_connections=1) as pool:
+        assert await subscribe(pool) == [{"data": 1}]
+        (connection,) = pool.active_operations
+        await asyncio.wait([connection._connection_handler_task])
+        assert connection.closed
+
+        assert await subscribe(pool) == [{"data": 1}]
+        assert connection not in pool.active_operations
+        assert len(pool) == 1
+
+    session = single_operation_client.session
+    assert isinstance(session, aiohttp.test_utils.TestClient)
+    assert len(session.app["connections"]) == 2
+
+
+async def test_reconnecting_connections_are_skipped(
+    single_operation_client: GraphQLClient,
+):
+    policy = ReconnectPolicy(initial_delay=60, max_delay=60)
+    async with single_operation_client.pool(
+        max_connections=1, reconnect=policy
+    ) as pool:
+        assert await subscribe(pool) == [{"data": 1}]
+        (connection,) = pool.active_operations
+        while connection.connected:
+            await asyncio.sleep(0.01)
+        assert not connection.closed
+
+        assert await subscribe(pool) == [{"data": 1}]
+        assert len(pool) == 2
+
+
+def test_invalid_max_connections(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    with pytest.raises(ValueError):
+        client.pool(max_connections=0)
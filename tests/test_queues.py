@@ -0,0 +1,214 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import (
+    OVERFLOW_BLOCK,
+    OVERFLOW_CONFLATE,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_ERROR,
+)
+from aiogqlc.errors import GraphQLWSQueueOverflowError
+from aiogqlc.queues import OperationBroadcast, OperationQueue
+from aiogqlc.types import OperationMessage
+
+QUERY = "subscription { count(to: 5) }"
+
+
+def data(value: int) -> OperationMessage:
+    return {"type": "data", "id": "1", "payload": {"data": value}}
+
+
+COMPLETE: OperationMessage = {"type": "complete", "id": "1"}
+
+
+async def drain(queue: OperationQueue) -> list[object]:
+    messages = []
+    while len(queue):
+        message = await queue.get()
+        if message["type"] == "data":
+            messages.append(message["payload"]["data"])
+        else:
+            messages.append(message["type"])
+    return messages
+
+
+async def fill(queue: OperationQueue) -> None:
+    for value in range(1, 5):
+        await queue.put(data(value))
+    await queue.put(COMPLETE)
+
+
+@pytest.mark.parametrize(
+    ("overflow", "expectation", "dropped"),
+    [
+        (OVERFLOW_DROP_OLDEST, [3, 4, "complete"], 2),
+        (OVERFLOW_DROP_NEWEST, [1, 2, "complete"], 2),
+        (OVERFLOW_CONFLATE, [3, 4, "complete"], 2),
+    ],
+)
+async def test_overflow_policies(overflow, expectation, dropped):
+    queue = OperationQueue(max_size=2, overflow=overflow)
+
+    await fill(queue)
+
+    assert queue.stats() == {"depth": 3, "max_depth": 3, "dropped": dropped}
+    assert await drain(queue) == expectation
+
+
+async def test_conflating_keeps_only_the_latest_message():
+    queue = OperationQueue(max_size=1, overflow=OVERFLOW_CONFLATE)
+
+    await fill(queue)
+
+    assert await drain(queue) == [4, "complete"]
+    assert queue.dropped == 3
+
+
+async def test_blocking_waits_for_the_consumer():
+    queue = OperationQueue(max_size=1, overflow=OVERFLOW_BLOCK)
+
+    producer = asyncio.create_task(fill(queue))
+    await asyncio.sleep(0.01)
+    assert queue.stats() == {"depth": 1, "max_depth": 1, "dropped": 0}
+    assert not producer.done()
+
+    messages = [await queue.get() for _ in range(5)]
+    await producer
+
+    assert [message["type"] for message in messages] == ["data"] * 4 + ["complete"]
+
+
+async def test_closing_releases_blocked_producers():
+    queue = OperationQueue(max_size=1, overflow=OVERFLOW_BLOCK)
+
+    producer = asyncio.create_task(fill(queue))
+    await asyncio.sleep(0.01)
+    await queue.close()
+    await producer
+
+    assert len(queue) == 0
+    await queue.put(data(1))
+    assert len(queue) == 0
+
+
+async def test_closing_a_broadcast_closes_its_subscribers():
+    broadcast = OperationBroadcast()
+    queues = [broadcast.subscribe(), broadcast.subscribe()]
+
+    await broadcast.close()
+    await broadcast.put(data(1))
+
+    assert [len(queue) for queue in queues] == [0, 0]
+
+
+async def test_overflowing_raises_an_error():
+    queue = OperationQueue(max_size=2, overflow=OVERFLOW_ERROR)
+
+    await fill(queue)
+
+    with pytest.raises(GraphQLWSQueueOverflowError) as exc_info:
+        await queue.get()
+
+    assert exc_info.value.max_size == 2
+    assert queue.stats() == {"depth": 0, "max_depth": 2, "dropped": 3}
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        OperationQueue(max_size=-1)
+    with pytest.raises(ValueError):
+        OperationQueue(overflow="explode")
+
+
+async def test_slow_subscribers_drop_messages(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(
+        queue_size=2, overflow=OVERFLOW_DROP_NEWEST
+    ) as connection:
+        subscription = connection.subscribe(QUERY)
+        values = [(await subscription.__anext__())["data"]["count"]]
+        await asyncio.sleep(0.1)
+
+        assert connection.queue_stats() == {
+            "1": {"depth": 3, "max_depth": 3, "dropped": 2}
+        }
+
+        async for payload in subscription:
+            values.append(payload["data"]["count"])
+
+    assert values == [1, 2, 3]
+
+
+async def test_per_subscription_limits(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(queue_size=2) as connection:
+        subscription = connection.subscribe(
+            QUERY, queue_size=1, overflow=OVERFLOW_ERROR
+        )
+        await subscription.__anext__()
+        await asyncio.sleep(0.1)
+
+        with pytest.raises(GraphQLWSQueueOverflowError):
+            await subscription.__anext__()
+
+        values = [
+            payload["data"]["count"] async for payload in connection.subscribe(QUERY)
+        ]
+
+    assert values == [1, 2, 3, 4, 5]
+
+
+async def test_getting_batches():
+    queue = OperationQueue()
+    await fill(queue)
+
+    batch = await queue.get_batch(3, max_latency=10)
+    assert [message["type"] for message in batch] == ["data"] * 3
+
+    # A terminal message completes the batch without waiting
+    batch = await queue.get_batch(3, max_latency=10)
+    assert [message["type"] for message in batch] == ["data", "complete"]
+
+
+async def test_getting_batches_after_an_error():
+    queue = OperationQueue()
+    await queue.put(data(1))
+    await queue.fail(ValueError())
+
+    assert len(await queue.get_batch(10)) == 1
+    with pytest.raises(ValueError):
+        await queue.get_batch(10)
+    with pytest.raises(ValueError):
+        await queue.get_batch(0)
+
+
+async def test_overflowing_while_waiting_for_a_batch():
+    queue = OperationQueue(max_size=2, overflow=OVERFLOW_ERROR)
+    await queue.put(data(1))
+
+    batch = asyncio.create_task(queue.get_batch(10, max_latency=10))
+    await asyncio.sleep(0)
+    for value in (2, 3):
+        await queue.put(data(value))
+
+    with pytest.raises(GraphQLWSQueueOverflowError):
+        await batch
+
+
+async def test_cancelled_consumers_stop_waiting():
+    queue = OperationQueue()
+
+    consumer = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    consumer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+
+    await queue.put(data(1))
+    assert await drain(queue) == [1]
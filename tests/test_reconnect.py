@@ -0,0 +1,268 @@
+import asyncio
+import json
+from typing import Any
+
+import aiohttp
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_WS
+from aiogqlc.errors import GraphQLWSConnectionClosedError
+from aiogqlc.reconnect import ReconnectPolicy
+
+QUERY = "subscription { count }"
+
+
+async def fake_server(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_WS])
+    await ws.prepare(request)
+    config = request.app["config"]
+    config["connections"] += 1
+    connection = config["connections"]
+
+    await ws.receive_json()
+
+    if connection in config["close"]:
+        await ws.close(code=4400, message=b"Bad request")
+        return ws
+
+    if connection in config["reject"]:
+        await ws.send_json({"type": "connection_error", "payload": {}})
+        await ws.close()
+        return ws
+
+    await ws.send_json({"type": "connection_ack"})
+
+    async for ws_message in ws:
+        message = json.loads(ws_message.data)
+        if message["type"] == "connection_terminate":
+            break
+        if message["type"] != "start":
+            continue
+
+        request.app["started"].append((connection, message["id"]))
+        if connection in config["malformed"]:
+            await ws.send_str("not json")
+            continue
+
+        await ws.send_json(
+            {"type": "data", "id": message["id"], "payload": {"data": connection}}
+        )
+
+        if connection in config["drop"]:
+            await ws.close(code=1011)
+            break
+
+        await ws.send_json({"type": "complete", "id": message["id"]})
+
+    return ws
+
+
+@pytest.fixture
+async def app():
+    app = web.Application()
+    app["config"] = {
+        "connections": 0,
+        "drop": {1},
+        "reject": set(),
+        "close": set(),
+        "malformed": set(),
+    }
+    app["started"] = []
+    app.router.add_route("GET", "/graphql", fake_server)
+    return app
+
+
+@pytest.fixture
+async def client(aiohttp_client: AiohttpClient, app: web.Application):
+    session = await aiohttp_client(app)
+    return GraphQLClient(endpoint="/graphql", session=session)
+
+
+async def collect(connection) -> list[int]:
+    return [payload["data"] async for payload in connection.subscribe(QUERY)]
+
+
+async def test_operations_are_resumed(client: GraphQLClient, app: web.Application):
+    events: list[object] = []
+
+    async with client.connect(
+        reconnect=ReconnectPolicy(initial_delay=0),
+        on_disconnect=lambda code: events.append(("disconnect", code)),
+        on_reconnect=lambda attempts, ids: events.append(("reconnect", attempts, ids)),
+    ) as connection:
+        assert await collect(connection) == [1, 2]
+
+    assert app["started"] == [(1, "1"), (2, "1")]
+    assert events == [("disconnect", 1011), ("reconnect", 1, ["1"])]
+
+
+async def test_failed_attempts_are_retried(client: GraphQLClient, app: web.Application):
+    app["config"]["reject"] = {2}
+    app["config"]["close"] = {3}
+    attempts: list[int] = []
+
+    async def on_reconnect(attempt: int, operation_ids: list[str]) -> None:
+        attempts.append(attempt)
+
+    async with client.connect(
+        reconnect=ReconnectPolicy(initial_delay=0), on_reconnect=on_reconnect
+    ) as connection:
+        assert await collect(connection) == [1, 4]
+
+    assert attempts == [3]
+
+
+async def test_giving_up(client: GraphQLClient, app: web.Application):
+    app["config"]["reject"] = {2}
+
+    async with client.connect(
+        reconnect=ReconnectPolicy(initial_delay=0, max_attempts=1)
+    ) as connection:
+        subscription = connection.subscribe(QUERY)
+        assert (await subscription.__anext__())["data"] == 1
+
+        with pytest.raises(GraphQLWSConnectionClosedError):
+            await subscription.__anext__()
+
+
+async def test_without_reconnecting(client: GraphQLClient):
+    async with client.connect() as connection:
+        subscription = connection.subscribe(QUERY)
+        assert (await subscription.__anext__())["data"] == 1
+
+        with pytest.raises(GraphQLWSConnectionClosedError) as exc_info:
+            await subscription.__anext__()
+
+    assert exc_info.value.code == 1011
+
+
+async def test_shared_subscriptions_fail(client: GraphQLClient):
+    async with client.connect(multicast=True) as connection:
+        results = await asyncio.gather(
+            collect(connection), collect(connection), return_exceptions=True
+        )
+
+    assert all(isinstance(result, GraphQLWSConnectionClosedError) for result in results)
+
+
+async def test_closing_while_reconnecting(client: GraphQLClient):
+    disconnected = asyncio.Event()
+
+    async with client.connect(
+        reconnect=True, on_disconnect=lambda code: disconnected.set()
+    ) as connection:
+        subscription = connection.subscribe(QUERY)
+        await subscription.__anext__()
+        await disconnected.wait()
+
+    await subscription.aclose()
+
+
+async def test_failing_hooks_are_reported(client: GraphQLClient, app: web.Application):
+    loop = asyncio.get_running_loop()
+    reported: list[BaseException] = []
+    loop.set_exception_handler(
+        lambda loop, context: reported.append(context["exception"])
+    )
+
+    def on_disconnect(code: int) -> None:
+        raise RuntimeError("disconnect")
+
+    async def on_reconnect(attempt: int, operation_ids: list[str]) -> None:
+        raise RuntimeError("reconnect")
+
+    try:
+        async with client.connect(
+            reconnect=ReconnectPolicy(initial_delay=0),
+            on_disconnect=on_disconnect,
+            on_reconnect=on_reconnect,
+        ) as connection:
+            assert await collect(connection) == [1, 2]
+    finally:
+        loop.set_exception_handler(None)
+
+    assert [str(exc) for exc in reported] == ["disconnect", "reconnect"]
+
+
+async def test_failed_restarts_are_retried(
+    aiohttp_client: AiohttpClient, app: web.Application
+):
+    starts: list[object] = []
+
+    def json_dumps(obj: Any) -> str:
+        if obj["type"] == "start":
+            starts.append(obj)
+            if len(starts) == 2:
+                raise ConnectionResetError
+        return json.dumps(obj)
+
+    session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=session, json_dumps=json_dumps)
+
+    async with client.connect(reconnect=ReconnectPolicy(initial_delay=0)) as connection:
+        assert await collect(connection) == [1, 3]
+
+    assert app["started"] == [(1, "1"), (3, "1")]
+
+
+async def test_operations_fail_when_messages_cannot_be_handled(
+    client: GraphQLClient, app: web.Application
+):
+    app["config"]["malformed"] = {1}
+
+    async with client.connect(reconnect=True) as connection:
+        with pytest.raises(ValueError):
+            await collect(connection)
+
+    assert connection.closed
+
+
+async def test_connection_closed_on_init(client: GraphQLClient, app: web.Application):
+    app["config"]["close"] = {1}
+
+    with pytest.raises(GraphQLWSConnectionClosedError) as exc_info:
+        async with client.connect():
+            pass
+
+    assert exc_info.value.code == 4400
+    assert exc_info.value.reason == "Bad request"
+
+
+async def test_default_reconnect_policy(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(reconnect=True) as connection:
+        assert [
+            payload["data"]["count"]
+            async for payload in connection.subscribe("subscription { count(to: 2) }")
+        ] == [1, 2]
+
+
+def test_backoff_delays():
+    policy = ReconnectPolicy(initial_delay=1, max_delay=5, jitter=0.5, max_attempts=4)
+
+    assert 0.5 <= policy.delay(1) <= 1
+    assert 1 <= policy.delay(2) <= 2
+    assert 2.5 <= policy.delay(4) <= 5
+    assert 2.5 <= policy.delay(10_000) <= 5
+    assert policy.can_retry(4)
+    assert not policy.can_retry(5)
+    assert ReconnectPolicy(jitter=0).delay(3) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"initial_delay": -1},
+        {"initial_delay": 10, "max_delay": 1},
+        {"factor": 0.5},
+        {"jitter": 2},
+        {"max_attempts": 0},
+    ],
+)
+def test_invalid_policies(kwargs):
+    with pytest.raises(ValueError):
+        ReconnectPolicy(**kwargs)
@@ -0,0 +1,115 @@
+import asyncio
+
+import aiohttp
+import aiohttp.web
+import pytest
+
+from aiogqlc import GraphQLClient
+from aiogqlc.cache import ResponseCache
+from aiogqlc.result import GraphQLResult
+from tests.helpers import CountingDecoder
+
+
+class ExtensionsGraphQLView(aiohttp.web.View):
+    async def post(self):
+        await asyncio.sleep(0.01)
+        return aiohttp.web.json_response(
+            {
+                "data": {"ping": "pong"},
+                "errors": [{"message": "Partial failure"}],
+                "extensions": {"cost": 1},
+            }
+        )
+
+
+@pytest.fixture
+async def extensions_session(aiohttp_client):
+    app = aiohttp.web.Application()
+    app.router.add_route("*", "/graphql", ExtensionsGraphQLView)
+    return await aiohttp_client(app)
+
+
+async def test_execute_result(graphql_session: aiohttp.ClientSession):
+    query = """
+        query {
+            todo(id: 1) {
+                title
+            }
+        }
+    """
+
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+    result = await client.execute_result(query)
+
+    assert result.data == {"todo": {"title": "Buy groceries"}}
+    assert result.errors is None
+    assert result.extensions is None
+    assert result.response is not None
+    assert result.response.status == 200
+
+
+async def test_errors_and_extensions(extensions_session):
+    client = GraphQLClient(endpoint="/graphql", session=extensions_session)
+    result = await client.execute_result("query { ping }")
+
+    assert result.data == {"ping": "pong"}
+    assert result.errors == [{"message": "Partial failure"}]
+    assert result.extensions == {"cost": 1}
+
+
+async def test_body_is_decoded_lazily_and_once(extensions_session):
+    decoder = CountingDecoder()
+    client = GraphQLClient(
+        endpoint="/graphql", session=extensions_session, json_loads=decoder
+    )
+    result = await client.execute_result("query { ping }")
+
+    assert decoder.calls == 0
+    assert result.data == {"ping": "pong"}
+    assert result.errors == [{"message": "Partial failure"}]
+    assert result.extensions == {"cost": 1}
+    assert decoder.calls == 1
+
+
+async def test_shared_responses_share_one_result(extensions_session):
+    decoder = CountingDecoder()
+    client = GraphQLClient(
+        endpoint="/graphql",
+        session=extensions_session,
+        json_loads=decoder,
+        deduplicate=True,
+        cache=ResponseCache(),
+    )
+
+    results = await asyncio.gather(
+        *(client.execute_result("query { ping }") for _ in range(5))
+    )
+    # Responses with errors are not cached, but still decoded once
+    results.append(await client.execute_result("query { ping }"))
+
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] is not results[0]
+    assert [result.data for result in results] == [{"ping": "pong"}] * 6
+    assert decoder.calls == 2
+
+
+async def test_results_keep_the_raw_body(aiohttp_client):
+    app = aiohttp.web.Application()
+    app.router.add_route("*", "/graphql", ExtensionsGraphQLView)
+    # Responses release their connection, even though their body is kept
+    session = await aiohttp_client(app, connector=aiohttp.TCPConnector(limit=1))
+    client = GraphQLClient(endpoint="/graphql", session=session)
+
+    for _ in range(3):
+        result = await client.execute_result("query { ping }")
+        assert isinstance(result.body, bytes)
+        assert result.data == {"ping": "pong"}
+
+
+def test_result_from_bytes():
+    result = GraphQLResult(b'{"data": {"a": 1}}')
+
+    assert result.body == b'{"data": {"a": 1}}'
+    assert result.data == {"a": 1}
+    assert result.response is None
+    assert repr(result) == "<GraphQLResult {'data': {'a': 1}}>"
@@ -0,0 +1,82 @@
+import json
+from io import BytesIO
+from typing import Any, Union
+
+import aiohttp
+
+from aiogqlc import GraphQLClient
+from tests.helpers import CountingDecoder
+
+
+class CountingEncoder:
+    def __init__(self, as_bytes: bool = False) -> None:
+        self.as_bytes = as_bytes
+        self.calls = 0
+
+    def __call__(self, obj: Any) -> Union[str, bytes]:
+        self.calls += 1
+        encoded = json.dumps(obj)
+        return encoded.encode() if self.as_bytes else encoded
+
+
+async def test_queries_use_the_configured_encoder(
+    graphql_session: aiohttp.ClientSession,
+):
+    encoder = CountingEncoder(as_bytes=True)
+    client = GraphQLClient(
+        endpoint="/graphql", session=graphql_session, json_dumps=encoder
+    )
+
+    response = await client.execute(
+        "query ($id: ID!) { todo(id: $id) { title } }", variables={"id": "1"}
+    )
+
+    assert response.headers["Content-Type"].startswith("application/json")
+    assert await response.json() == {"data": {"todo": {"title": "Buy groceries"}}}
+    assert encoder.calls == 1
+
+
+async def test_uploads_use_the_configured_encoder(
+    graphql_session: aiohttp.ClientSession,
+):
+    encoder = CountingEncoder(as_bytes=True)
+    client = GraphQLClient(
+        endpoint="/graphql", session=graphql_session, json_dumps=encoder
+    )
+
+    query = """
+        mutation($file: Upload!) {
+            readFile(file: $file)
+        }
+    """
+    response = await client.execute(
+        query, variables={"file": BytesIO(b"Hello, World!")}
+    )
+
+    assert await response.json() == {"data": {"readFile": "Hello, World!"}}
+    assert encoder.calls == 2
+
+
+async def test_subscriptions_use_the_configured_serializer(
+    graphql_session: aiohttp.ClientSession,
+):
+    encoder = CountingEncoder(as_bytes=True)
+    decoder = CountingDecoder()
+    client = GraphQLClient(
+        endpoint="/graphql",
+        session=graphql_session,
+        json_dumps=encoder,
+        json_loads=decoder,
+    )
+
+    data: list[int] = []
+
+    async with client.connect() as connection:
+        async for payload in connection.subscribe("subscription { count(to: 3) }"):
+            data.append(payload["data"]["count"])
+
+    assert data == [1, 2, 3]
+    # connection_init, start and connection_terminate, but no stop once completed
+    assert encoder.calls == 3
+    # connection_ack, three data messages, complete and any keep-alives
+    assert decoder.calls >= 5
@@ -0,0 +1,338 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import CACHE_AND_NETWORK, NETWORK_ONLY
+from aiogqlc.store import EntityStore, Reference
+from tests.app import create_app
+
+TODO_QUERY = """
+    query ($id: ID!) {
+        todo(id: $id) {
+            __typename
+            id
+            title
+            creator {
+                __typename
+                id
+                name
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+async def app() -> web.Application:
+    app = create_app()
+    app["requests"] = []
+
+    @web.middleware
+    async def middleware(request: web.Request, handler):
+        request.app["requests"].append(request)
+        return await handler(request)
+
+    app.middlewares.append(middleware)
+    return app
+
+
+@pytest.fixture
+async def graphql_client(aiohttp_client: AiohttpClient, app: web.Application):
+    graphql_session = await aiohttp_client(app)
+    return GraphQLClient(
+        endpoint="/graphql", session=graphql_session, store=EntityStore()
+    )
+
+
+async def test_cache_first_serves_queries_from_the_store(graphql_client, app):
+    first = await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+    second = await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+
+    assert (
+        first
+        == second
+        == {
+            "data": {
+                "todo": {
+                    "__typename": "Todo",
+                    "id": "1",
+                    "title": "Buy groceries",
+                    "creator": {"__typename": "User", "id": "1", "name": "Bill"},
+                }
+            }
+        }
+    )
+    assert len(app["requests"]) == 1
+
+
+async def test_queries_for_cached_fields_of_other_queries(graphql_client, app):
+    await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+
+    query = """
+        query {
+            user(id: 1) {
+                name
+            }
+        }
+    """
+    await graphql_client.fetch(query)
+
+    query = """
+        query ($id: ID!) {
+            aliased: todo(id: $id) {
+                ... on Todo {
+                    creator {
+                        ...UserFields
+                    }
+                }
+            }
+        }
+
+        fragment UserFields on User {
+            name
+        }
+    """
+    result = await graphql_client.fetch(query, variables={"id": "1"})
+
+    assert result == {"data": {"aliased": {"creator": {"name": "Bill"}}}}
+    assert len(app["requests"]) == 2
+
+
+async def test_cache_misses_hit_the_network(graphql_client, app):
+    await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+    await graphql_client.fetch(TODO_QUERY, variables={"id": "2"})
+
+    query = """
+        query ($id: ID!) {
+            todo(id: $id) {
+                priority
+            }
+        }
+    """
+    result = await graphql_client.fetch(query, variables={"id": "1"})
+
+    assert result == {"data": {"todo": {"priority": 1}}}
+    assert len(app["requests"]) == 3
+
+
+async def test_network_only_always_hits_the_network(graphql_client, app):
+    await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+    await graphql_client.fetch(
+        TODO_QUERY, variables={"id": "1"}, fetch_policy=NETWORK_ONLY
+    )
+
+    assert len(app["requests"]) == 2
+
+
+async def test_cache_and_network_refreshes_in_the_background(graphql_client, app):
+    await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+
+    store: EntityStore = graphql_client.store
+    entity = store.get_entity("User:1")
+    assert entity is not None
+    entity["name"] = "Outdated"
+
+    result = await graphql_client.fetch(
+        TODO_QUERY, variables={"id": "1"}, fetch_policy=CACHE_AND_NETWORK
+    )
+    assert result["data"]["todo"]["creator"]["name"] == "Outdated"
+
+    await asyncio.gather(*graphql_client._background_tasks)
+
+    result = await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+    assert result["data"]["todo"]["creator"]["name"] == "Bill"
+    assert len(app["requests"]) == 2
+
+
+async def test_cache_and_network_fetches_on_cache_misses(graphql_client, app):
+    result = await graphql_client.fetch(
+        TODO_QUERY, variables={"id": "1"}, fetch_policy=CACHE_AND_NETWORK
+    )
+
+    assert result["data"]["todo"]["title"] == "Buy groceries"
+    assert len(app["requests"]) == 1
+
+
+async def test_mutation_results_update_cached_entities(graphql_client, app):
+    await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+
+    mutation = """
+        mutation {
+            fakeUser(id: 1, name: "William") {
+                __typename
+                id
+                name
+            }
+        }
+    """
+    await graphql_client.fetch(mutation)
+
+    result = await graphql_client.fetch(TODO_QUERY, variables={"id": "1"})
+    assert result["data"]["todo"]["creator"]["name"] == "William"
+    assert "ROOT_MUTATION" not in graphql_client.store
+    assert len(app["requests"]) == 2
+
+
+async def test_results_with_errors_are_not_stored(graphql_client, app):
+    query = "query { todo(id: 1) { id } todos { unknownField } }"
+    result = await graphql_client.fetch(query)
+
+    assert "errors" in result
+    assert len(graphql_client.store) == 0
+
+
+async def test_fetch_without_store(aiohttp_client: AiohttpClient, app):
+    graphql_session = await aiohttp_client(app)
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    await client.fetch(TODO_QUERY, variables={"id": "1"})
+    await client.fetch(TODO_QUERY, variables={"id": "1"})
+
+    assert len(app["requests"]) == 2
+
+
+async def test_unknown_fetch_policy(graphql_client):
+    with pytest.raises(ValueError):
+        await graphql_client.fetch(TODO_QUERY, fetch_policy="cache-only")
+
+
+def test_entities_are_normalized():
+    store = EntityStore()
+    store.write(
+        TODO_QUERY,
+        {
+            "todo": {
+                "__typename": "Todo",
+                "id": "1",
+                "title": "Buy groceries",
+                "creator": {"__typename": "User", "id": "1", "name": "Bill"},
+            }
+        },
+        variables={"id": "1"},
+    )
+
+    root = store.get_entity("ROOT_QUERY")
+    todo = store.get_entity("Todo:1")
+    assert root is not None and todo is not None
+    assert isinstance(root['todo({"id":"1"})'], Reference)
+    assert isinstance(todo["creator"], Reference)
+    assert todo["creator"].key == "User:1"
+    assert store.get_entity("User:1") == {
+        "__typename": "User",
+        "id": "1",
+        "name": "Bill",
+    }
+
+
+def test_least_recently_used_entities_are_evicted():
+    store = EntityStore(max_entities=3)
+    query = "query { users { __typename id name } }"
+    store.write(
+        query,
+        {
+            "users": [
+                {"__typename": "User", "id": "0", "name": "Amelia"},
+                {"__typename": "User", "id": "1", "name": "Bill"},
+                {"__typename": "User", "id": "2", "name": "Clara"},
+            ]
+        },
+    )
+
+    assert len(store) == 3
+    assert "User:0" not in store
+    assert store.read(query) is None
+
+    assert store.evict("User:1")
+    assert not store.evict("User:1")
+    store.clear()
+    assert len(store) == 0
+
+
+def test_objects_without_identity_are_embedded():
+    store = EntityStore()
+    store.write("{ settings { theme } }", {"settings": {"theme": "dark"}})
+    store.write("{ settings { language } }", {"settings": {"language": "en"}})
+    store.write("{ settings { font } }", {"settings": {}})
+
+    assert store.read("{ settings { theme language } }") == {
+        "settings": {"theme": "dark", "language": "en"}
+    }
+    assert store.read("{ settings { font } }") is None
+
+
+def test_scalars_lists_and_nulls():
+    store = EntityStore()
+    query = "{ tags scores json empty missing { id } }"
+    data = {
+        "tags": ["a", "b"],
+        "scores": [[1, 2], [3]],
+        "json": {"nested": True},
+        "empty": None,
+        "missing": None,
+    }
+    store.write(query, data)
+
+    assert store.read(query) == data
+
+
+def test_fragments_on_abstract_types():
+    store = EntityStore(possible_types={"Node": ["Todo", "User"]})
+    query = """
+        query {
+            node(id: 1) {
+                __typename
+                ... on Node { id }
+                ... on Todo { title }
+                ... on User { name }
+            }
+        }
+    """
+    store.write(query, {"node": {"__typename": "Todo", "id": "1", "title": "A"}})
+
+    assert store.read(query) == {
+        "node": {"__typename": "Todo", "id": "1", "title": "A"}
+    }
+
+
+def test_skip_and_include_directives():
+    store = EntityStore()
+    query = """
+        query ($withTitle: Boolean!, $skipId: Boolean!) {
+            todo(id: 1) {
+                id @skip(if: $skipId)
+                title @include(if: $withTitle)
+                priority @deprecated
+            }
+        }
+    """
+    variables = {"withTitle": False, "skipId": False}
+    store.write(query, {"todo": {"id": "1", "priority": 1}}, variables)
+
+    assert store.read(query, variables) == {"todo": {"id": "1", "priority": 1}}
+    assert store.read(query, {"withTitle": True, "skipId": True}) is None
+
+
+def test_unknown_operations_and_missing_references():
+    store = EntityStore()
+
+    assert store.read("query A { a }", operation="B") is None
+    assert store.read("query { a }") is None
+    assert store.read("mutation { a }") is None
+    store.write("query A { a }", {"a": 1}, operation="B")
+    assert len(store) == 0
+
+    store.write("fragment F on T { id } { todo { ...F } }", {"todo": {"id": 1}})
+    assert store.read("fragment F on T { id } { todo { ...F } }") == {"todo": {"id": 1}}
+
+    store.write("{ todo { __typename id } }", {"todo": {"__typename": "T", "id": 1}})
+    assert store.read("{ todo }") is None
+    store.evict("T:1")
+    assert store.read("{ todo { id } }") is None
+
+
+def test_invalid_max_entities():
+    with pytest.raises(ValueError):
+        EntityStore(max_entities=0)
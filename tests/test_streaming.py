@@ -0,0 +1,165 @@
+import json
+from io import BytesIO
+
+import aiohttp
+import aiohttp.web
+import pytest
+
+from aiogqlc import GraphQLClient
+from aiogqlc.errors import GraphQLResponseError
+from aiogqlc.streaming import JSONItemsParser
+from tests.helpers import ExportGraphQLView
+
+BODY = json.dumps(
+    {
+        "errors": [],
+        "data": {
+            "skipped": {"a": [1, "]}", {"b": None}], "c": "\\"},
+            "orders": {
+                "totalCount": 3,
+                "edges": [
+                    {"node": {"id": "1", "note": 'say "hi" \\ é'}},
+                    {"node": {"id": "2", "tags": ["a", "b"], "price": 1.5e3}},
+                    {"node": None},
+                ],
+                "after": True,
+            },
+        },
+        "extensions": {"cost": 1},
+    },
+    indent=2,
+    ensure_ascii=False,
+).encode()
+
+EDGES = json.loads(BODY)["data"]["orders"]["edges"]
+
+
+@pytest.fixture
+async def app():
+    app = aiohttp.web.Application()
+    app["config"] = {"errors": []}
+    app.router.add_route("*", "/graphql", ExportGraphQLView)
+    return app
+
+
+@pytest.fixture
+async def export_session(aiohttp_client, app):
+    return await aiohttp_client(app)
+
+
+async def test_items_are_yielded_while_streaming(export_session):
+    client = GraphQLClient(endpoint="/graphql", session=export_session)
+
+    items = []
+    async for item in client.execute_stream(
+        "query { export { id payload } }", "data.export", chunk_size=512
+    ):
+        items.append(item)
+
+    assert [item["id"] for item in items] == list(range(1000))
+
+
+async def test_errors_are_raised_after_streaming(export_session, app):
+    app["config"]["errors"] = [{"message": "Export truncated"}]
+    client = GraphQLClient(endpoint="/graphql", session=export_session)
+
+    items = []
+    with pytest.raises(GraphQLResponseError) as exc_info:
+        async for item in client.execute_stream("query { export }", "data.export"):
+            items.append(item)
+
+    assert len(items) == 1000
+    assert exc_info.value.payload == [{"message": "Export truncated"}]
+
+
+async def test_streaming_queries(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+    query = "query { todos { title } }"
+
+    titles = [
+        item["title"] async for item in client.execute_stream(query, "data.todos")
+    ]
+
+    assert titles[:2] == ["Clean kitchen", "Buy groceries"]
+
+
+async def test_streaming_uploads(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+    query = """
+        mutation($files: [Upload!]!) {
+            readFiles(files: $files)
+        }
+    """
+    variables = {"files": [BytesIO(b"Hello, World!")]}
+
+    items = [
+        item
+        async for item in client.execute_stream(query, ["data", "readFiles"], variables)
+    ]
+
+    assert items == ["Hello, World!"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, len(BODY)])
+def test_parser_handles_any_chunk_boundaries(chunk_size: int):
+    parser = JSONItemsParser("data.orders.edges")
+
+    items = []
+    for start in range(0, len(BODY), chunk_size):
+        items.extend(parser.feed(BODY[start : start + chunk_size]))
+    parser.close()
+
+    assert [json.loads(item) for item in items] == EDGES
+    assert parser.errors == b"[]"
+
+
+def test_parser_buffers_only_the_current_item():
+    parser = JSONItemsParser("data.items")
+    parser.feed(b'{"data": {"items": [')
+
+    for index in range(100):
+        items = parser.feed(b'{"id": %d, "padding": "%s"},' % (index, b"x" * 1000))
+        assert [json.loads(item)["id"] for item in items] == [index]
+        assert len(parser._buffer) < 100
+
+    assert parser.feed(b"]}}") == []
+
+
+@pytest.mark.parametrize(
+    ("path", "body", "expectation"),
+    [
+        ("", b"[1, true, null]", [1, True, None]),
+        ("data.items", b'{"data": null}', []),
+        ("data.items", b'{"data": {"items": null}}', []),
+        ("data.items", b'{"data": {"other": [1]}}', []),
+        ("data.items", b'{"data": {"items": [1, 2]}} trailing', [1, 2]),
+        ("data.items", b'{"data": {"items": [-1.5e3]}}', [-1500.0]),
+        (("a.b",), b'{"a.b": [1]}', [1]),
+    ],
+)
+def test_parser_paths(path, body, expectation):
+    parser = JSONItemsParser(path)
+
+    items = parser.feed(body)
+    parser.close()
+
+    assert [json.loads(item) for item in items] == expectation
+    assert parser.feed(b"ignored") == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"[1]",
+        b'{"data": {"items": [1',
+        b'{"data" {"items": []}}',
+        b"{data: 1}",
+        b'{"data": "unterminated',
+    ],
+)
+def test_parser_rejects_invalid_input(body):
+    parser = JSONItemsParser("data.items")
+
+    with pytest.raises(ValueError):
+        parser.feed(body)
+        parser.close()
@@ -0,0 +1,181 @@
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from pytest_aiohttp import AiohttpClient
+
+from aiogqlc import GraphQLClient
+from aiogqlc.constants import GRAPHQL_TRANSPORT_WS
+from aiogqlc.errors import (
+    GraphQLWSConnectionClosedError,
+    GraphQLWSOperationError,
+    GraphQLWSProtocolError,
+)
+from aiogqlc.reconnect import ReconnectPolicy
+
+
+async def test_subscriptions(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    data: list[int] = []
+
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        async for payload in connection.subscribe("subscription { count(to: 3) }"):
+            data.append(payload["data"]["count"])
+
+    assert data == [1, 2, 3]
+
+
+async def test_unsubscribing(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    data: list[int] = []
+
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        async for payload in connection.subscribe("subscription { count(to: 3) }"):
+            data.append(payload["data"]["count"])
+            break
+
+        async for payload in connection.subscribe("subscription { count(to: 2) }"):
+            data.append(payload["data"]["count"])
+
+    assert data == [1, 1, 2]
+
+
+async def test_queries_and_mutations(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(GRAPHQL_TRANSPORT_WS, params={"a": 1}) as connection:
+        query = "query ($id: ID!) { todo(id: $id) { title } }"
+        result = await connection.execute(query, variables={"id": "1"})
+        assert result == {"data": {"todo": {"title": "Buy groceries"}}}
+
+        mutation = 'mutation { fakeUser(id: 1, name: "William") { name } }'
+        result = await connection.execute(mutation)
+        assert result == {"data": {"fakeUser": {"name": "William"}}}
+
+
+async def test_operation_errors(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        with pytest.raises(GraphQLWSOperationError) as exc_info:
+            await connection.execute("query { unknownField }")
+
+        result = await connection.execute("query { todo(id: 1) { title } }")
+        assert result["data"]["todo"]["title"] == "Buy groceries"
+
+    payload = exc_info.value.payload
+    assert isinstance(payload, list)
+    assert "unknownField" in payload[0]["message"]
+
+
+async def test_ping(graphql_session: aiohttp.ClientSession):
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        assert await connection.ping() is None
+        assert await connection.ping({"time": 1}) is None
+
+
+async def fake_server(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(protocols=[GRAPHQL_TRANSPORT_WS])
+    await ws.prepare(request)
+    behavior = request.app["config"]["behavior"]
+
+    message = await ws.receive_json()
+    request.app["messages"].append(message)
+
+    if behavior == "reject":
+        await ws.close(code=4403, message=b"Forbidden")
+        return ws
+
+    if behavior == "violate":
+        await ws.send_json({"type": "next", "id": "1", "payload": {}})
+        return ws
+
+    await ws.send_json({"type": "connection_ack"})
+
+    async for ws_message in ws:
+        message = json.loads(ws_message.data)
+        request.app["messages"].append(message)
+
+        if message["type"] == "ping" and behavior == "close-on-ping":
+            await ws.close()
+        elif message["type"] == "ping":
+            await ws.send_bytes(b"ignored")
+            await ws.send_json({"type": "ping"})
+            await ws.send_json({"type": "pong", "payload": message.get("payload")})
+        elif message["type"] == "subscribe":
+            await ws.send_json({"type": "pong"})
+            await ws.send_json({"type": "complete", "id": message["id"]})
+
+    return ws
+
+
+@pytest.fixture
+async def app():
+    app = web.Application()
+    app["config"] = {"behavior": None}
+    app["messages"] = []
+    app.router.add_route("GET", "/graphql", fake_server)
+    return app
+
+
+@pytest.fixture
+async def client(aiohttp_client: AiohttpClient, app: web.Application):
+    session = await aiohttp_client(app)
+    return GraphQLClient(endpoint="/graphql", session=session)
+
+
+async def test_server_pings_are_answered(client, app):
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        assert await connection.ping({"time": 1}) == {"time": 1}
+
+    assert app["messages"] == [
+        {"type": "connection_init"},
+        {"type": "ping", "payload": {"time": 1}},
+        {"type": "pong"},
+    ]
+
+
+async def test_completion_without_result(client):
+    async with client.connect(GRAPHQL_TRANSPORT_WS) as connection:
+        with pytest.raises(GraphQLWSProtocolError):
+            await connection.execute("query { ping }")
+
+
+async def test_connection_rejection(client, app):
+    app["config"]["behavior"] = "reject"
+
+    with pytest.raises(GraphQLWSConnectionClosedError) as exc_info:
+        async with client.connect(GRAPHQL_TRANSPORT_WS):
+            pass
+
+    assert exc_info.value.code == 4403
+    assert exc_info.value.reason == "Forbidden"
+
+
+async def test_connection_protocol_violation(client, app):
+    app["config"]["behavior"] = "violate"
+
+    with pytest.raises(GraphQLWSProtocolError):
+        async with client.connect(GRAPHQL_TRANSPORT_WS):
+            pass
+
+
+@pytest.mark.parametrize(
+    "reconnect", [False, ReconnectPolicy(initial_delay=60, max_delay=60)]
+)
+async def test_pings_fail_when_the_connection_closes(client, app, reconnect):
+    app["config"]["behavior"] = "close-on-ping"
+
+    async with client.connect(GRAPHQL_TRANSPORT_WS, reconnect=reconnect) as connection:
+        with pytest.raises(GraphQLWSConnectionClosedError):
+            await connection.ping()
+
+        with pytest.raises(GraphQLWSConnectionClosedError):
+            await connection.ping()
+
+        assert not connection._pong_waiters
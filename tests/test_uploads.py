@@ -1,9 +1,18 @@
+import mmap
+from collections.abc import AsyncIterator
+from enum import IntEnum
 from io import BytesIO
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, cast
 
 import aiohttp
+import aiohttp.abc
+import pytest
 
 from aiogqlc import GraphQLClient
-from aiogqlc.types import Variables
+from aiogqlc.types import Variables, VariableValue
+from aiogqlc.uploads import CHUNK_SIZE, BufferPayload, PathPayload, StreamingUpload
 
 
 async def test_single_file_upload(graphql_session: aiohttp.ClientSession):
@@ -103,3 +112,235 @@ async def test_separation_of_files_from_an_object(
             }
         }
     }
+
+
+class AsyncFile:
+    name = "/tmp/greeting.txt"
+
+    def __init__(self, content: bytes) -> None:
+        self._file = BytesIO(content)
+        self.sizes: list[int] = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.sizes.append(size)
+        return self._file.read(size)
+
+
+class UnseekableBytesIO(BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+
+async def generate_chunks() -> AsyncIterator[bytes]:
+    for chunk in (b"Hello, ", b"Async", b" World!"):
+        yield chunk
+
+
+async def test_streaming_upload(graphql_session: aiohttp.ClientSession):
+    progress: list[tuple[int, Optional[int]]] = []
+    file = BytesIO(b"Hello, World!")
+    upload = StreamingUpload(
+        file, chunk_size=5, progress=lambda sent, total: progress.append((sent, total))
+    )
+
+    query = """
+        mutation($file: Upload!) {
+            readFile(file: $file)
+        }
+    """
+
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+    response = await client.execute(query, variables={"file": upload})
+
+    assert await response.json() == {"data": {"readFile": "Hello, World!"}}
+    assert progress == [(5, 13), (10, 13), (13, 13)]
+
+
+async def test_streaming_uploads_from_async_sources(
+    graphql_session: aiohttp.ClientSession,
+):
+    async_file = AsyncFile(b"Hello, File!")
+    uploads: list[VariableValue] = [
+        StreamingUpload(async_file, chunk_size=4),
+        StreamingUpload(generate_chunks(), filename="greeting.txt"),
+        BytesIO(b"Hello, Bar!"),
+    ]
+
+    query = """
+        mutation($files: [Upload!]!) {
+            readFiles(files: $files)
+        }
+    """
+
+    client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+    response = await client.execute(query, variables={"files": uploads})
+
+    assert await response.json() == {
+        "data": {"readFiles": ["Hello, File!", "Hello, Async World!", "Hello, Bar!"]}
+    }
+    assert async_file.sizes == [4, 4, 4, 4]
+
+
+def test_upload_metadata():
+    assert StreamingUpload(AsyncFile(b"")).filename == "greeting.txt"
+    assert StreamingUpload(generate_chunks()).filename == ""
+    assert StreamingUpload(generate_chunks()).size is None
+    assert StreamingUpload(UnseekableBytesIO(b"abc")).size is None
+    assert StreamingUpload(BytesIO(b"abc"), size=10).size == 10
+
+    file = BytesIO(b"abc")
+    file.read(1)
+    assert StreamingUpload(file).size == 2
+    assert file.tell() == 1
+
+    with pytest.raises(ValueError):
+        StreamingUpload(file, chunk_size=0)
+
+
+async def test_abandoning_a_streaming_upload():
+    chunks = StreamingUpload(BytesIO(b"Hello, World!"), chunk_size=1).__aiter__()
+
+    assert await chunks.__anext__() == b"H"
+    await chunks.aclose()
+
+
+async def test_buffer_and_path_uploads(
+    graphql_session: aiohttp.ClientSession, tmp_path: Path
+):
+    path = tmp_path / "greeting.txt"
+    path.write_bytes(b"Hello, Path!")
+    shared = bytearray(b"Hello, Shared!")
+
+    with path.open("r+b") as file, mmap.mmap(file.fileno(), 0) as mapped:
+        uploads: list[VariableValue] = [
+            b"Hello, Bytes!",
+            shared,
+            memoryview(b"Hello, View!"),
+            mapped,
+            path,
+            shared,
+        ]
+
+        query = """
+            mutation($files: [Upload!]!) {
+                readFiles(files: $files)
+            }
+        """
+
+        client = GraphQLClient(endpoint="/graphql", session=graphql_session)
+        _, files_to_paths_mapping = client.prepare({"files": uploads})
+        response = await client.execute(query, variables={"files": uploads})
+
+        assert await response.json() == {
+            "data": {
+                "readFiles": [
+                    "Hello, Bytes!",
+                    "Hello, Shared!",
+                    "Hello, View!",
+                    "Hello, Path!",
+                    "Hello, Path!",
+                    "Hello, Shared!",
+                ]
+            }
+        }
+
+    assert list(files_to_paths_mapping.values()) == [
+        ["variables.files.0"],
+        ["variables.files.1", "variables.files.5"],
+        ["variables.files.2"],
+        ["variables.files.3"],
+        ["variables.files.4"],
+    ]
+
+
+class RecordingWriter:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    async def write(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+
+
+async def test_large_buffer_payloads(tmp_path: Path):
+    content = bytes(range(256)) * (CHUNK_SIZE // 128 + 1)
+    path = tmp_path / "large.bin"
+    path.write_bytes(content)
+
+    buffer_payload = BufferPayload(memoryview(content))
+    path_payload = PathPayload(path)
+    buffer_writer = RecordingWriter()
+    path_writer = RecordingWriter()
+    await buffer_payload.write(cast(aiohttp.abc.AbstractStreamWriter, buffer_writer))
+    await path_payload.write(cast(aiohttp.abc.AbstractStreamWriter, path_writer))
+
+    assert buffer_payload.size == path_payload.size == len(content)
+    assert [len(chunk) for chunk in buffer_writer.chunks] == [
+        CHUNK_SIZE,
+        CHUNK_SIZE,
+        256,
+    ]
+    assert all(isinstance(chunk, memoryview) for chunk in buffer_writer.chunks)
+    assert b"".join(buffer_writer.chunks) == b"".join(path_writer.chunks) == content
+    assert path_payload.filename == "large.bin"
+
+
+def test_decoding_buffer_payloads(tmp_path: Path):
+    path = tmp_path / "greeting.txt"
+    path.write_text("Hello, World!")
+
+    assert BufferPayload(bytearray(b"Hello, World!")).decode() == "Hello, World!"
+    assert PathPayload(path).decode() == "Hello, World!"
+
+
+class Priority(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+def test_preparing_variables_without_files():
+    variables: Variables = {
+        "items": [{"id": index, "tags": ["a", "b"]} for index in range(100)],
+        "filter": {"name": None, "priority": Priority.HIGH},
+        "priorities": [Priority.LOW],
+    }
+
+    nulled_variables, files_to_paths_mapping = GraphQLClient.prepare(variables)
+
+    assert nulled_variables is variables
+    assert files_to_paths_mapping == {}
+    assert GraphQLClient.prepare(None) == (None, {})
+
+
+def test_preparing_mappings():
+    file = BytesIO(b"Hello, World!")
+    nested: Variables = MappingProxyType({"b": 2})
+
+    variables: Variables = MappingProxyType({"a": 1, "nested": nested})
+    assert GraphQLClient.prepare(variables) == (variables, {})
+
+    variables = MappingProxyType({"a": 1, "nested": nested, "file": file})
+    nulled_variables, files_to_paths_mapping = GraphQLClient.prepare(variables)
+    assert nulled_variables == {"a": 1, "nested": nested, "file": None}
+    assert files_to_paths_mapping == {file: ["variables.file"]}
+
+
+def test_preparing_variables_only_copies_containers_of_files():
+    file = BytesIO(b"Hello, World!")
+    items: list[VariableValue] = [{"id": 1}, {"id": 2, "file": file}]
+    tags = ["a", "b"]
+    variables: Variables = {"items": items, "tags": tags, "files": [1, [file]]}
+
+    nulled_variables, files_to_paths_mapping = GraphQLClient.prepare(variables)
+
+    assert nulled_variables == {
+        "items": [{"id": 1}, {"id": 2, "file": None}],
+        "tags": ["a", "b"],
+        "files": [1, [None]],
+    }
+    assert nulled_variables is not None
+    assert nulled_variables["items"] is not items
+    assert nulled_variables["tags"] is tags
+    assert items[1] == {"id": 2, "file": file}
+    assert files_to_paths_mapping == {
+        file: ["variables.items.1.file", "variables.files.1.0"]
+    }
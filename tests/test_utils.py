@@ -0,0 +1,42 @@
+from typing import Optional
+
+import pytest
+
+from aiogqlc.utils import get_operation_type, hash_payload
+
+
+@pytest.mark.parametrize(
+    ("query", "operation", "expectation"),
+    [
+        ("{ todos { id } }", None, "query"),
+        ("query { todos { id } }", None, "query"),
+        ('mutation { fakeUser(id: 1, name: "A") { id } }', None, "mutation"),
+        ("subscription { count(to: 3) }", None, "subscription"),
+        ("query A { a } mutation B { b }", "B", "mutation"),
+        ("query A { a } mutation B { b }", "A", "query"),
+        ("query A { a } mutation B { b }", None, "query"),
+        ("query A { a }", "B", None),
+        ("fragment F on Todo { id } mutation M { ...F }", None, "mutation"),
+        ('query Q($id: ID = "mutation") @live { todo(id: $id) { id } }', None, "query"),
+        ('# mutation\nquery { a(text: "mutation { }") }', None, "query"),
+        ('query {\n  a(text: """\nmutation\n""")\n}', None, "query"),
+        ('query { a(text: "\\" mutation") }', None, "query"),
+        ("", None, None),
+    ],
+)
+def test_get_operation_type(
+    query: str, operation: Optional[str], expectation: Optional[str]
+):
+    assert get_operation_type(query, operation) == expectation
+
+
+def test_hash_payload_is_canonical():
+    first = hash_payload({"query": "{ a }", "variables": {"a": 1, "b": 2}})
+    second = hash_payload({"variables": {"b": 2, "a": 1}, "query": "{ a }"})
+    third = hash_payload({"query": "{ a }", "variables": {"a": 2, "b": 1}})
+
+    assert first == second
+    assert first != third
+    assert hash_payload({"query": "{ a }"}, headers={"A": "1"}) != hash_payload(
+        {"query": "{ a }"}, headers={"A": "2"}
+    )